@@ -0,0 +1,300 @@
+import math
+
+from PyQt5.QtCore import Qt, QRect, QRectF, QPointF, QLineF
+from PyQt5.QtGui import (QImage, QPainter, QPen, QBrush, QColor, QFont, QFontMetrics,
+                         QPolygonF, QPainterPath, QPainterPathStroker, QTransform)
+
+
+class Annotation:
+    """
+    비파괴 주석 도형의 기본 클래스
+    도형 좌표는 그릴 당시의 이미지 좌표로 보관하고, 이후의 이동/뒤집기/회전/자르기는 transform에 누적합니다.
+    """
+    HIT_MARGIN = 6  # 선택 판정 여유 (이미지 픽셀)
+
+    def __init__(self, color, thickness):
+        self.color = QColor(color)
+        self.thickness = thickness
+        self.transform = QTransform()
+
+    def paint(self, painter):
+        """painter(이미지 좌표)에 도형 그리기"""
+        painter.save()
+        painter.setTransform(self.transform, True)
+        painter.setRenderHint(QPainter.Antialiasing)
+        self._paint(painter)
+        painter.restore()
+
+    def _paint(self, painter):
+        raise NotImplementedError
+
+    def _outline(self):
+        """선택 판정과 영역 계산에 쓰는 도형 외곽 (로컬 좌표 QPainterPath)"""
+        raise NotImplementedError
+
+    def _hit_shape(self):
+        stroker = QPainterPathStroker()
+        stroker.setWidth(self.thickness + self.HIT_MARGIN * 2)
+        stroker.setCapStyle(Qt.RoundCap)
+        stroker.setJoinStyle(Qt.RoundJoin)
+        return stroker.createStroke(self._outline())
+
+    def bounds(self):
+        """도형이 차지하는 이미지 영역 (QRect, 선 두께 포함)"""
+        pad = self.thickness / 2 + 2
+        local = self._outline().boundingRect().adjusted(-pad, -pad, pad, pad)
+        return self.transform.mapRect(local).toAlignedRect()
+
+    def contains(self, img_point):
+        """이미지 좌표의 점이 도형 위에 있는지 (선택 판정)"""
+        inverse, invertible = self.transform.inverted()
+        if not invertible:
+            return False
+        return self._hit_shape().contains(inverse.map(QPointF(img_point)))
+
+    def translate(self, dx, dy):
+        """도형 이동 (이미지 좌표)"""
+        self.transform = self.transform * QTransform.fromTranslate(dx, dy)
+
+    def apply_transform(self, transform):
+        """이미지 전체 변환(뒤집기/회전/자르기)을 도형에 적용"""
+        self.transform = self.transform * transform
+
+
+class ArrowAnnotation(Annotation):
+    def __init__(self, start, end, color, thickness):
+        super().__init__(color, thickness)
+        self.line = QLineF(QPointF(start), QPointF(end))
+
+    def _arrow_head(self):
+        # 두께에 비례하는 화살촉 크기
+        line = self.line
+        arrow_size = 3.0 * self.thickness + 4
+        angle = math.atan2(-line.dy(), line.dx())
+        arrow_p1 = line.p2() - QPointF(math.cos(angle + math.pi / 6) * arrow_size,
+                                      -math.sin(angle + math.pi / 6) * arrow_size)
+        arrow_p2 = line.p2() - QPointF(math.cos(angle - math.pi / 6) * arrow_size,
+                                      -math.sin(angle - math.pi / 6) * arrow_size)
+        return QPolygonF([line.p2(), arrow_p1, arrow_p2])
+
+    def _paint(self, painter):
+        painter.setPen(QPen(self.color, self.thickness, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+        painter.setBrush(QBrush(self.color))
+        painter.drawLine(self.line)
+        painter.drawPolygon(self._arrow_head())
+
+    def _outline(self):
+        path = QPainterPath(self.line.p1())
+        path.lineTo(self.line.p2())
+        path.addPolygon(self._arrow_head())
+        path.closeSubpath()
+        return path
+
+
+class RectangleAnnotation(Annotation):
+    def __init__(self, rect, color, thickness):
+        super().__init__(color, thickness)
+        self.rect = QRect(rect)
+
+    def _paint(self, painter):
+        painter.setPen(QPen(self.color, self.thickness, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+        painter.setBrush(Qt.NoBrush)  # 사각형은 외곽선만 그림
+        painter.drawRect(self.rect)
+
+    def _outline(self):
+        path = QPainterPath()
+        path.addRect(QRectF(self.rect))
+        return path
+
+
+class EllipseAnnotation(Annotation):
+    def __init__(self, rect, color, thickness):
+        super().__init__(color, thickness)
+        self.rect = QRect(rect)
+
+    def _paint(self, painter):
+        painter.setPen(QPen(self.color, self.thickness, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+        painter.setBrush(Qt.NoBrush)  # 원은 외곽선만 그림
+        painter.drawEllipse(self.rect)
+
+    def _outline(self):
+        path = QPainterPath()
+        path.addEllipse(QRectF(self.rect))
+        return path
+
+
+class HighlightAnnotation(Annotation):
+    def __init__(self, points, color, thickness):
+        super().__init__(color, thickness)
+        self.polygon = QPolygonF([QPointF(p) for p in points])
+
+    def _paint(self, painter):
+        # QColor에 이미 투명도가 포함되어 있음 (activate_highlight_tool에서 설정)
+        painter.setPen(QPen(self.color, self.thickness, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPolyline(self.polygon)
+
+    def _outline(self):
+        path = QPainterPath()
+        path.addPolygon(self.polygon)
+        return path
+
+    def _hit_shape(self):
+        # 하이라이트는 두께가 곧 칠해진 영역
+        stroker = QPainterPathStroker()
+        stroker.setWidth(self.thickness + self.HIT_MARGIN)
+        stroker.setCapStyle(Qt.RoundCap)
+        stroker.setJoinStyle(Qt.RoundJoin)
+        return stroker.createStroke(self._outline())
+
+
+class TextAnnotation(Annotation):
+    def __init__(self, position, text, color, size):
+        super().__init__(color, 0)
+        self.position = QPointF(position)
+        self.text = text
+        self.size = size
+
+    def _font(self):
+        font = QFont()
+        font.setPixelSize(self.size)  # 픽셀 크기로 설정
+        return font
+
+    def _text_rect(self):
+        # boundingRect는 때때로 음수 x/y를 가질 수 있으므로, 너비/높이만 사용
+        bounding_rect = QFontMetrics(self._font()).boundingRect(self.text)
+        return QRectF(self.position, QRectF(bounding_rect).size())
+
+    def _paint(self, painter):
+        painter.setFont(self._font())
+        painter.setPen(self.color)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.drawText(self._text_rect(), Qt.AlignTop | Qt.AlignLeft, self.text)
+
+    def _outline(self):
+        path = QPainterPath()
+        path.addRect(self._text_rect())
+        return path
+
+    def _hit_shape(self):
+        # 글자 사이를 클릭해도 선택되도록 영역 전체로 판정
+        return self._outline()
+
+
+class AnnotationLayer:
+    """
+    이미지 위에 그리는 주석 도형 목록
+    화면에는 매번 합성해서 보여주고, 저장/복사 시에만 이미지에 합칩니다(flatten).
+    """
+    def __init__(self):
+        self.annotations = []
+        self.version = 0  # 내용이 바뀔 때마다 증가 (표시 캐시 무효화 기준)
+
+    def __len__(self):
+        return len(self.annotations)
+
+    def _changed(self):
+        self.version += 1
+
+    def add(self, annotation, index=None):
+        if index is None:
+            self.annotations.append(annotation)
+        else:
+            self.annotations.insert(index, annotation)
+        self._changed()
+
+    def remove(self, annotation):
+        """도형 제거, 제거된 위치(index) 반환"""
+        index = self.annotations.index(annotation)
+        del self.annotations[index]
+        self._changed()
+        return index
+
+    def clear(self):
+        self.annotations = []
+        self._changed()
+
+    def translate(self, annotation, dx, dy):
+        annotation.translate(dx, dy)
+        self._changed()
+
+    def apply_transform(self, transform):
+        """모든 도형에 이미지 변환 적용 (뒤집기/회전/자르기 시)"""
+        for annotation in self.annotations:
+            annotation.apply_transform(transform)
+        self._changed()
+
+    def hit_test(self, img_point):
+        """점 위에 있는 가장 위(나중에 그린) 도형, 없으면 None"""
+        for annotation in reversed(self.annotations):
+            if annotation.bounds().adjusted(-Annotation.HIT_MARGIN, -Annotation.HIT_MARGIN,
+                                            Annotation.HIT_MARGIN, Annotation.HIT_MARGIN).contains(img_point) \
+                    and annotation.contains(img_point):
+                return annotation
+        return None
+
+    def paint(self, painter, clip_rect=None):
+        """
+        도형 그리기 (painter는 이미지 좌표 기준)
+        :param clip_rect: 다시 그릴 이미지 영역 (QRect, 겹치지 않는 도형은 건너뜀)
+        """
+        for annotation in self.annotations:
+            if clip_rect is None or annotation.bounds().intersects(clip_rect):
+                annotation.paint(painter)
+
+    def bake(self, image, rect):
+        """
+        rect와 겹치는 도형을 image에 직접 그리고 레이어에서 제거 (모자이크/펜/선택 이동 등 픽셀 작업 전)
+        합친 도형과 겹치는 더 아래 도형도 함께 합쳐 겹친 순서가 바뀌지 않게 합니다.
+        :param image: 그릴 QImage (편집 이미지)
+        :param rect: 픽셀 작업 영역 (QRect, 이미지 좌표)
+        :return: 합친 (원래 위치, 도형) 목록 (아래 도형부터)
+        """
+        areas = [QRect(rect)]
+        baked = []
+        # 위 도형부터 내려가며 합칠 영역과 겹치는 도형을 고름 (고른 도형의 영역도 이후 비교에 포함)
+        for index in range(len(self.annotations) - 1, -1, -1):
+            annotation = self.annotations[index]
+            bounds = annotation.bounds()
+            if any(bounds.intersects(area) for area in areas):
+                baked.append((index, annotation))
+                areas.append(bounds)
+        if not baked:
+            return []
+        baked.reverse()
+        painter = QPainter(image)
+        for _, annotation in baked:
+            annotation.paint(painter)
+        painter.end()
+        for index, _ in reversed(baked):
+            del self.annotations[index]
+        self._changed()
+        return baked
+
+    def flatten(self, image):
+        """
+        도형을 합친 이미지 반환 (저장/복사용, 원본 이미지는 바꾸지 않음)
+        :param image: 바탕 QImage
+        """
+        if not self.annotations:
+            return image
+        # 반투명 하이라이트가 바탕과 섞이도록 바탕 형식 유지 (인덱스 등 그릴 수 없는 형식만 변환)
+        if image.format() in (QImage.Format_RGB32, QImage.Format_ARGB32, QImage.Format_ARGB32_Premultiplied):
+            result = image.copy()
+        else:
+            result = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        painter = QPainter(result)
+        self.paint(painter)
+        painter.end()
+        return result
+
+
+def flip_transform(width, height, horizontal, vertical):
+    """이미지 뒤집기(mirrored)에 해당하는 좌표 변환"""
+    return QTransform(-1 if horizontal else 1, 0, 0, -1 if vertical else 1,
+                      width if horizontal else 0, height if vertical else 0)
+
+
+def rotate90_transform(height):
+    """이미지 시계 방향 90도 회전에 해당하는 좌표 변환 ((x, y) -> (height - y, x))"""
+    return QTransform(0, 1, -1, 0, height, 0)
@@ -0,0 +1,862 @@
+"""
+ImageCapturePAAK 성능 측정 스크립트
+
+사용법:
+    python benchmark.py capture-session [--shots N]
+    python benchmark.py frame-copy [--runs N] [--sizes 1080p,4k,8k]
+    python benchmark.py virtual-desktop [--shots N]
+    python benchmark.py burst [--count N] [--interval-ms MS]
+    python benchmark.py mosaic [--runs N]
+    python benchmark.py undo [--strokes N] [--ceiling-mb MB]
+    python benchmark.py canvas [--moves N] [--size 4k|8k] [--zoom 1.0]
+    python benchmark.py spectrum [--steps N]
+    python benchmark.py clipboard [--runs N] [--size 4k|8k]
+    python benchmark.py encode [--runs N] [--size 1080p|4k] [--corpus DIR]
+    python benchmark.py png-parallel [--runs N] [--sizes 4k,8000x8000] [--level 6]
+    python benchmark.py recompress [--size 1080p|4k] [--format png|webp]
+    python benchmark.py history [--count N] [--runs N]
+    python benchmark.py thumbnails [--count N] [--size 1080p|4k]
+    python benchmark.py preview-resize [--steps N] [--size 4k|8k]
+
+Windows 전용 모듈(win32gui 등)을 불러오지 않으므로 Linux의 Xvfb 환경에서도 실행할 수 있습니다.
+    Xvfb :99 -screen 0 1920x1080x24 &
+    DISPLAY=:99 python benchmark.py capture-session
+
+virtual-desktop는 모니터가 여러 개인 환경이 필요합니다. Xvfb에서는 xrandr로 논리 모니터를 나눕니다.
+    Xvfb :99 -screen 0 3840x1080x24 &
+    DISPLAY=:99 xrandr --setmonitor left 1920/508x1080/286+0+0 screen
+    DISPLAY=:99 xrandr --setmonitor right 1920/508x1080/286+1920+0 none
+    DISPLAY=:99 python benchmark.py virtual-desktop
+"""
+import argparse
+import os
+import statistics
+import time
+
+
+def _report(label, samples_ms):
+    """측정값(ms) 목록의 요약을 출력합니다."""
+    print(f"  {label:<32} mean {statistics.mean(samples_ms):8.2f} ms | "
+          f"median {statistics.median(samples_ms):8.2f} ms | "
+          f"max {max(samples_ms):8.2f} ms")
+
+
+def bench_capture_session(args):
+    """캡처마다 mss 세션을 새로 여는 방식과 세션을 재사용하는 방식을 비교합니다."""
+    import mss
+
+    print(f"[capture-session] {args.shots} shots per mode")
+
+    # 이전 방식: 캡처마다 새 세션 생성 (디스플레이 연결 + 모니터 열거 포함)
+    setup_ms, total_before_ms = [], []
+    for _ in range(args.shots):
+        start = time.perf_counter()
+        with mss.mss() as sct:
+            monitor = sct.monitors[1]
+            setup_done = time.perf_counter()
+            sct.grab(monitor)
+        end = time.perf_counter()
+        setup_ms.append((setup_done - start) * 1000)
+        total_before_ms.append((end - start) * 1000)
+
+    # 새 방식: 세션 하나를 재사용 (첫 생성 비용은 한 번만 발생)
+    total_after_ms = []
+    with mss.mss() as sct:
+        monitor = sct.monitors[1]
+        sct.grab(monitor)  # 워밍업
+        for _ in range(args.shots):
+            start = time.perf_counter()
+            sct.grab(sct.monitors[1])
+            total_after_ms.append((time.perf_counter() - start) * 1000)
+
+    print(f"  Monitor size: {monitor['width']}x{monitor['height']}")
+    _report("setup per shot (new session)", setup_ms)
+    _report("capture (new session)", total_before_ms)
+    _report("capture (reused session)", total_after_ms)
+    saved = statistics.mean(total_before_ms) - statistics.mean(total_after_ms)
+    print(f"  Saved per capture: {saved:.2f} ms")
+
+
+FRAME_SIZES = {
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+    "8k": (7680, 4320),
+}
+
+
+def _mss_rgb(raw, width, height):
+    """mss ScreenShot.rgb 와 같은 방식의 BGRA -> RGB 변환 (이전 캡처 경로 재현)"""
+    rgb = bytearray(width * height * 3)
+    rgb[0::3] = raw[2::4]
+    rgb[1::3] = raw[1::4]
+    rgb[2::3] = raw[0::4]
+    return rgb
+
+
+def bench_frame_copy(args):
+    """
+    합성 BGRA 프레임으로 캡처 1회당 복사되는 데이터 양(MB)과 시간을 비교합니다.
+    이전 경로: screenshot.rgb 변환 -> Image.frombytes -> 미리보기용 QImage 변환
+    새 경로: BGRA 버퍼를 QImage(Format_RGB32)로 감싸 1회 복사, 저장 시에만 "BGRX" 디코딩
+    """
+    from PIL import Image
+    from PyQt5.QtGui import QImage
+    from capture_result import CaptureResult
+
+    for name in args.sizes.split(","):
+        width, height = FRAME_SIZES[name.strip().lower()]
+        pixels = width * height
+        raw = bytearray(os.urandom(pixels * 4))
+        print(f"[frame-copy] {name} ({width}x{height}), {args.runs} runs")
+
+        # 이전 경로
+        # .rgb: 채널별 슬라이스 임시 버퍼 3개(각 N) + RGB 버퍼(3N)
+        # frombytes: 3N, 미리보기 QImage: tobytes 3N + copy 3N
+        before_bytes = pixels * 3 + pixels * 3 + pixels * 3 + pixels * 3 + pixels * 3
+        before_ms = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            img = Image.frombytes("RGB", (width, height), _mss_rgb(raw, width, height))
+            data = img.tobytes("raw", "RGB")
+            QImage(data, width, height, width * 3, QImage.Format_RGB888).copy()
+            before_ms.append((time.perf_counter() - start) * 1000)
+
+        # 새 경로: 캡처 시 QImage 복사 1회(4N), PIL은 저장할 때만 디코딩(3N)
+        capture_bytes = pixels * 4
+        save_bytes = pixels * 3
+        capture_ms, save_decode_ms = [], []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            result = CaptureResult.from_bgra(raw, width, height, "benchmark")
+            result.to_qimage()
+            capture_ms.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            result.to_pil()
+            save_decode_ms.append((time.perf_counter() - start) * 1000)
+
+        mb = 1024 * 1024
+        print(f"  Copied per capture: before {before_bytes / mb:8.1f} MB | "
+              f"after {capture_bytes / mb:8.1f} MB (+{save_bytes / mb:.1f} MB on save)")
+        _report("before (rgb + PIL + QImage)", before_ms)
+        _report("after (BGRA -> QImage)", capture_ms)
+        _report("after, PIL decode on save", save_decode_ms)
+
+
+def bench_virtual_desktop(args):
+    """monitors[0] 한 번 캡처와 모니터별 병렬 캡처(+이어 붙이기)를 비교합니다."""
+    import mss
+    from virtual_desktop import VirtualDesktopGrabber, stitch_frames
+
+    with mss.mss() as sct:
+        monitors = [dict(monitor) for monitor in sct.monitors[1:]]
+        desktop = sct.monitors[0]
+        print(f"[virtual-desktop] {len(monitors)} monitors, desktop {desktop['width']}x{desktop['height']}, "
+              f"{args.shots} shots per mode")
+        if len(monitors) < 2:
+            print("  Warning: only one monitor found, parallel capture cannot help here.")
+
+        # 기준: 가상 데스크톱 전체를 한 번에 캡처
+        sct.grab(desktop)  # 워밍업
+        single_ms = []
+        for _ in range(args.shots):
+            start = time.perf_counter()
+            sct.grab(desktop)
+            single_ms.append((time.perf_counter() - start) * 1000)
+
+    grabber = VirtualDesktopGrabber()
+    try:
+        grabber.grab(monitors)  # 워밍업 (작업자 스레드별 세션 생성)
+        parallel_ms, stitch_ms = [], []
+        for _ in range(args.shots):
+            start = time.perf_counter()
+            frames = grabber.grab_monitors(monitors)
+            grabbed = time.perf_counter()
+            stitch_frames(frames)
+            end = time.perf_counter()
+            parallel_ms.append((grabbed - start) * 1000)
+            stitch_ms.append((end - start) * 1000)
+    finally:
+        grabber.close()
+
+    _report("monitors[0] single grab", single_ms)
+    _report("parallel per-monitor grab", parallel_ms)
+    _report("parallel grab + stitch", stitch_ms)
+
+
+def bench_burst(args):
+    """버스트 캡처가 주 모니터(1080p 권장)에서 목표 속도를 유지하는지, 저장까지 유실 없이 끝나는지 확인합니다."""
+    import tempfile
+    import mss
+    from burst_capture import BurstCapture
+    from save_queue import SaveQueue
+
+    with mss.mss() as sct:
+        monitor = dict(sct.monitors[1])
+    print(f"[burst] {args.count} frames every {args.interval_ms} ms on {monitor['width']}x{monitor['height']}")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        queue = SaveQueue(max_workers=2, max_pending=4)
+        burst = BurstCapture(monitor, args.count, args.interval_ms, queue,
+                             name_fn=lambda frame, index: os.path.join(temp_dir, f"burst_{index:03d}.png"))
+        start = time.perf_counter()
+        burst.start()
+        burst.wait()
+        captured = time.perf_counter()
+        queue.shutdown(wait=True)
+        saved = time.perf_counter()
+
+        times = burst.frame_times
+        gaps_ms = [(b - a) * 1000 for a, b in zip(times, times[1:])]
+        written = len([name for name in os.listdir(temp_dir) if name.endswith(".png")])
+        fps = (len(times) - 1) / (times[-1] - times[0]) if len(times) > 1 else 0.0
+        print(f"  Captured {len(times)}/{args.count} frames at {fps:.1f} fps "
+              f"(capture {(captured - start) * 1000:.0f} ms, all saved after {(saved - start) * 1000:.0f} ms)")
+        print(f"  Files written: {written}/{args.count}")
+        if gaps_ms:
+            _report("frame interval", gaps_ms)
+
+
+# editor_module.ImageEditor.MOSAIC_LEVELS와 같은 값 (editor_module은 win32clipboard를 불러오므로 직접 정의)
+MOSAIC_LEVELS = {'Weak': 5, 'Medium': 10, 'Strong': 20}
+
+
+def bench_mosaic(args):
+    """4K 전체 영역 모자이크 시간을 MOSAIC_LEVELS마다 측정합니다. (목표: 50 ms 미만)"""
+    from PyQt5.QtCore import QPoint, QRect
+    from PyQt5.QtGui import QImage, QPainter
+    from utils import pixelate_region
+
+    width, height = FRAME_SIZES["4k"]
+    raw = bytearray(os.urandom(width * height * 4))
+    image = QImage(raw, width, height, width * 4, QImage.Format_RGB32).copy()
+    rect = QRect(0, 0, width, height)
+    print(f"[mosaic] full {width}x{height} region, {args.runs} runs per level")
+
+    for name, block_size in MOSAIC_LEVELS.items():
+        samples = []
+        for _ in range(args.runs):
+            target = QImage(image)
+            start = time.perf_counter()
+            # ImageEditor.apply_mosaic과 같은 처리: 영역 모자이크 후 다시 그리기
+            pixelated = pixelate_region(target, rect, block_size)
+            painter = QPainter(target)
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.drawImage(QPoint(0, 0), pixelated)
+            painter.end()
+            samples.append((time.perf_counter() - start) * 1000)
+        _report(f"{name} (block {block_size})", samples)
+        status = "OK" if statistics.median(samples) < 50 else "OVER BUDGET"
+        print(f"    50 ms budget: {status}")
+
+
+def bench_undo(args):
+    """4K 이미지에 펜 획 N개를 그리며 UndoStore 메모리가 상한을 넘지 않는지 확인합니다."""
+    import random
+    from PyQt5.QtCore import QPoint, QRect, Qt
+    from PyQt5.QtGui import QColor, QImage, QPainter, QPen
+    from undo_store import UndoStore
+
+    width, height = FRAME_SIZES["4k"]
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(Qt.white)
+    ceiling = args.ceiling_mb * 1024 * 1024
+    store = UndoStore(budget_bytes=ceiling)
+    store.reset(image)
+    full_copies = args.strokes * image.byteCount()
+    print(f"[undo] {args.strokes} pen strokes on {width}x{height}, ceiling {args.ceiling_mb} MB "
+          f"(full-copy stack would hold {full_copies / 1024 / 1024:.0f} MB)")
+
+    rng = random.Random(0)
+    push_ms = []
+    peak = 0
+    for _ in range(args.strokes):
+        # ImageCanvas의 펜 도구와 같은 방식: 짧은 선분을 이어 그린 뒤 작업 후 상태 기록
+        painter = QPainter(image)
+        painter.setPen(QPen(QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)), 3,
+                            Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+        x, y = rng.randrange(width), rng.randrange(height)
+        bounds = QRect(x, y, 1, 1)
+        for _ in range(20):
+            nx = min(max(x + rng.randint(-40, 40), 0), width - 1)
+            ny = min(max(y + rng.randint(-40, 40), 0), height - 1)
+            painter.drawLine(QPoint(x, y), QPoint(nx, ny))
+            x, y = nx, ny
+            bounds = bounds.united(QRect(x, y, 1, 1))
+        painter.end()
+        start = time.perf_counter()
+        # ImageEditor.commit_pen_stroke와 같이 획 영역(펜 두께만큼 여유)만 비교
+        store.push(image, dirty_rect=bounds.adjusted(-3, -3, 3, 3))
+        push_ms.append((time.perf_counter() - start) * 1000)
+        peak = max(peak, store.memory_bytes)
+
+    _report("push (diff + store)", push_ms)
+
+    # 주석 도형 추가는 이미지를 바꾸지 않으므로 Undo 항목에 픽셀이 없음 (ImageEditor.add_annotation과 같은 기록 방식)
+    from annotation_layer import AnnotationLayer, ArrowAnnotation
+    layer = AnnotationLayer()
+    before = store.memory_bytes
+    for _ in range(args.strokes):
+        annotation = ArrowAnnotation(QPoint(rng.randrange(width), rng.randrange(height)),
+                                     QPoint(rng.randrange(width), rng.randrange(height)), QColor(Qt.red), 5)
+        layer.add(annotation)
+        store.push_change(lambda a=annotation: layer.remove(a), lambda a=annotation: layer.add(a))
+    print(f"  {args.strokes} arrow annotations added {store.memory_bytes - before} bytes of undo pixel data")
+    undo_ms = []
+    while store.can_undo:
+        start = time.perf_counter()
+        store.undo()
+        undo_ms.append((time.perf_counter() - start) * 1000)
+    if undo_ms:
+        _report("undo", undo_ms)
+    print(f"  undo steps available: {len(undo_ms)} / {args.strokes}")
+    print(f"  peak store memory: {peak / 1024 / 1024:.1f} MB")
+    status = "OK" if peak <= ceiling else "OVER CEILING"
+    print(f"    {args.ceiling_mb} MB ceiling: {status}")
+    if peak > ceiling:
+        raise SystemExit(1)
+
+
+def _canvas_editor_state():
+    """ImageCanvas가 참조하는 ImageEditor 속성만 가진 객체 (ImageEditor 창 전체를 만들지 않고 캔버스만 측정)"""
+    from types import SimpleNamespace
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QColor
+
+    state = SimpleNamespace(
+        current_tool=None, crop_rect_widget=None, is_selecting=False,
+        selection_start_point=None, selection_end_point=None, selection_rect_widget=None,
+        is_selection_active=False, selected_content_pixmap=None, selected_content_rect_widget=None,
+        stroke_points=[], edited_image=None,
+        arrow_color=QColor(Qt.red), current_arrow_thickness=5,
+        circle_color=QColor(Qt.red), current_circle_thickness=5,
+        rectangle_color=QColor(Qt.red), current_rectangle_thickness=5,
+        highlight_color=QColor(255, 255, 0, 128), current_highlight_thickness=24,
+        pen_color=QColor(Qt.red), current_pen_thickness=5)
+
+    return state
+
+
+def bench_canvas(args):
+    """큰 이미지 위에서 도구를 드래그할 때 ImageCanvas.paintEvent 시간과 입력-화면 반영 지연을 측정합니다. (QT_QPA_PLATFORM=offscreen 가능)"""
+    from PyQt5.QtCore import QEvent, QPoint, Qt
+    from PyQt5.QtGui import QImage, QMouseEvent
+    from PyQt5.QtWidgets import QApplication
+    from canvas_widget import ImageCanvas
+
+    app = QApplication.instance() or QApplication([])
+    width, height = FRAME_SIZES[args.size]
+    raw = bytearray(os.urandom(width * height * 4))
+    image = QImage(raw, width, height, width * 4, QImage.Format_RGB32).copy()
+
+    editor = _canvas_editor_state()
+    editor.edited_image = image
+    canvas = ImageCanvas(editor)
+    canvas.resize(1600, 900)
+    canvas.setImage(image)
+    canvas.show()
+    app.processEvents()
+    if args.zoom:
+        canvas.set_zoom(args.zoom)
+        app.processEvents()
+    print(f"[canvas] {width}x{height} image in a 1600x900 canvas at {canvas.display_scale() * 100:.0f}%, "
+          f"{args.moves} mouse moves per tool")
+
+    def mouse(kind, pos):
+        return QMouseEvent(kind, pos, Qt.LeftButton, Qt.LeftButton, Qt.NoModifier)
+
+    for tool in ("rectangle", "arrow", "highlight", "pen"):
+        editor.current_tool = tool
+        canvas.setImage(editor.edited_image)
+        frame_ms = []
+        canvas.mousePressEvent(mouse(QEvent.MouseButtonPress, QPoint(200, 200)))
+        app.processEvents()
+        for i in range(args.moves):
+            pos = QPoint(200 + (i * 7) % 1200, 200 + (i * 5) % 600)
+            start = time.perf_counter()
+            canvas.mouseMoveEvent(mouse(QEvent.MouseMove, pos))
+            canvas.setImage(editor.edited_image)
+            app.processEvents()
+            frame_ms.append((time.perf_counter() - start) * 1000)
+        paint_ms = list(canvas.paint_times)
+        latency_ms = list(canvas.input_latencies)
+        commit_ms = None
+        if tool == "pen" and canvas._stroke is not None:
+            # 릴리스 시 하는 일: 획 버퍼를 이미지에 한 번 합치고 그 영역만 다시 표시
+            start = time.perf_counter()
+            bounds = canvas._stroke.commit(editor.edited_image)
+            canvas.refresh_image_region(bounds)
+            app.processEvents()
+            commit_ms = [(time.perf_counter() - start) * 1000]
+        # 드래그 종료는 실제 편집을 수행하므로(ImageEditor 필요) 상태만 되돌림
+        editor.is_selecting = False
+        editor.selection_start_point = editor.selection_end_point = None
+        editor.stroke_points = []
+        canvas._stroke = None
+        canvas.paint_times = []
+        canvas.input_latencies = []
+        _report(f"{tool} move+paint", frame_ms)
+        if paint_ms:
+            _report(f"{tool} paintEvent", paint_ms)
+        if latency_ms:
+            _report(f"{tool} input-to-pixel", latency_ms)
+        if commit_ms:
+            _report(f"{tool} commit on release", commit_ms)
+
+    # 확대 상태에서 보기 이동: 보이는 타일만 다시 그림
+    if canvas.is_zoomed():
+        pan_ms = []
+        for i in range(args.moves):
+            start = time.perf_counter()
+            canvas.pan_by(-8 if (i // 50) % 2 == 0 else 8, -4)
+            canvas.repaint()
+            pan_ms.append((time.perf_counter() - start) * 1000)
+        _report("pan + repaint", pan_ms)
+    canvas.close()
+
+
+def bench_spectrum(args):
+    """색상 선택 대화상자에서 Hue를 끌 때 SV 스펙트럼을 만드는 시간을 측정합니다. (처음 만들 때 / 캐시에서 가져올 때)"""
+    from PyQt5.QtWidgets import QApplication
+    from color_picker_module import ColorSpectrumWidget
+
+    app = QApplication.instance() or QApplication([])
+    widget = ColorSpectrumWidget()
+    widget.resize(330, 300)
+    widget.show()
+    app.processEvents()
+    hues = [(i * 7) % 360 for i in range(args.steps)]
+    print(f"[spectrum] {widget.width() - 30}x{widget.height()} SV area, {len(hues)} hue changes "
+          f"(a 60 Hz display allows {1000 / 60:.1f} ms per frame)")
+
+    for label in ("first pass", "cached"):
+        if label == "first pass":
+            ColorSpectrumWidget._sv_cache.clear()
+        samples = []
+        for hue in hues:
+            start = time.perf_counter()
+            widget._hue = hue
+            widget._sv_pixmap = widget._generate_sv_spectrum()
+            widget.repaint()
+            samples.append((time.perf_counter() - start) * 1000)
+        _report(f"hue change + repaint ({label})", samples)
+    widget.close()
+
+
+def bench_clipboard(args):
+    """편집기 복사 시 클립보드 데이터 생성 시간: 기존 PNG -> Pillow -> BMP 경로와 DIB 직접 생성 비교"""
+    import io
+    from PIL import Image
+    from PyQt5.QtCore import QBuffer, QIODevice
+    from PyQt5.QtGui import QImage
+    from PyQt5.QtWidgets import QApplication
+    from clipboard_export import build_dib, build_dib_v5, QtClipboardBackend
+
+    app = QApplication.instance() or QApplication([])
+    width, height = FRAME_SIZES[args.size]
+    raw = bytearray(os.urandom(width * height * 4))
+    image = QImage(raw, width, height, width * 4, QImage.Format_RGB32).copy()
+    print(f"[clipboard] {width}x{height}, {args.runs} runs")
+
+    def legacy_dib():
+        # 기존 copy_to_clipboard 처리: PNG 저장 -> Pillow 디코드 -> BMP 저장 -> 파일 헤더 14바이트 제거
+        buffer = QBuffer()
+        buffer.open(QIODevice.WriteOnly)
+        image.save(buffer, "PNG")
+        pil_image = Image.open(io.BytesIO(buffer.data()))
+        output = io.BytesIO()
+        pil_image.save(output, "BMP")
+        return output.getvalue()[14:]
+
+    results = {}
+    for label, fn in (("PNG -> Pillow -> BMP", legacy_dib), ("direct CF_DIB (24-bit)", lambda: build_dib(image)),
+                      ("direct CF_DIBV5 (32-bit alpha)", lambda: build_dib_v5(image))):
+        samples = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            results[label] = fn()
+            samples.append((time.perf_counter() - start) * 1000)
+        _report(label, samples)
+    # 헤더(40바이트) 뒤의 픽셀 행이 기존 경로와 같은지 확인 (해상도 필드는 다를 수 있음)
+    same = results["PNG -> Pillow -> BMP"][40:] == results["direct CF_DIB (24-bit)"][40:]
+    print(f"  CF_DIB pixel rows identical to the Pillow BMP: {'yes' if same else 'NO'}")
+
+    backend = QtClipboardBackend()
+    samples = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        backend.copy_image(image)
+        app.processEvents()
+        samples.append((time.perf_counter() - start) * 1000)
+    _report("Qt clipboard setImage", samples)
+
+
+def _synthetic_screenshots(width, height):
+    """
+    형식 비교용 합성 화면 이미지 (PIL)
+    ui: 단색 패널 + 글자 (일반 창/문서 화면), photo: 부드러운 그라데이션 + 잡음 (사진/영상 화면)
+    """
+    import random
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(1234)
+    ui = Image.new("RGB", (width, height), (245, 246, 248))
+    draw = ImageDraw.Draw(ui)
+    draw.rectangle((0, 0, width, 48), fill=(32, 33, 36))
+    draw.rectangle((0, 48, 280, height), fill=(230, 232, 236))
+    for y in range(72, height - 24, 22):
+        x = 300 + rng.randint(0, 40)
+        words = " ".join("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9)))
+                         for _ in range(rng.randint(4, 18)))
+        draw.text((x, y), words, fill=(40, 40, 40))
+        if rng.random() < 0.1:
+            draw.rectangle((x, y, x + rng.randint(80, 400), y + 18), outline=(26, 115, 232))
+
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width, height), 24)
+    photo = Image.merge("RGB", (gradient, Image.blend(gradient.transpose(Image.FLIP_LEFT_RIGHT), noise, 0.3), noise))
+    return {"ui": ui, "photo": photo}
+
+
+def bench_encode(args):
+    """저장 형식별 인코딩 시간과 파일 크기를 화면 이미지 묶음(합성 또는 --corpus 디렉토리)에서 측정합니다."""
+    import io
+    from PIL import Image
+    from image_encoder import ImageEncoder
+
+    width, height = FRAME_SIZES[args.size]
+    corpus = _synthetic_screenshots(width, height)
+    if args.corpus:
+        for name in sorted(os.listdir(args.corpus)):
+            if name.lower().endswith((".png", ".bmp", ".jpg", ".jpeg", ".webp")):
+                with Image.open(os.path.join(args.corpus, name)) as image:
+                    corpus[name] = image.convert("RGB")
+
+    candidates = [("png", 0), ("png", 67), ("png", 100), ("webp", 100), ("webp", 80), ("jpeg", 90), ("qoi", 100)]
+    auto = ImageEncoder("auto")
+    for label, image in corpus.items():
+        raw_size = image.width * image.height * 3
+        print(f"[encode] {label}: {image.width}x{image.height}, {args.runs} runs")
+        # auto 형식의 내용 분석 시간과 결정
+        samples = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            chosen, stats = auto.choose(image)
+            samples.append((time.perf_counter() - start) * 1000)
+        _report(f"auto analysis -> {chosen.format} q{chosen.quality}", samples)
+        print(f"    colors {stats.colors}, flat {stats.flat_ratio:.0%}, entropy {stats.entropy:.2f}")
+        for image_format, quality in candidates:
+            if not ImageEncoder.is_supported(image_format):
+                print(f"  {image_format:<5} q{quality:<3} not supported by this Pillow build")
+                continue
+            encoder = ImageEncoder(image_format, quality)
+            samples, size = [], 0
+            for _ in range(args.runs):
+                output = io.BytesIO()
+                start = time.perf_counter()
+                encoder.save(image, output)
+                samples.append((time.perf_counter() - start) * 1000)
+                size = output.tell()
+            _report(f"{image_format} q{quality} ({size / 1024:.0f} KB, {size / raw_size * 100:.1f}%)", samples)
+
+
+def bench_png_parallel(args):
+    """큰 캡처의 PNG 저장: Pillow(한 코어) 대비 병렬 띠 압축의 처리량, 크기, 디코드 일치 여부"""
+    import io
+    from PIL import Image
+    from png_parallel import save_png_parallel
+
+    workers = os.cpu_count() or 1
+    for size in args.sizes.split(","):
+        width, height = FRAME_SIZES[size] if size in FRAME_SIZES else tuple(int(v) for v in size.split("x"))
+        megabytes = width * height * 3 / 1024 / 1024
+        for label, image in _synthetic_screenshots(width, height).items():
+            print(f"[png-parallel] {label} {width}x{height} ({megabytes:.0f} MB raw), level {args.level}, "
+                  f"{workers} cores, {args.runs} runs")
+            candidates = [("Pillow", lambda out: image.save(out, "PNG", compress_level=args.level))]
+            for count in sorted({1, workers}):
+                candidates.append((f"parallel x{count}",
+                                   lambda out, count=count: save_png_parallel(image, out, args.level, count)))
+            for name, fn in candidates:
+                samples, output = [], None
+                for _ in range(args.runs):
+                    output = io.BytesIO()
+                    start = time.perf_counter()
+                    fn(output)
+                    samples.append((time.perf_counter() - start) * 1000)
+                throughput = megabytes / (statistics.median(samples) / 1000)
+                _report(f"{name} ({output.tell() / 1024 / 1024:.1f} MB, {throughput:.0f} MB/s)", samples)
+                # 디코드 후 원본과 픽셀이 같은지 확인
+                output.seek(0)
+                with Image.open(output) as decoded:
+                    same = decoded.convert(image.mode).tobytes() == image.tobytes()
+                if not same:
+                    print(f"    {name}: decoded pixels DIFFER from the source")
+                    raise SystemExit(1)
+            print("    round-trip decode: all outputs match the source pixels")
+
+
+def bench_recompress(args):
+    """가장 빠른 레벨로 저장한 캡처를 유휴 시간 재압축기로 다시 저장했을 때의 시간과 절약 크기"""
+    import shutil
+    import tempfile
+    from recompressor import IdleRecompressor
+
+    width, height = FRAME_SIZES[args.size]
+    directory = tempfile.mkdtemp(prefix="recompress_bench_")
+    try:
+        # 캡처 시점 저장 (fast_png: 압축 레벨 1)
+        for label, image in _synthetic_screenshots(width, height).items():
+            start = time.perf_counter()
+            image.save(os.path.join(directory, f"{label}.png"), "PNG", compress_level=1)
+            print(f"[recompress] {label} {width}x{height}: capture-time save (level 1) "
+                  f"{(time.perf_counter() - start) * 1000:.0f} ms")
+        recompressor = IdleRecompressor(directory, os.path.join(directory, "state.json"), target=args.format)
+        for path in sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                           if name.endswith(".png")):
+            before = os.path.getsize(path)
+            start = time.perf_counter()
+            saved = recompressor.recompress(path)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"  {os.path.basename(path):<10} {before / 1024:8.0f} KB -> {(before - saved) / 1024:8.0f} KB "
+                  f"({saved / max(before, 1):.0%} reclaimed) in {elapsed_ms:.0f} ms (incl. verify)")
+        print(f"  total reclaimed: {recompressor.bytes_reclaimed / 1024:.0f} KB")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def bench_history(args):
+    """캡처 기록 색인: N개 항목 기록 시간과 최근 목록/검색/중복 찾기 조회 시간"""
+    import random
+    import shutil
+    import tempfile
+    from types import SimpleNamespace
+    from capture_history import CaptureHistory
+
+    rng = random.Random(1234)
+    processes = ["chrome.exe", "Code.exe", "explorer.exe", "slack.exe", "WINWORD.EXE", "python.exe"]
+    directory = tempfile.mkdtemp(prefix="history_bench_")
+    history = CaptureHistory(os.path.join(directory, "history.sqlite3"))
+    try:
+        start_time = time.time() - args.count * 60
+        entries = []
+        for index in range(args.count):
+            timestamp = start_time + index * 60
+            stat = SimpleNamespace(st_mtime=timestamp, st_size=rng.randint(50000, 3000000))
+            process = rng.choice(processes)
+            entries.append(history._entry(
+                os.path.join(directory, f"screenshot_{index:06d}.png"), stat, 1920, 1080,
+                f"{rng.getrandbits(128):032x}", timestamp, "window", f"Document {index} - {process}", process))
+        start = time.perf_counter()
+        for offset in range(0, len(entries), 200):
+            history._upsert(entries[offset:offset + 200])
+        print(f"[history] {args.count} entries recorded in {(time.perf_counter() - start) * 1000:.0f} ms "
+              f"(batches of 200), {args.runs} runs per query")
+
+        queries = [
+            ("count", lambda: history.count()),
+            ("recent page (100)", lambda: history.recent(100)),
+            ("recent deep page (offset 90%)", lambda: history.recent(100, int(args.count * 0.9))),
+            ("search text 'document 12'", lambda: history.search("document 12")),
+            ("search process + last day", lambda: history.search(process_name="slack.exe",
+                                                                 since=time.time() - 86400)),
+            ("find by hash", lambda: history.find_by_hash(entries[len(entries) // 2][-1])),
+        ]
+        for label, query in queries:
+            samples = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                query()
+                samples.append((time.perf_counter() - start) * 1000)
+            _report(label, samples)
+    finally:
+        history.close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _bench_thumbnail_loads(loader, paths, size):
+    """파일마다 전체 디코드, 캐시 없는 축소 디코드, 디스크 캐시 적중 시간 측정 (형식별)"""
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QImage
+
+    for extension in (".png", ".jpg"):
+        selected = [path for path in paths if path.endswith(extension)]
+        full, reduced, cached = [], [], []
+        for path in selected:
+            start = time.perf_counter()
+            QImage(path).scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            full.append((time.perf_counter() - start) * 1000)
+            key = os.path.basename(path)
+            start = time.perf_counter()
+            loader._load(key, path)
+            reduced.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            loader._load(key, path)
+            cached.append((time.perf_counter() - start) * 1000)
+        _report(f"{extension} full decode + scale", full)
+        _report(f"{extension} reduced decode + cache write", reduced)
+        _report(f"{extension} disk cache hit", cached)
+
+
+def bench_thumbnails(args):
+    """갤러리 썸네일/미리보기 한 장의 비용: 전체 디코드 후 축소 vs 축소 디코드(캐시 없음) vs 디스크 캐시 (QT_QPA_PLATFORM=offscreen 가능)"""
+    import shutil
+    import tempfile
+    from PyQt5.QtWidgets import QApplication
+    from history_gallery import HistoryGallery, ThumbnailLoader
+    from thumbnail_cache import ThumbnailCache
+
+    QApplication.instance() or QApplication([])  # 이미지 형식 플러그인 로드용
+    width, height = FRAME_SIZES[args.size]
+    directory = tempfile.mkdtemp(prefix="thumbnail_bench_")
+    try:
+        images = list(_synthetic_screenshots(width, height).values())
+        paths = []
+        for index in range(args.count):
+            for extension in (".png", ".jpg"):
+                path = os.path.join(directory, f"capture_{index:03d}{extension}")
+                images[index % len(images)].save(path)
+                paths.append(path)
+        cache = ThumbnailCache(os.path.join(directory, "cache"))
+        for size in (HistoryGallery.THUMBNAIL_SIZE, HistoryGallery.PREVIEW_SIZE):
+            loader = ThumbnailLoader(cache, size, workers=1)
+            loader.stop()  # 측정은 _load를 직접 호출
+            print(f"[thumbnails] {len(paths)} files ({width}x{height}, PNG and JPEG) -> {size.width()}x{size.height()}")
+            _bench_thumbnail_loads(loader, paths, size)
+        print(f"  disk cache: {cache.total_bytes / 1024:.0f} KB for {len(paths)} files x 2 sizes")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def bench_preview_resize(args):
+    """창 가장자리를 끌 때 미리보기 갱신 비용: 매번 원본 전체를 QPixmap 변환 + 축소 vs 프록시에서 작업자 스레드 축소 (QT_QPA_PLATFORM=offscreen 가능)"""
+    from PyQt5.QtCore import QSize, Qt
+    from PyQt5.QtGui import QImage, QPixmap
+    from PyQt5.QtWidgets import QApplication
+    from preview_scaler import PreviewScaler
+
+    app = QApplication.instance() or QApplication([])
+    width, height = FRAME_SIZES[args.size]
+    raw = bytearray(os.urandom(width * height * 4))
+    image = QImage(raw, width, height, width * 4, QImage.Format_RGB32).copy()
+    # 360x282 -> 1600x1000 으로 끄는 동안의 라벨 크기
+    sizes = [QSize(360 + (1600 - 360) * step // args.steps, 282 + (1000 - 282) * step // args.steps)
+             for step in range(args.steps)]
+    print(f"[preview-resize] {width}x{height} capture, {args.steps} resize steps")
+
+    samples = []
+    for size in sizes:
+        start = time.perf_counter()
+        QPixmap.fromImage(image).scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        samples.append((time.perf_counter() - start) * 1000)
+    _report("old: per-step fromImage + scale", samples)
+    print(f"    GUI thread busy {sum(samples):.0f} ms over the drag")
+
+    scaler = PreviewScaler(QSize(3840, 2160))
+    results = []
+    scaler.scaled.connect(lambda generation, scaled: results.append(scaled))
+    scaler.set_source(image)
+    # 첫 요청은 프록시 생성 포함
+    scaler.request(sizes[0])
+    while not results:
+        app.processEvents()
+    proxy_ms = scaler.scale_times[-1]
+    gui_samples = []
+    for size in sizes[1:]:
+        scaler.request(size)
+        count = len(results)
+        while len(results) == count:
+            app.processEvents()
+        start = time.perf_counter()
+        QPixmap.fromImage(results[-1])
+        gui_samples.append((time.perf_counter() - start) * 1000)
+    scaler.stop()
+    print(f"  first request (builds proxy)     {proxy_ms:8.2f} ms on the worker")
+    _report("new: worker scale from proxy", list(scaler.scale_times)[1:])
+    _report("new: GUI-thread fromImage (small)", gui_samples)
+    print(f"    coalesced: a drag ending in one timer fire needs 1 scale instead of {args.steps}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ImageCapturePAAK benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("capture-session", help="Per-capture mss setup cost")
+    p.add_argument("--shots", type=int, default=30)
+    p.set_defaults(func=bench_capture_session)
+
+    p = subparsers.add_parser("frame-copy", help="Bytes copied per capture on synthetic frames")
+    p.add_argument("--runs", type=int, default=10)
+    p.add_argument("--sizes", default="1080p,4k,8k")
+    p.set_defaults(func=bench_frame_copy)
+
+    p = subparsers.add_parser("virtual-desktop", help="Parallel per-monitor capture vs monitors[0]")
+    p.add_argument("--shots", type=int, default=30)
+    p.set_defaults(func=bench_virtual_desktop)
+
+    p = subparsers.add_parser("burst", help="Burst capture rate and dropped frames")
+    p.add_argument("--count", type=int, default=30)
+    p.add_argument("--interval-ms", type=int, default=100)
+    p.set_defaults(func=bench_burst)
+
+    p = subparsers.add_parser("mosaic", help="Mosaic time on a full 4K region")
+    p.add_argument("--runs", type=int, default=10)
+    p.set_defaults(func=bench_mosaic)
+
+    p = subparsers.add_parser("undo", help="Undo memory for pen strokes on 4K")
+    p.add_argument("--strokes", type=int, default=200)
+    p.add_argument("--ceiling-mb", type=int, default=64)
+    p.set_defaults(func=bench_undo)
+
+    p = subparsers.add_parser("canvas", help="Editor canvas frame time and input-to-pixel latency while dragging")
+    p.add_argument("--moves", type=int, default=200)
+    p.add_argument("--size", choices=sorted(FRAME_SIZES), default="4k")
+    p.add_argument("--zoom", type=float, default=None, help="Zoom factor (default: fit to window)")
+    p.set_defaults(func=bench_canvas)
+
+    p = subparsers.add_parser("spectrum", help="Color picker SV spectrum regeneration while dragging hue")
+    p.add_argument("--steps", type=int, default=200)
+    p.set_defaults(func=bench_spectrum)
+
+    p = subparsers.add_parser("clipboard", help="Clipboard copy latency: PNG/BMP round trip vs direct DIB")
+    p.add_argument("--runs", type=int, default=10)
+    p.add_argument("--size", choices=sorted(FRAME_SIZES), default="4k")
+    p.set_defaults(func=bench_clipboard)
+
+    p = subparsers.add_parser("encode", help="Encode time and file size per save format")
+    p.add_argument("--runs", type=int, default=3)
+    p.add_argument("--size", choices=sorted(FRAME_SIZES), default="1080p")
+    p.add_argument("--corpus", default=None, help="Directory of real screenshots to add to the synthetic set")
+    p.set_defaults(func=bench_encode)
+
+    p = subparsers.add_parser("png-parallel", help="Parallel strip PNG encoder vs Pillow on large captures")
+    p.add_argument("--runs", type=int, default=3)
+    p.add_argument("--sizes", default="4k,8000x8000", help="Comma-separated names (1080p, 4k, 8k) or WxH")
+    p.add_argument("--level", type=int, default=6)
+    p.set_defaults(func=bench_png_parallel)
+
+    p = subparsers.add_parser("recompress", help="Idle-time recompression of fast-saved captures: time and bytes reclaimed")
+    p.add_argument("--size", choices=sorted(FRAME_SIZES), default="1080p")
+    p.add_argument("--format", choices=["png", "webp"], default="png")
+    p.set_defaults(func=bench_recompress)
+
+    p = subparsers.add_parser("history", help="Capture history index: record and query time")
+    p.add_argument("--count", type=int, default=20000)
+    p.add_argument("--runs", type=int, default=20)
+    p.set_defaults(func=bench_history)
+
+    p = subparsers.add_parser("thumbnails", help="Gallery thumbnail/preview cost: full decode vs reduced decode vs disk cache")
+    p.add_argument("--count", type=int, default=10)
+    p.add_argument("--size", choices=sorted(FRAME_SIZES), default="4k")
+    p.set_defaults(func=bench_thumbnails)
+
+    p = subparsers.add_parser("preview-resize", help="Main window preview rescale cost while resizing")
+    p.add_argument("--steps", type=int, default=60)
+    p.add_argument("--size", choices=sorted(FRAME_SIZES), default="4k")
+    p.set_defaults(func=bench_preview_resize)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import threading
+import time
+import traceback
+from collections import deque
+
+import mss
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from capture_result import CaptureResult
+
+
+class BurstCapture(QObject):
+    """
+    연속 캡처 (버스트 모드)
+    전용 스레드에서 정해진 간격으로 N장을 메모리에 캡처하고, 인코딩/저장은 SaveQueue에 맡깁니다.
+    저장 대기열이 가득 차도 캡처는 멈추지 않으며, 넣지 못한 프레임은 대기 목록에 두었다가 순서대로 넣어 유실되지 않습니다.
+    밀린 프레임은 매 프레임마다 자리가 나는 대로 먼저 넣고, 대기 목록이 max_backlog장으로 가득 찼을 때만 가장 오래된 프레임이 들어갈 때까지 캡처를 잠시 멈춰 메모리를 제한합니다.
+    """
+    # 한 장 캡처될 때마다 (순번, 총 장수)
+    frameCaptured = pyqtSignal(int, int)
+    # 캡처 완료 (마지막 프레임 CaptureResult 또는 None, 저장 경로 리스트)
+    finished = pyqtSignal(object, list)
+    # 캡처 실패 (오류 메시지)
+    failed = pyqtSignal(str)
+    # 저장 대기열이 닫혀 프레임을 넣지 못함 (경로, 오류 메시지), SaveQueue.saveFailed와 같은 형식
+    saveRejected = pyqtSignal(str, str)
+
+    def __init__(self, monitor, count, interval_ms, save_queue, name_fn, max_backlog=8, parent=None):
+        """
+        :param monitor: 캡처할 mss 모니터 영역 {"left", "top", "width", "height"}
+        :param count: 캡처할 장수
+        :param interval_ms: 캡처 간격 (ms)
+        :param save_queue: 저장에 사용할 SaveQueue
+        :param name_fn: (CaptureResult, 순번) -> 저장 경로 를 반환하는 함수
+        :param max_backlog: 저장 대기열에 넣지 못하고 메모리에 둘 최대 프레임 수
+        """
+        super().__init__(parent)
+        self.monitor = dict(monitor)
+        self.count = max(1, count)
+        self.interval = max(interval_ms, 0) / 1000.0
+        self.save_queue = save_queue
+        self.name_fn = name_fn
+        self.max_backlog = max(1, max_backlog)
+        self.frame_times = []  # 각 프레임의 캡처 시각 (perf_counter)
+        self.paths = []  # 발급된 저장 경로 (캡처 순서)
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """캡처 스레드 시작 (즉시 반환)"""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="BurstCapture", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """진행 중인 버스트 중단 (이미 캡처한 프레임은 저장됨)"""
+        self._stop_event.set()
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _submit_blocking(self, frame, path):
+        """자리가 날 때까지 기다렸다가 저장 대기열에 넣음 (대기열이 닫혀 있으면 실패로 알림)"""
+        if not self.save_queue.submit(frame, path, block=True):
+            self.saveRejected.emit(path, "Save queue is closed")
+
+    def _drain_backlog(self, backlog):
+        """밀린 프레임을 오래된 것부터 비차단으로 넣음 (대기열이 다시 가득 차면 멈춤)"""
+        while backlog and self.save_queue.submit(*backlog[0]):
+            backlog.popleft()
+
+    def _run(self):
+        last_frame, paths = None, self.paths
+        backlog = deque()  # 저장 대기열이 가득 차서 아직 넣지 못한 (프레임, 경로)
+        try:
+            with mss.mss() as sct:
+                start = time.perf_counter()
+                for index in range(self.count):
+                    # 시작 시각 기준의 절대 일정 (캡처 시간이 간격에 누적되지 않도록)
+                    delay = start + index * self.interval - time.perf_counter()
+                    if delay > 0 and self._stop_event.wait(delay):
+                        break
+                    if self._stop_event.is_set():
+                        break
+                    timestamp = time.time()
+                    self.frame_times.append(time.perf_counter())
+                    screenshot = sct.grab(self.monitor)
+                    frame = CaptureResult.from_bgra(
+                        screenshot.raw, screenshot.width, screenshot.height, "burst",
+                        left=self.monitor["left"], top=self.monitor["top"], timestamp=timestamp)
+                    path = self.name_fn(frame, index + 1)
+                    last_frame = frame
+                    paths.append(path)
+                    # 대기열에 자리가 났으면 밀린 프레임부터 순서대로 비차단으로 넣음
+                    self._drain_backlog(backlog)
+                    # 캡처를 막지 않도록 비차단으로 넣고, 실패하면 나중에 넣음 (밀린 프레임이 남아 있으면 순서 유지)
+                    if backlog or not self.save_queue.submit(frame, path):
+                        if len(backlog) >= self.max_backlog:
+                            print(f"[Burst] Backlog full ({self.max_backlog} frames), waiting for the save queue")
+                            self._submit_blocking(*backlog.popleft())
+                        backlog.append((frame, path))
+                    self.frameCaptured.emit(index + 1, self.count)
+            self._report()
+            # 남은 프레임은 저장 대기열에 자리가 날 때까지 기다렸다가 넣음 (캡처는 이미 끝남)
+            while backlog:
+                self._submit_blocking(*backlog.popleft())
+            self.finished.emit(last_frame, list(paths))
+        except Exception as e:
+            print(f"[Burst] Error during burst capture: {e}")
+            traceback.print_exc()
+            # 저장 대기열에 넣지 못한 프레임의 경로 예약 해제
+            for _, path in backlog:
+                self.saveRejected.emit(path, str(e))
+            self.failed.emit(str(e))
+
+    def _report(self):
+        """달성한 캡처 속도와 늦은 프레임 수 출력"""
+        times = self.frame_times
+        if len(times) < 2:
+            return
+        gaps = [(b - a) for a, b in zip(times, times[1:])]
+        fps = (len(times) - 1) / (times[-1] - times[0])
+        # 목표 간격의 1.5배를 넘긴 간격은 프레임을 놓친 것으로 간주
+        late = sum(1 for gap in gaps if self.interval and gap > self.interval * 1.5)
+        print(f"[Burst] {len(times)} frames, {fps:.1f} fps, max gap {max(gaps) * 1000:.1f} ms, late frames: {late}")
@@ -1,18 +1,26 @@
 import sys
 import os
 import math
+import time
 import traceback
 from PyQt5.QtWidgets import QWidget, QLineEdit
 from PyQt5.QtGui import (QPixmap, QImage, QIcon, QPainter, QPen, QColor, 
                          QPolygonF, QBrush, QFont, QFontMetrics, QCursor, QPainterPath)
 from PyQt5.QtCore import Qt, QSize, QRect, QPoint, QRectF, QSizeF, QLineF, QPointF
 
+from tile_pyramid import TilePyramid
+from stroke_engine import StrokeBuffer
+
 class ImageCanvas(QWidget):
     """이미지를 직접 그리는 캔버스 위젯"""
     # 핸들 크기 및 상태 상수 정의
     HANDLE_SIZE = 8
     HANDLE_HALF = HANDLE_SIZE // 2
     NO_HANDLE, TOP_LEFT, TOP_MIDDLE, TOP_RIGHT, MIDDLE_LEFT, MIDDLE_RIGHT, BOTTOM_LEFT, BOTTOM_MIDDLE, BOTTOM_RIGHT, MOVE_RECT = range(10)
+    # 확대/축소 범위 및 단계
+    MIN_ZOOM = 0.02
+    MAX_ZOOM = 32.0
+    ZOOM_STEP = 1.25
 
     def __init__(self, editor, parent=None):
         super().__init__(parent)
@@ -22,6 +30,19 @@ class ImageCanvas(QWidget):
         self.dragging_handle = self.NO_HANDLE # 현재 드래그 중인 핸들 상태
         self.drag_start_pos = None # 드래그 시작 마우스 위치
         self.drag_start_rect = None # 드래그 시작 시 사각형 위치/크기
+        self._display_pixmap = None # 현재 보기로 그린 위젯 크기의 이미지 캐시 (QPixmap)
+        self._display_key = None # 캐시 기준 (이미지 cacheKey, 주석 레이어 버전, 위젯 크기, 배율, 원점)
+        self._pyramid = None # 밉맵 타일 피라미드 (TilePyramid)
+        self._pyramid_key = None # 피라미드를 만든 이미지의 cacheKey
+        self._zoom = None # 확대 배율 (None이면 창에 맞춤)
+        self._view_origin = QPointF() # 확대 시 이미지 (0, 0)의 위젯 좌표
+        self._pan_last_pos = None # 가운데 버튼 드래그(이동) 중 마지막 마우스 위치
+        self._annotation_drag = None # 주석 도형 이동 중 [도형, 시작 이미지 좌표, 마지막 이미지 좌표]
+        self._preview_rect = QRect() # 마지막으로 그린 도구 미리보기 영역 (위젯 좌표)
+        self.paint_times = [] # 드래그 중 paintEvent 소요 시간 (ms)
+        self._stroke = None # 진행 중인 펜/하이라이트 획 버퍼 (StrokeBuffer)
+        self._input_time = None # 아직 화면에 반영되지 않은 첫 입력 시각 (perf_counter)
+        self.input_latencies = [] # 획 입력부터 화면 반영(paintEvent 종료)까지 걸린 시간 (ms)
         
         # 배경 설정
         self.setStyleSheet("background-color: #282828;")
@@ -29,44 +50,51 @@ class ImageCanvas(QWidget):
         self.setMinimumSize(600, 400)
         
     def setImage(self, image):
-        """QImage 설정"""
+        """QImage 설정 (크기가 바뀌면 창에 맞춤 보기로 돌아감)"""
+        if self.image is not None and image is not None and self.image.size() != image.size():
+            self._zoom = None
         self.image = image
         
+    def view_transform(self):
+        """
+        현재 보기 변환
+        :return: (이미지 1픽셀의 표시 크기, 이미지 (0, 0)의 위젯 좌표 QPointF)
+        """
+        if self._zoom is None:
+            # 창에 맞춤: 가로세로 비율 유지, 가운데 정렬
+            widget_rect = self.rect()
+            scaled_size = self.image.size().scaled(widget_rect.size(), Qt.KeepAspectRatio)
+            x = (widget_rect.width() - scaled_size.width()) / 2
+            y = (widget_rect.height() - scaled_size.height()) / 2
+            scale = scaled_size.width() / self.image.width() if self.image.width() > 0 else 1.0
+            return scale, QPointF(int(x), int(y))
+        return self._zoom, QPointF(self._view_origin)
+
+    def image_display_rect(self):
+        """이미지가 표시되는 위젯 영역 (확대 시 위젯 밖으로 나갈 수 있음)"""
+        scale, origin = self.view_transform()
+        return QRectF(origin, QSizeF(self.image.width() * scale, self.image.height() * scale)).toAlignedRect()
+
+    def display_scale(self):
+        """이미지 1픽셀이 화면에 표시되는 크기 (위젯 픽셀)"""
+        if not self.image or self.image.isNull() or self.image.width() <= 0:
+            return 1.0
+        return self.view_transform()[0]
+
     def map_widget_to_image(self, widget_point):
-        """위젯 좌표를 이미지 원본 좌표로 변환"""
+        """위젯 좌표를 이미지 원본 좌표로 변환 (현재 확대/이동 반영, 이미지 밖은 경계값으로 조정)"""
         if not self.image or self.image.isNull():
             return None
 
         img_size = self.image.size()
-        widget_rect = self.rect()
-        scaled_size = img_size.scaled(widget_rect.size(), Qt.KeepAspectRatio)
-        
-        x_offset = (widget_rect.width() - scaled_size.width()) / 2
-        y_offset = (widget_rect.height() - scaled_size.height()) / 2
-        
-        # QSize를 QSizeF로 변환하여 QRectF 생성
-        target_rect = QRectF(QPoint(int(x_offset), int(y_offset)), QSizeF(scaled_size))
-
-        if not target_rect.contains(widget_point):
-            # 위젯 좌표가 이미지 표시 영역 밖에 있으면 경계값으로 조정
-            adjusted_x = max(target_rect.left(), min(widget_point.x(), target_rect.right()))
-            adjusted_y = max(target_rect.top(), min(widget_point.y(), target_rect.bottom()))
-            widget_point = QPoint(int(adjusted_x), int(adjusted_y))
-
-        relative_x = widget_point.x() - target_rect.left()
-        relative_y = widget_point.y() - target_rect.top()
-
         # 0으로 나누기 방지 및 유효성 검사
-        if img_size.width() <= 0 or img_size.height() <= 0 or scaled_size.width() <= 0 or scaled_size.height() <= 0:
+        if img_size.width() <= 0 or img_size.height() <= 0:
              return None
+        scale, origin = self.view_transform()
+        if scale <= 0: return None
 
-        scale_x = scaled_size.width() / img_size.width()
-        scale_y = scaled_size.height() / img_size.height()
-
-        if scale_x == 0 or scale_y == 0: return None 
-
-        img_x = relative_x / scale_x
-        img_y = relative_y / scale_y
+        img_x = (widget_point.x() - origin.x()) / scale
+        img_y = (widget_point.y() - origin.y()) / scale
         
         # 이미지 경계 내로 강제 조정
         img_x = max(0, min(img_x, img_size.width() - 1))
@@ -74,37 +102,285 @@ class ImageCanvas(QWidget):
 
         return QPoint(int(img_x), int(img_y))
 
+    def map_image_rect_to_widget(self, img_rect):
+        """이미지 좌표의 QRect를 위젯 좌표의 QRect로 변환 (바깥쪽으로 맞춤)"""
+        scale, origin = self.view_transform()
+        return QRectF(origin.x() + img_rect.x() * scale, origin.y() + img_rect.y() * scale,
+                      img_rect.width() * scale, img_rect.height() * scale).toAlignedRect()
+
+    # --- 확대/축소 및 이동 --- #
+    def is_zoomed(self):
+        return self._zoom is not None
+
+    def set_zoom(self, scale, anchor=None):
+        """
+        확대 배율 설정
+        :param scale: 이미지 1픽셀의 표시 크기
+        :param anchor: 확대 전후 같은 이미지 위치에 머물 위젯 좌표 (QPointF, 기본값은 위젯 중앙)
+        """
+        if not self.image or self.image.isNull():
+            return
+        old_scale, old_origin = self.view_transform()
+        if anchor is None:
+            anchor = QPointF(self.rect().center())
+        image_anchor = (anchor - old_origin) / old_scale
+        scale = max(self.MIN_ZOOM, min(scale, self.MAX_ZOOM))
+        self._zoom = scale
+        self._view_origin = anchor - image_anchor * scale
+        self._clamp_view()
+        print(f"[Canvas] Zoom {scale * 100:.0f}%")
+        self.update()
+
+    def zoom_by(self, factor, anchor=None):
+        """현재 배율에 factor를 곱해 확대/축소"""
+        self.set_zoom(self.display_scale() * factor, anchor)
+
+    def zoom_in(self):
+        self.zoom_by(self.ZOOM_STEP)
+
+    def zoom_out(self):
+        self.zoom_by(1 / self.ZOOM_STEP)
+
+    def zoom_to_fit(self):
+        """창에 맞춤 보기로 전환"""
+        self._zoom = None
+        print("[Canvas] Zoom to fit")
+        self.update()
+
+    def zoom_actual_size(self):
+        """100% (이미지 1픽셀 = 화면 1픽셀) 보기로 전환"""
+        self.set_zoom(1.0)
+
+    def pan_by(self, dx, dy):
+        """보기를 (dx, dy) 위젯 픽셀만큼 이동"""
+        if not self.image or self.image.isNull():
+            return
+        if self._zoom is None:
+            # 창에 맞춤 상태에서는 이미지 전체가 보이므로 이동할 곳이 없음
+            return
+        self._view_origin += QPointF(dx, dy)
+        self._clamp_view()
+        self.update()
+
+    def _clamp_view(self):
+        """이미지가 창보다 작으면 가운데 정렬, 크면 빈 공간이 생기지 않도록 원점 제한"""
+        scaled_w = self.image.width() * self._zoom
+        scaled_h = self.image.height() * self._zoom
+        x, y = self._view_origin.x(), self._view_origin.y()
+        if scaled_w <= self.width():
+            x = (self.width() - scaled_w) / 2
+        else:
+            x = max(self.width() - scaled_w, min(x, 0))
+        if scaled_h <= self.height():
+            y = (self.height() - scaled_h) / 2
+        else:
+            y = max(self.height() - scaled_h, min(y, 0))
+        self._view_origin = QPointF(x, y)
+
+    def resizeEvent(self, event):
+        if self._zoom is not None and self.image and not self.image.isNull():
+            self._clamp_view()
+        super().resizeEvent(event)
+
+    def wheelEvent(self, event):
+        """마우스 휠: 커서 위치를 기준으로 확대/축소"""
+        if not self.image or self.image.isNull() or self.editor.is_selecting or self.dragging_handle != self.NO_HANDLE:
+            event.ignore()
+            return
+        steps = event.angleDelta().y() / 120
+        if steps:
+            self.zoom_by(self.ZOOM_STEP ** steps, QPointF(event.pos()))
+        event.accept()
+
+    # --- 표시 캐시 --- #
+    def _current_pyramid(self):
+        """현재 이미지의 타일 피라미드 (이미지가 통째로 바뀌었으면 새로 만듦)"""
+        if self._pyramid is None or self._pyramid.image is not self.image or self._pyramid_key != self.image.cacheKey():
+            self._pyramid = TilePyramid(self.image)
+            self._pyramid_key = self.image.cacheKey()
+        return self._pyramid
+
+    def _annotation_layer(self):
+        return getattr(self.editor, 'annotation_layer', None)
+
+    def _view_key(self):
+        """표시 캐시 기준 중 보기 부분 (위젯 크기, 배율, 원점)"""
+        scale, origin = self.view_transform()
+        return (self.size(), scale, origin.x(), origin.y())
+
+    def _content_key(self):
+        """표시 캐시 기준 중 내용 부분 (이미지 cacheKey, 주석 레이어 버전)"""
+        layer = self._annotation_layer()
+        return (self.image.cacheKey(), layer.version if layer is not None else 0)
+
+    def _render_view(self, pixmap, widget_rect):
+        """캐시 pixmap의 widget_rect 영역을 피라미드 타일과 주석 도형으로 다시 그림"""
+        scale, origin = self.view_transform()
+        painter = QPainter(pixmap)
+        painter.setClipRect(widget_rect)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.fillRect(widget_rect, QColor(40, 40, 40))
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        # 축소 표시일 때만 부드럽게 (확대 시에는 픽셀 경계가 보이도록)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, scale < 1.0)
+        drawn = self._current_pyramid().draw(painter, origin, scale, widget_rect)
+        # 주석 도형은 이미지에 합치지 않고 표시할 때만 그 위에 그림
+        layer = self._annotation_layer()
+        if layer is not None and len(layer):
+            clip_img = QRectF((widget_rect.x() - origin.x()) / scale, (widget_rect.y() - origin.y()) / scale,
+                              widget_rect.width() / scale, widget_rect.height() / scale).toAlignedRect()
+            painter.translate(origin)
+            painter.scale(scale, scale)
+            layer.paint(painter, clip_img)
+        painter.end()
+        return drawn
+
+    def _cached_display_pixmap(self):
+        """현재 보기로 그린 위젯 크기의 이미지 (이미지/주석 내용, 위젯 크기, 확대/이동이 바뀔 때만 다시 그림)"""
+        key = self._content_key() + self._view_key()
+        if self._display_pixmap is None or self._display_key != key:
+            start = time.perf_counter()
+            if self._display_pixmap is None or self._display_pixmap.size() != self.size():
+                self._display_pixmap = QPixmap(self.size())
+            drawn = self._render_view(self._display_pixmap, self.rect())
+            self._display_key = key
+            print(f"[Canvas] View rendered at {self.display_scale() * 100:.0f}% from {drawn} tiles "
+                  f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return self._display_pixmap
+
+    def refresh_view_region(self, img_rect):
+        """
+        표시 캐시의 일부만 다시 그림 (주석 도형 추가/이동 등 이미지 픽셀은 그대로인 변경)
+        :param img_rect: 다시 그릴 이미지 영역 (이미지 좌표, QRect)
+        """
+        if not self.image or self.image.isNull():
+            return
+        if self._display_pixmap is None or self._display_key[2:] != self._view_key():
+            self.update()
+            return
+        # 부드러운 축소는 주변 픽셀도 참조하므로 약간 넓혀서 다시 그림
+        widget_rect = self.map_image_rect_to_widget(img_rect.normalized()).adjusted(-2, -2, 2, 2).intersected(self.rect())
+        if not widget_rect.isEmpty():
+            self._render_view(self._display_pixmap, widget_rect)
+            self.update(widget_rect)
+        self._display_key = self._content_key() + self._view_key()
+
+    def refresh_image_region(self, img_rect):
+        """
+        이미지 일부가 바뀌었을 때 피라미드와 표시 캐시의 해당 부분만 다시 그리고 그 영역만 다시 표시
+        :param img_rect: 바뀐 이미지 영역 (이미지 좌표, QRect)
+        """
+        if not self.image or self.image.isNull():
+            return
+        img_rect = img_rect.normalized().intersected(self.image.rect())
+        if img_rect.isEmpty():
+            return
+        if self._pyramid is None or self._pyramid.image is not self.image:
+            # 피라미드가 없거나 다른 이미지 기준이면 다음 paintEvent에서 전체를 다시 만듦
+            self.update()
+            return
+        self._pyramid.invalidate(img_rect)
+        self._pyramid_key = self.image.cacheKey()
+        self.refresh_view_region(img_rect)
+
+    def _preview_bounds(self):
+        """현재 도형 미리보기가 차지하는 위젯 영역 (다시 그릴 영역 계산용)"""
+        start_pt = self.editor.selection_start_point
+        end_pt = self.editor.selection_end_point
+        if not start_pt or not end_pt:
+            return QRect()
+        tool = self.editor.current_tool
+        scale = self.display_scale()
+        if tool == 'arrow':
+            thickness = self.editor.current_arrow_thickness
+            # 화살촉은 끝점에서 화살촉 크기만큼 벗어날 수 있음
+            pad = (3.0 * thickness + 4 + thickness) * scale
+        elif tool == 'circle':
+            pad = self.editor.current_circle_thickness * scale
+        elif tool == 'rectangle':
+            pad = self.editor.current_rectangle_thickness * scale
+        else:
+            pad = 1
+        pad = int(math.ceil(pad)) + 2
+        return QRect(start_pt, end_pt).normalized().adjusted(-pad, -pad, pad, pad)
+
+    def select_annotation(self, annotation):
+        """주석 도형 선택 (None이면 선택 해제), 선택 표시만 다시 그림"""
+        previous = getattr(self.editor, 'selected_annotation', None)
+        self.editor.selected_annotation = annotation
+        for item in (previous, annotation):
+            if item is not None:
+                self.update(self.map_image_rect_to_widget(item.bounds()).adjusted(-2, -2, 2, 2))
+
+    def _update_preview(self, new_rect):
+        """이전 미리보기와 새 미리보기 영역만 다시 그림"""
+        self.update(self._preview_rect.united(new_rect))
+        self._preview_rect = new_rect
+
+    def _report_paint_times(self, label):
+        """드래그 동안 측정한 paintEvent 시간과 입력 지연 요약 출력"""
+        samples = self.paint_times
+        if samples:
+            print(f"[Canvas] {label}: {len(samples)} frames, mean {sum(samples) / len(samples):.2f} ms, "
+                  f"max {max(samples):.2f} ms")
+        latencies = self.input_latencies
+        if latencies:
+            print(f"[Canvas] {label} input-to-pixel: {len(latencies)} updates, "
+                  f"mean {sum(latencies) / len(latencies):.2f} ms, max {max(latencies):.2f} ms")
+        self.paint_times = []
+        self.input_latencies = []
+
+    def _begin_stroke(self, color, thickness):
+        """펜/하이라이트 획 시작: 획 영역만큼의 버퍼에 그리고 놓을 때 한 번만 합침"""
+        self._stroke = StrokeBuffer(color, thickness)
+        self._input_time = None
+        self.input_latencies = []
+
+    def _extend_stroke(self, widget_pos):
+        """획에 점 추가 후 새 선분이 차지하는 화면 영역만 다시 그림"""
+        if self._input_time is None:
+            self._input_time = time.perf_counter()
+        img_point = self.map_widget_to_image(widget_pos)
+        if self._stroke is None or not img_point:
+            return
+        segment_rect = self._stroke.add_point(img_point)
+        if not segment_rect.isEmpty():
+            self.update(self.map_image_rect_to_widget(segment_rect).adjusted(-1, -1, 1, 1))
+
     def paintEvent(self, event):
-        """이미지를 직접 그리고 선택 영역 오버레이"""
+        """캐시된 축소 이미지에서 다시 그릴 영역만 복사하고, 그 위에 도구 미리보기를 그림"""
+        paint_start = time.perf_counter()
         painter = QPainter(self)
-        painter.fillRect(self.rect(), QColor(40, 40, 40))
+        dirty_rect = event.rect()
+        painter.fillRect(dirty_rect, QColor(40, 40, 40))
         
         if not self.image or self.image.isNull():
             return
 
+        target_rect = self.image_display_rect()
+        # 매 프레임 전체 이미지를 축소하지 않고, 캐시에서 다시 그릴 영역만 복사
+        pixmap = self._cached_display_pixmap()
+        painter.drawPixmap(dirty_rect, pixmap, dirty_rect)
+
         painter.setRenderHint(QPainter.Antialiasing, True)
         painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
-        
-        img_size = self.image.size()
-        widget_rect = self.rect()
-        scaled_size = img_size.scaled(widget_rect.size(), Qt.KeepAspectRatio)
-        
-        x = (widget_rect.width() - scaled_size.width()) / 2
-        y = (widget_rect.height() - scaled_size.height()) / 2
-        # QRect 생성 시 정수 좌표 사용
-        target_rect = QRect(int(x), int(y), scaled_size.width(), scaled_size.height())
-        
-        painter.drawImage(target_rect, self.image)
+        scale_x = self.display_scale()
 
         # 자르기 영역 오버레이 그리기
         if self.editor.current_tool == 'crop' and self.editor.crop_rect_widget:
             self.draw_crop_overlay(painter, target_rect)
 
-        # 하이라이트 오버레이 그리기 (오버레이 이미지가 있으면)
-        if self.editor.highlight_overlay_image and not self.editor.highlight_overlay_image.isNull():
-            painter.drawImage(target_rect, self.editor.highlight_overlay_image)
+        # 진행 중인 펜/하이라이트 획 (획 영역 크기의 버퍼를 보기 변환으로 그림)
+        if self._stroke is not None and not self._stroke.is_empty():
+            scale, origin = self.view_transform()
+            painter.save()
+            painter.setClipRect(dirty_rect)
+            painter.translate(origin)
+            painter.scale(scale, scale)
+            self._stroke.paint(painter)
+            painter.restore()
 
-        # 도구별 미리보기 그리기 (하이라이트는 오버레이로 대체됨)
+        # 도구별 미리보기 그리기
         if self.editor.is_selecting and self.editor.selection_start_point and self.editor.selection_end_point:
             start_pt = self.editor.selection_start_point
             end_pt = self.editor.selection_end_point
@@ -117,12 +393,6 @@ class ImageCanvas(QWidget):
                 painter.drawRect(selection_rect_widget)
             elif self.editor.current_tool == 'arrow':
                 thickness_img_px = self.editor.current_arrow_thickness 
-                
-                if img_size.width() > 0 and img_size.height() > 0 and scaled_size.width() > 0: 
-                    scale_x = scaled_size.width() / img_size.width()
-                else:
-                    scale_x = 1.0
-                
                 preview_thickness = max(1, round(thickness_img_px * scale_x)) 
 
                 pen = QPen(self.editor.arrow_color, preview_thickness) 
@@ -143,10 +413,6 @@ class ImageCanvas(QWidget):
                 painter.drawPolygon(arrow_head)
             elif self.editor.current_tool == 'circle':
                 thickness_img_px = self.editor.current_circle_thickness
-                if img_size.width() > 0 and img_size.height() > 0 and scaled_size.width() > 0:
-                    scale_x = scaled_size.width() / img_size.width()
-                else:
-                    scale_x = 1.0
                 preview_thickness = max(1, round(thickness_img_px * scale_x))
                 
                 pen = QPen(self.editor.circle_color, preview_thickness, Qt.SolidLine)
@@ -156,10 +422,6 @@ class ImageCanvas(QWidget):
                 painter.drawEllipse(preview_rect_widget)
             elif self.editor.current_tool == 'rectangle': 
                 thickness_img_px = self.editor.current_rectangle_thickness
-                if img_size.width() > 0 and img_size.height() > 0 and scaled_size.width() > 0:
-                    scale_x = scaled_size.width() / img_size.width()
-                else:
-                    scale_x = 1.0
                 preview_thickness = max(1, round(thickness_img_px * scale_x))
                 
                 pen = QPen(self.editor.rectangle_color, preview_thickness, Qt.SolidLine)
@@ -188,9 +450,45 @@ class ImageCanvas(QWidget):
             for handle_rect in self.get_handle_rects(self.editor.selected_content_rect_widget).values():
                 painter.drawEllipse(handle_rect)
 
+        # 선택된 주석 도형 표시
+        selected = getattr(self.editor, 'selected_annotation', None)
+        layer = self._annotation_layer()
+        if selected is not None and layer is not None and selected in layer.annotations:
+            painter.setPen(QPen(Qt.white, 1, Qt.DashLine))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(self.map_image_rect_to_widget(selected.bounds()))
+
+        painter.end()
+        paint_end = time.perf_counter()
+        if self.editor.is_selecting or self.dragging_handle != self.NO_HANDLE or self._annotation_drag is not None:
+            self.paint_times.append((paint_end - paint_start) * 1000)
+        if self._input_time is not None:
+            self.input_latencies.append((paint_end - self._input_time) * 1000)
+            self._input_time = None
+
     def mousePressEvent(self, event):
         print("[Canvas] mousePressEvent received")
         tool = self.editor.current_tool
+
+        # 가운데 버튼 드래그: 보기 이동 (도구 상태와 무관)
+        if event.button() == Qt.MiddleButton:
+            self._pan_last_pos = event.pos()
+            self.setCursor(Qt.ClosedHandCursor)
+            event.accept()
+            return
+
+        # 도구를 선택하지 않은 상태: 주석 도형 선택 및 이동 시작
+        if tool is None and event.button() == Qt.LeftButton and not self.editor.is_selection_active:
+            layer = self._annotation_layer()
+            img_point = self.map_widget_to_image(event.pos())
+            hit = layer.hit_test(img_point) if layer is not None and img_point else None
+            self.select_annotation(hit)
+            if hit is not None:
+                self._annotation_drag = [hit, img_point, img_point]
+                self.paint_times = []
+                self.setCursor(Qt.SizeAllCursor)
+                event.accept()
+                return
         
         # 자르기 도구 핸들링
         if tool == 'crop' and event.button() == Qt.LeftButton:
@@ -230,17 +528,17 @@ class ImageCanvas(QWidget):
         elif tool in ['mosaic', 'arrow', 'circle', 'rectangle', 'highlight', 'pen'] and event.button() == Qt.LeftButton:
              print(f"[Canvas] Activating selection/drawing for tool: {tool}")
              self.editor.is_selecting = True
+             self.paint_times = []
+             self._preview_rect = QRect()
              if tool == 'highlight':
-                 if self.editor.highlight_overlay_image:
-                     self.editor.highlight_overlay_image.fill(Qt.transparent)
                  self.editor.stroke_points = [event.pos()]
+                 self._begin_stroke(self.editor.highlight_color, self.editor.current_highlight_thickness)
+                 self._extend_stroke(event.pos())
              elif tool == 'pen':
-                 # self.editor.push_undo_state() # 펜 시작 시 undo 저장 제거 -> 릴리스 시 저장
-                 self.last_draw_point = event.pos()
-                 self.last_img_draw_point = self.map_widget_to_image(self.last_draw_point)
-                 if self.last_img_draw_point:
-                      self.editor.draw_pen_segment(self.last_img_draw_point, self.last_img_draw_point, self.editor.pen_color, self.editor.current_pen_thickness)
-                      self.update()
+                 # 펜 색상은 불투명 (Alpha 255), 이미지에는 릴리스 시 한 번만 합침
+                 color = self.editor.pen_color
+                 self._begin_stroke(QColor(color.red(), color.green(), color.blue(), 255), self.editor.current_pen_thickness)
+                 self._extend_stroke(event.pos())
              else:
                  self.editor.selection_start_point = event.pos()
                  self.editor.selection_end_point = event.pos()
@@ -281,6 +579,25 @@ class ImageCanvas(QWidget):
 
     def mouseMoveEvent(self, event):
         pos = event.pos()
+
+        if self._pan_last_pos is not None:
+            delta = pos - self._pan_last_pos
+            self._pan_last_pos = pos
+            self.pan_by(delta.x(), delta.y())
+            event.accept()
+            return
+
+        if self._annotation_drag is not None:
+            annotation, start_point, last_point = self._annotation_drag
+            img_point = self.map_widget_to_image(pos)
+            if img_point and img_point != last_point:
+                old_bounds = annotation.bounds()
+                self._annotation_layer().translate(annotation, img_point.x() - last_point.x(), img_point.y() - last_point.y())
+                self._annotation_drag[2] = img_point
+                # 이동 전후 영역만 다시 그림
+                self.refresh_view_region(old_bounds.united(annotation.bounds()))
+            event.accept()
+            return
         
         # 자르기 핸들 드래그 처리
         if self.editor.current_tool == 'crop' and self.dragging_handle != self.NO_HANDLE:
@@ -342,30 +659,12 @@ class ImageCanvas(QWidget):
         elif self.editor.is_selecting and self.editor.current_tool in ['mosaic', 'arrow', 'circle', 'rectangle', 'highlight', 'pen']:
              if self.editor.current_tool == 'highlight':
                  self.editor.stroke_points.append(event.pos())
-                 if self.editor.highlight_overlay_image and len(self.editor.stroke_points) > 1:
-                     self.editor.highlight_overlay_image.fill(Qt.transparent)
-                     painter = QPainter(self.editor.highlight_overlay_image)
-                     img_points = [self.map_widget_to_image(p) for p in self.editor.stroke_points if p is not None]
-                     valid_img_points = [p for p in img_points if p is not None]
-                     if len(valid_img_points) > 1:
-                         pen = QPen(self.editor.highlight_color, self.editor.current_highlight_thickness, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
-                         painter.setPen(pen)
-                         painter.setRenderHint(QPainter.Antialiasing)
-                         polygon = QPolygonF([QPointF(p) for p in valid_img_points])
-                         painter.drawPolyline(polygon)
-                     painter.end()
-                 self.update()
+                 self._extend_stroke(event.pos())
              elif self.editor.current_tool == 'pen':
-                 current_pos = event.pos()
-                 img_current = self.map_widget_to_image(current_pos)
-                 if self.last_img_draw_point and img_current:
-                     self.editor.draw_pen_segment(self.last_img_draw_point, img_current, self.editor.pen_color, self.editor.current_pen_thickness)
-                 self.last_draw_point = current_pos
-                 self.last_img_draw_point = img_current
-                 self.update()
+                 self._extend_stroke(event.pos())
              else:
                  self.editor.selection_end_point = event.pos()
-                 self.update()
+                 self._update_preview(self._preview_bounds())
              event.accept()
              return
 
@@ -443,9 +742,27 @@ class ImageCanvas(QWidget):
 
     def mouseReleaseEvent(self, event):
         print("[Canvas] mouseReleaseEvent received")
+
+        if event.button() == Qt.MiddleButton and self._pan_last_pos is not None:
+            self._pan_last_pos = None
+            self.setCursor(Qt.CrossCursor if self.editor.current_tool else Qt.ArrowCursor)
+            event.accept()
+            return
+
+        if self._annotation_drag is not None and event.button() == Qt.LeftButton:
+            annotation, start_point, last_point = self._annotation_drag
+            self._annotation_drag = None
+            self.setCursor(Qt.ArrowCursor)
+            dx, dy = last_point.x() - start_point.x(), last_point.y() - start_point.y()
+            if dx or dy:
+                self.editor.record_annotation_move(annotation, dx, dy)
+            self._report_paint_times("annotation drag")
+            event.accept()
+            return
         
         if self.editor.current_tool == 'crop' and self.dragging_handle != self.NO_HANDLE:
             print(f"[Crop] Finished dragging handle: {self.dragging_handle}. Final rect: {self.editor.crop_rect_widget}")
+            self._report_paint_times("crop drag")
             self.dragging_handle = self.NO_HANDLE
             self.drag_start_pos = None
             self.drag_start_rect = None
@@ -469,15 +786,15 @@ class ImageCanvas(QWidget):
                          valid_img_points = [p for p in img_points if p is not None]
                          if len(valid_img_points) > 1:
                              print(f"[MouseRelease] Calling draw_highlight_stroke on edited_image")
+                             # 주석 도형으로 추가 (Undo 기록은 add_annotation에서 처리)
                              self.editor.draw_highlight_stroke(valid_img_points, self.editor.highlight_color, self.editor.current_highlight_thickness)
-                             self.editor.push_undo_state() # 작업 후 상태 저장
                          else: print("Highlight stroke too short or invalid.")
                      else: print("Highlight stroke too short.")
-                     if self.editor.highlight_overlay_image:
-                         self.editor.highlight_overlay_image.fill(Qt.transparent)
              elif tool == 'pen':
                  print("[MouseRelease] Pen drawing finished.")
-                 self.editor.push_undo_state() # 펜 작업 최종 상태 저장
+                 if self._stroke is not None:
+                     # 획 버퍼를 이미지에 한 번만 합치고 Undo 기록
+                     self.editor.commit_pen_stroke(self._stroke)
              else:
                  start_widget = self.editor.selection_start_point
                  end_widget = event.pos()
@@ -493,8 +810,9 @@ class ImageCanvas(QWidget):
                              if img_rect.width() > 0 and img_rect.height() > 0:
                                  print("[MouseRelease] Applying mosaic...")
                                  # self.editor.push_undo_state()
-                                 self.editor.apply_mosaic(img_rect, self.editor.mosaic_level)
-                                 self.editor.push_undo_state() # 작업 후 상태 저장
+                                 dirty_rect, change = self.editor.apply_mosaic(img_rect, self.editor.mosaic_level)
+                                 # 작업 후 상태 저장 (모자이크 영역의 타일만 비교, 합친 주석 도형 포함)
+                                 self.editor.push_undo_state(change=change, dirty_rect=dirty_rect)
                                  self.editor.update_canvas()
                              else:
                                  print("Mosaic selection too small.")
@@ -503,7 +821,6 @@ class ImageCanvas(QWidget):
                                   print(f"[MouseRelease] Calling draw_arrow: {img_start} -> {img_end}, Color: {self.editor.arrow_color.name()}, Thickness: {self.editor.current_arrow_thickness}")
                                   # self.editor.push_undo_state()
                                   self.editor.draw_arrow(img_start, img_end, self.editor.arrow_color, self.editor.current_arrow_thickness)
-                                  self.editor.push_undo_state() # 작업 후 상태 저장
                                   self.editor.update_canvas()
                              else:
                                   print("Arrow start and end points are the same.")
@@ -513,7 +830,6 @@ class ImageCanvas(QWidget):
                                  print(f"[MouseRelease] Calling draw_circle: Rect: {img_rect}, Color: {self.editor.circle_color.name()}, Thickness: {self.editor.current_circle_thickness}")
                                  # self.editor.push_undo_state()
                                  self.editor.draw_circle(img_rect, self.editor.circle_color, self.editor.current_circle_thickness)
-                                 self.editor.push_undo_state() # 작업 후 상태 저장
                                  self.editor.update_canvas()
                              else:
                                  print("Circle selection too small.")
@@ -523,7 +839,6 @@ class ImageCanvas(QWidget):
                                  print(f"[MouseRelease] Calling draw_rectangle: Rect: {img_rect}, Color: {self.editor.rectangle_color.name()}, Thickness: {self.editor.current_rectangle_thickness}")
                                  # self.editor.push_undo_state()
                                  self.editor.draw_rectangle(img_rect, self.editor.rectangle_color, self.editor.current_rectangle_thickness)
-                                 self.editor.push_undo_state() # 작업 후 상태 저장
                                  self.editor.update_canvas()
                              else:
                                  print("Rectangle selection too small.")
@@ -531,11 +846,13 @@ class ImageCanvas(QWidget):
              self.editor.selection_start_point = None
              self.editor.selection_end_point = None
              if hasattr(self.editor, 'stroke_points'): self.editor.stroke_points = []
-             self.last_draw_point = None       
-             self.last_img_draw_point = None   
+             self._stroke = None
+             self._input_time = None
              if tool in ['arrow', 'mosaic', 'circle', 'rectangle', 'highlight', 'pen']: 
                   self.setCursor(Qt.ArrowCursor) 
              self.editor.update_undo_redo_actions()
+             self._report_paint_times(f"{tool} drag")
+             self._preview_rect = QRect()
              self.update()
              event.accept()
              return
@@ -565,6 +882,7 @@ class ImageCanvas(QWidget):
         # 활성 선택 영역 드래그 종료 처리
         elif self.editor.is_selection_active and self.dragging_handle != self.NO_HANDLE:
             print(f"[SelectTransform] Finished dragging handle: {self.dragging_handle}. Final rect: {self.editor.selected_content_rect_widget}")
+            self._report_paint_times("selection drag")
             # 여기서 Pixmap을 실제로 리사이즈할 수도 있음 (선택적)
             # pixmap = self.editor.selected_content_pixmap
             # scaled_pixmap = pixmap.scaled(self.editor.selected_content_rect_widget.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
@@ -688,10 +1006,6 @@ class ImageCanvas(QWidget):
                         self.editor.draw_text(img_position, text, self.editor.text_color, image_font_size) # ImageEditor의 draw_text 호출
                         print("[DEBUG] draw_text finished")
                         
-                        print("[DEBUG] Calling push_undo_state after draw_text")
-                        self.editor.push_undo_state() # 작업 후 상태 저장
-                        print("[DEBUG] push_undo_state finished")
-                        
                         print("[DEBUG] Calling update_canvas")
                         self.editor.update_canvas() # ImageEditor의 update_canvas 호출
                         print("[DEBUG] update_canvas finished")
@@ -0,0 +1,287 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import traceback
+
+from PIL import Image
+
+# 기록 대상 이미지 확장자 (저장 형식 + 재압축 결과)
+IMAGE_EXTENSIONS = (".png", ".webp", ".jpg", ".jpeg", ".qoi", ".bmp")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    name TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    mode TEXT,
+    window_title TEXT,
+    process_name TEXT,
+    content_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_captures_timestamp ON captures (timestamp);
+CREATE INDEX IF NOT EXISTS idx_captures_directory ON captures (directory);
+CREATE INDEX IF NOT EXISTS idx_captures_process ON captures (process_name, timestamp);
+CREATE INDEX IF NOT EXISTS idx_captures_hash ON captures (content_hash);
+"""
+
+_COLUMNS = ("path", "directory", "name", "timestamp", "mtime", "size", "width", "height",
+            "mode", "window_title", "process_name", "content_hash")
+
+# 같은 경로가 다시 기록되면 파일 정보는 갱신하고, 새 값이 없는 메타데이터(캡처 방식, 창 제목 등)는 유지
+_UPSERT = f"""
+INSERT INTO captures ({", ".join(_COLUMNS)}) VALUES ({", ".join("?" for _ in _COLUMNS)})
+ON CONFLICT(path) DO UPDATE SET
+    mtime = excluded.mtime,
+    size = excluded.size,
+    width = excluded.width,
+    height = excluded.height,
+    content_hash = excluded.content_hash,
+    timestamp = CASE WHEN excluded.mode IS NOT NULL THEN excluded.timestamp ELSE captures.timestamp END,
+    mode = COALESCE(excluded.mode, captures.mode),
+    window_title = COALESCE(excluded.window_title, captures.window_title),
+    process_name = COALESCE(excluded.process_name, captures.process_name)
+"""
+
+
+def content_hash(image):
+    """
+    픽셀 내용 해시 (RGB 기준, 크기 포함)
+    파일 바이트가 아닌 픽셀로 계산하므로 재압축/형식 변환 후에도 같은 캡처는 같은 해시를 가집니다.
+    :param image: PIL Image
+    """
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.width}x{image.height}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+class CaptureHistory:
+    """
+    캡처 기록 색인 (SQLite)
+    저장할 때마다 경로, 시각, 크기, 해상도, 캡처 방식, 창 제목/프로세스, 픽셀 해시를 기록하고,
+    저장 폴더는 수정 시각/크기가 바뀐 파일만 다시 읽는 증분 검사로 맞춥니다.
+    쓰기 연결과 읽기 연결을 따로 두고 각각 잠금으로 보호하므로, 백그라운드 검사가 기록하는 동안에도
+    GUI 스레드의 조회는 기다리지 않습니다 (WAL 모드에서는 쓰는 중에도 읽기 가능).
+    """
+    def __init__(self, db_path):
+        """
+        :param db_path: 데이터베이스 파일 경로 (":memory:" 가능)
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # WAL: 쓰는 동안에도 읽기가 막히지 않고, 저장마다 fsync 비용이 작음
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        # 조회 전용 연결 (메모리 DB는 연결마다 따로이므로 쓰기 연결을 함께 사용)
+        if db_path == ":memory:":
+            self._reader, self._read_lock = self._conn, self._lock
+        else:
+            self._read_lock = threading.Lock()
+            self._reader = sqlite3.connect(db_path, check_same_thread=False)
+            self._reader.row_factory = sqlite3.Row
+            self._reader.execute("PRAGMA query_only=ON")
+        self._scan_thread = None
+        self._stop_event = threading.Event()
+
+    def close(self):
+        """검사 중이면 중단하고 닫음 (이미 기록한 묶음은 유지되고 나머지는 다음 검사에서 이어서 처리)"""
+        self._stop_event.set()
+        if self._scan_thread is not None:
+            self._scan_thread.join()
+        with self._read_lock:
+            if self._reader is not self._conn:
+                self._reader.close()
+        with self._lock:
+            self._conn.close()
+
+    def _upsert(self, entries):
+        """
+        항목 여러 개를 한 트랜잭션으로 기록
+        :param entries: _COLUMNS 순서의 튜플 목록
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(_UPSERT, entries)
+
+    @staticmethod
+    def _entry(path, stat, width, height, digest, timestamp=None, mode=None, window_title=None, process_name=None):
+        path = os.path.abspath(path)
+        directory, name = os.path.split(path)
+        return (path, os.path.normcase(directory), name, timestamp if timestamp is not None else stat.st_mtime,
+                stat.st_mtime, stat.st_size, width, height, mode, window_title, process_name, digest)
+
+    def record(self, filepath, capture):
+        """
+        저장된 캡처 기록 (저장 작업자 스레드에서 호출)
+        :param filepath: 저장된 파일 경로
+        :param capture: 저장한 CaptureResult
+        """
+        image = capture.to_pil()
+        entry = self._entry(filepath, os.stat(filepath), image.width, image.height, content_hash(image),
+                            capture.timestamp, capture.mode, capture.window_title, capture.process_name)
+        self._upsert([entry])
+
+    def record_file(self, filepath):
+        """
+        파일을 다시 읽어 기록 갱신 (편집기에서 덮어쓴 파일 등, 캡처 방식/창 정보는 유지)
+        :return: 새 픽셀 해시
+        """
+        entry = self._read_file(os.path.abspath(filepath), os.stat(filepath))
+        self._upsert([entry])
+        return entry[-1]
+
+    def replace_path(self, old_path, new_path):
+        """
+        파일이 다른 경로로 교체되었을 때 기록 이동 (유휴 재압축의 PNG -> WebP 등)
+        캡처 방식/창 정보/캡처 시각은 유지하고 파일 정보는 새 파일로 갱신합니다.
+        """
+        old_path, new_path = os.path.abspath(old_path), os.path.abspath(new_path)
+        if old_path != new_path:
+            directory, name = os.path.split(new_path)
+            with self._lock:
+                with self._conn:
+                    # 새 경로의 기록이 이미 있으면 이전 기록은 지움
+                    self._conn.execute("DELETE FROM captures WHERE path = ? AND EXISTS "
+                                       "(SELECT 1 FROM captures WHERE path = ?)", (old_path, new_path))
+                    self._conn.execute("UPDATE captures SET path = ?, directory = ?, name = ? WHERE path = ?",
+                                       (new_path, os.path.normcase(directory), name, old_path))
+        return self.record_file(new_path)
+
+    def get(self, filepath):
+        """경로의 기록 (없으면 None)"""
+        rows = self._query("SELECT * FROM captures WHERE path = ?", (os.path.abspath(filepath),))
+        return rows[0] if rows else None
+
+    def _read_file(self, path, stat):
+        """폴더 검사에서 발견한 파일의 해상도와 픽셀 해시 읽기"""
+        with Image.open(path) as image:
+            return self._entry(path, stat, image.width, image.height, content_hash(image))
+
+    def rescan(self, directory, batch_size=200):
+        """
+        저장 폴더와 색인을 맞춤 (증분)
+        새 파일과 수정 시각/크기가 바뀐 파일만 읽고, 사라진 파일은 색인에서 제거합니다.
+        :param directory: 검사할 폴더
+        :param batch_size: 한 트랜잭션에 기록할 파일 수
+        :return: (추가/갱신 수, 제거 수)
+        """
+        start = time.perf_counter()
+        directory = os.path.abspath(directory)
+        known = {row["path"]: (row["mtime"], row["size"]) for row in self._query(
+            "SELECT path, mtime, size FROM captures WHERE directory = ?", (os.path.normcase(directory),))}
+
+        updated, seen, batch = 0, set(), []
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            entries = []
+        for item in entries:
+            if self._stop_event.is_set():
+                # 중단 시 남은 파일을 사라진 것으로 보지 않도록 제거 단계 생략
+                if batch:
+                    self._upsert(batch)
+                return updated + len(batch), 0
+            if not item.is_file() or not item.name.lower().endswith(IMAGE_EXTENSIONS) or item.name.startswith("."):
+                continue
+            path = os.path.abspath(item.path)
+            seen.add(path)
+            stat = item.stat()
+            if known.get(path) == (stat.st_mtime, stat.st_size):
+                continue
+            try:
+                batch.append(self._read_file(path, stat))
+            except Exception as e:
+                print(f"[History] Could not read {item.name}: {e}")
+                continue
+            if len(batch) >= batch_size:
+                self._upsert(batch)
+                updated += len(batch)
+                batch = []
+        if batch:
+            self._upsert(batch)
+            updated += len(batch)
+
+        removed = [(path,) for path in known if path not in seen]
+        if removed:
+            with self._lock:
+                with self._conn:
+                    self._conn.executemany("DELETE FROM captures WHERE path = ?", removed)
+        print(f"[History] Rescanned {directory}: {updated} updated, {len(removed)} removed, "
+              f"{len(seen)} files in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return updated, len(removed)
+
+    def rescan_async(self, directory):
+        """폴더 검사를 백그라운드 스레드에서 실행 (시작 시, 저장 폴더 변경 시, 진행 중인 검사가 있으면 끝난 뒤 시작)"""
+        previous = self._scan_thread
+
+        def run():
+            if previous is not None:
+                previous.join()
+            try:
+                self.rescan(directory)
+            except Exception as e:
+                print(f"[History] Error rescanning {directory}: {e}")
+                traceback.print_exc()
+
+        self._scan_thread = threading.Thread(target=run, name="HistoryRescan", daemon=True)
+        self._scan_thread.start()
+
+    def _query(self, sql, params=()):
+        """조회 전용 연결로 실행 (쓰기 잠금을 기다리지 않음)"""
+        with self._read_lock:
+            return [dict(row) for row in self._reader.execute(sql, params)]
+
+    def count(self):
+        with self._read_lock:
+            return self._reader.execute("SELECT COUNT(*) FROM captures").fetchone()[0]
+
+    def recent(self, limit=100, offset=0):
+        """최근 캡처부터 (갤러리 페이지 단위 조회)"""
+        return self._query("SELECT * FROM captures ORDER BY timestamp DESC LIMIT ? OFFSET ?", (limit, offset))
+
+    def search(self, text="", process_name=None, since=None, until=None, limit=100, offset=0):
+        """
+        캡처 검색
+        :param text: 파일명/창 제목/프로세스 이름에 포함된 문자열 (대소문자 무시)
+        :param process_name: 프로세스 이름 (정확히 일치)
+        :param since: 이 시각 이후 (time.time() 기준)
+        :param until: 이 시각 이전
+        :param limit: 최대 결과 수
+        :param offset: 건너뛸 결과 수 (페이지 단위 조회)
+        :return: 최근 캡처부터 정렬된 dict 목록
+        """
+        conditions, params = [], []
+        if text:
+            pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            conditions.append("(name LIKE ? ESCAPE '\\' OR window_title LIKE ? ESCAPE '\\' "
+                              "OR process_name LIKE ? ESCAPE '\\')")
+            params += [pattern] * 3
+        if process_name:
+            conditions.append("process_name = ?")
+            params.append(process_name)
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("timestamp < ?")
+            params.append(until)
+        where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+        return self._query(f"SELECT * FROM captures {where} ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+                           params + [limit, offset])
+
+    def find_by_hash(self, digest):
+        """같은 픽셀 내용의 캡처 (중복 찾기)"""
+        return self._query("SELECT * FROM captures WHERE content_hash = ? ORDER BY timestamp", (digest,))
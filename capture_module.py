@@ -1,19 +1,29 @@
 import os
 import datetime
+import threading
 import io
 import time  # time 모듈을 상단에서 임포트
 import ctypes
-from PIL import Image
 import mss
 import mss.tools
 import win32gui  # 윈도우 캡처를 위한 모듈 추가
 import win32con
+import win32api
 import win32process
 import psutil
 import win32ui
 from ctypes import Structure, POINTER, c_int, byref, windll
 from ctypes.wintypes import BOOL, HWND, RECT
 from PyQt5.QtWidgets import QApplication
+from capture_result import CaptureResult
+from save_queue import SaveQueue
+from image_encoder import ImageEncoder
+from frame_buffer import FrameSampler
+from window_readiness import create_window_readiness
+from virtual_desktop import VirtualDesktopGrabber
+from burst_capture import BurstCapture
+from recompressor import IdleRecompressor
+from capture_history import CaptureHistory
 
 # DWM API를 위한 구조체 정의
 class RECT(Structure):
@@ -24,6 +34,11 @@ class RECT(Structure):
         ("bottom", c_int)
     ]
 
+class _EmptyField:
+    """순번이 없는 캡처에서 파일명 템플릿의 {seq} / {seq:03d} 자리를 빈 문자열로 채움"""
+    def __format__(self, format_spec):
+        return ""
+
 class ScreenCapture:
     def __init__(self, config_manager=None, save_dir="captures"):
         """
@@ -32,7 +47,11 @@ class ScreenCapture:
         :param save_dir: 캡처 이미지 저장 디렉토리 (기본값)
         """
         self.config_manager = config_manager
-        self.captured_image = None  # PIL Image 객체를 저장할 변수
+        self.last_capture = None  # 마지막 캡처 결과 (CaptureResult)
+        
+        # 지속형 캡처 세션 (처음 캡처할 때 생성, 디스플레이 구성이 바뀔 때만 재생성)
+        self._sct = None
+        self._display_signature = None
         
         # DWM 관련 함수 로드
         self.dwmapi = ctypes.WinDLL("dwmapi")
@@ -50,6 +69,76 @@ class ScreenCapture:
             
         if not os.path.exists(self.save_dir):
             os.makedirs(self.save_dir)
+            
+        # 파일명 템플릿 ({datetime}: 날짜_시간, {ms}: 밀리초, {seq}: 버스트 순번)
+        self.filename_template = (config_manager.get_setting("filename_template", "screenshot_{datetime}_{ms}")
+                                  if config_manager else "screenshot_{datetime}_{ms}")
+        # 아직 디스크에 쓰이지 않은(저장 대기 중인) 경로 (같은 이름이 두 번 발급되지 않도록)
+        self._reserved_paths = set()
+        self._name_lock = threading.Lock()
+        
+        # 백그라운드 저장 큐 (인코딩/디스크 쓰기를 GUI 스레드 밖에서 수행)
+        if config_manager:
+            save_workers = config_manager.get_setting("save_workers", 2)
+            save_queue_depth = config_manager.get_setting("save_queue_depth", 4)
+        else:
+            save_workers, save_queue_depth = 2, 4
+        # 저장 형식/품질 (image_format, save_quality 설정)
+        self.encoder = ImageEncoder.from_settings(config_manager)
+        # 캡처 기록 색인 (저장할 때마다 추가, 시작 시 저장 폴더를 증분 검사)
+        self.history = None
+        if config_manager and config_manager.get_setting("history_enabled", True):
+            self.history = CaptureHistory(os.path.join(config_manager.config_dir, "history.sqlite3"))
+            self.history.rescan_async(self.save_dir)
+        self.save_queue = SaveQueue(max_workers=save_workers, max_pending=save_queue_depth,
+                                    encoder=self.encoder, history=self.history)
+        self.save_queue.saveFinished.connect(self._release_path)
+        self.save_queue.saveFailed.connect(lambda path, error: self._release_path(path))
+        self.burst = None  # 진행 중인 BurstCapture
+        
+        # 전체 화면 캡처 방식 ("primary": 주 모니터, "virtual_desktop": 모든 모니터를 동시에 캡처해 이어 붙임)
+        self.full_screen_mode = config_manager.get_setting("full_screen_mode", "primary") if config_manager else "primary"
+        # 모니터별 병렬 캡처 도구 (가상 데스크톱 모드에서 사용)
+        self.desktop_grabber = VirtualDesktopGrabber()
+        
+        # 창 숨김/복원/활성화 완료 대기 (고정 sleep 대신 실제 상태 확인, 대기 시간 기록)
+        self.readiness = create_window_readiness(pump=QApplication.processEvents)
+        
+        # 최근 화면 프레임 샘플러 (선택 사항, 단축키 입력 시점의 화면을 즉시 반환)
+        self.frame_sampler = None
+        if config_manager and config_manager.get_setting("frame_buffer_enabled", False):
+            self.frame_sampler = FrameSampler(
+                fps=config_manager.get_setting("frame_buffer_fps", 4),
+                byte_budget_mb=config_manager.get_setting("frame_buffer_budget_mb", 256),
+                monitor_index=self._full_screen_monitor_index(),
+                display_signature=self._get_display_signature)
+            self.frame_sampler.start()
+
+        # 유휴 시간 재압축 (선택 사항, 캡처 시에는 빠르게 저장하고 나중에 최대 압축으로 교체)
+        self.recompressor = None
+        if config_manager and config_manager.get_setting("idle_recompress", False):
+            self.recompressor = IdleRecompressor(
+                self.save_dir, os.path.join(config_manager.config_dir, "recompress_state.json"),
+                target=config_manager.get_setting("idle_recompress_format", "png"),
+                idle_seconds=config_manager.get_setting("idle_seconds", 120),
+                cpu_percent=config_manager.get_setting("idle_cpu_percent", 20),
+                busy_paths=self._busy_paths,
+                on_replaced=self._on_recompressed)
+            self.recompressor.start()
+
+    def _on_recompressed(self, old_path, new_path):
+        """재압축으로 교체된 파일을 기록 색인에 반영 (재압축 스레드에서 호출, 형식이 바뀌면 경로 이동)"""
+        if self.history is None:
+            return
+        try:
+            self.history.replace_path(old_path, new_path)
+        except Exception as e:
+            print(f"[History] Failed to update recompressed {new_path}: {e}")
+
+    def _busy_paths(self):
+        """저장 대기 중인 경로 (재압축 대상에서 제외)"""
+        with self._name_lock:
+            return set(self._reserved_paths)
 
     def get_window_rect(self, hwnd):
         """
@@ -84,11 +173,73 @@ class ScreenCapture:
             print(f"GetWindowRect call error: {e}")
             return 0, 0, 800, 600  # 기본값 반환
 
+    def _get_display_signature(self):
+        """
+        현재 디스플레이 구성을 나타내는 값을 반환합니다.
+        모니터 수, 가상 화면 영역, 주 모니터 해상도 중 하나라도 바뀌면 값이 달라집니다.
+        """
+        try:
+            return (
+                win32api.GetSystemMetrics(win32con.SM_CMONITORS),
+                win32api.GetSystemMetrics(win32con.SM_XVIRTUALSCREEN),
+                win32api.GetSystemMetrics(win32con.SM_YVIRTUALSCREEN),
+                win32api.GetSystemMetrics(win32con.SM_CXVIRTUALSCREEN),
+                win32api.GetSystemMetrics(win32con.SM_CYVIRTUALSCREEN),
+                win32api.GetSystemMetrics(win32con.SM_CXSCREEN),
+                win32api.GetSystemMetrics(win32con.SM_CYSCREEN),
+            )
+        except Exception as e:
+            print(f"Display signature error (ignored): {e}")
+            return None
+
+    def _get_capture_session(self):
+        """
+        재사용 가능한 mss 캡처 세션을 반환합니다.
+        세션은 처음 필요할 때 생성되며, 디스플레이 구성이 바뀐 경우에만 다시 만듭니다.
+        (mss 인스턴스는 GUI 스레드에서만 사용합니다)
+        """
+        signature = self._get_display_signature()
+        if self._sct is not None and signature != self._display_signature:
+            print("[Capture Session] Display configuration changed, recreating capture session.")
+            self._close_session()
+            self.desktop_grabber.reset()
+
+        if self._sct is None:
+            self._sct = mss.mss()
+            self._display_signature = signature
+            print("[Capture Session] Capture session created.")
+        return self._sct
+
+    def close(self):
+        """캡처 세션을 닫고 관련 리소스를 해제합니다. (대기 중인 저장 작업은 완료될 때까지 기다림)"""
+        self.save_queue.shutdown(wait=True)
+        # 창 상태 대기 시간 보고
+        for label, (count, mean_ms, max_ms) in self.readiness.summary().items():
+            print(f"[Readiness] {label}: {count} waits, mean {mean_ms:.1f} ms, max {max_ms:.1f} ms")
+        if self.frame_sampler is not None:
+            self.frame_sampler.stop()
+        if self.recompressor is not None:
+            self.recompressor.stop()
+        if self.history is not None:
+            self.history.close()
+        self.desktop_grabber.close()
+        self._close_session()
+
+    def _close_session(self):
+        """GUI 스레드의 mss 캡처 세션만 닫습니다. (디스플레이 구성 변경 시 재생성용)"""
+        if self._sct is not None:
+            try:
+                self._sct.close()
+            except Exception as e:
+                print(f"[Capture Session] Error closing capture session: {e}")
+            self._sct = None
+            self._display_signature = None
+
     def capture_full_screen(self, window_to_hide=None):
         """
         전체 화면 캡처
         :param window_to_hide: 캡처 중 숨길 윈도우 객체
-        :return: 임시 파일 경로 (미리보기용)
+        :return: CaptureResult (미리보기/편집용 캡처 결과)
         """
         # 캡처 전에 윈도우가 보이지 않게 처리
         ui_was_visible = False
@@ -98,35 +249,31 @@ class ScreenCapture:
             if ui_was_visible:
                 # 캡처할 타겟 창을 더 확실하게 감지하기 위해 완전히 숨김
                 window_to_hide.hide()
-                # PyQt 이벤트 처리를 즉시 수행
-                QApplication.processEvents()
-                # 다른 창이 활성화될 시간 확보
-                time.sleep(0.2)
+                # 창이 실제로 사라지고 화면에 반영될 때까지 대기
+                self.readiness.wait_hidden(int(window_to_hide.winId()))
         
         try:
-            with mss.mss() as sct:
-                # 모든 모니터 정보 가져오기
-                monitors = sct.monitors
-                # 메인 모니터 선택 (monitors[0]은 모든 모니터 통합, monitors[1]은 첫 번째 모니터)
-                monitor = monitors[1]
-                
-                # 스크린샷 찍기
-                screenshot = sct.grab(monitor)
+            if self.full_screen_mode == "virtual_desktop":
+                self.last_capture = self._capture_virtual_desktop()
+                return self.last_capture
                 
-                # PIL Image 객체로 변환
-                img = Image.frombytes("RGB", screenshot.size, screenshot.rgb)
-                self.captured_image = img  # 이미지 저장
-                
-                # 임시 파일 생성 (미리보기용)
-                temp_dir = os.path.join(os.path.expanduser("~"), ".temp_ImageCapturePAAK")
-                if not os.path.exists(temp_dir):
-                    os.makedirs(temp_dir)
-                
-                temp_file = os.path.join(temp_dir, "temp_preview.png")
-                img.save(temp_file)
-                
-                print(f"Full screen capture successful! Temp file saved: {temp_file}")
-                return temp_file
+            sct = self._get_capture_session()
+            # 모든 모니터 정보 가져오기 (세션에 캐시된 목록 사용)
+            monitors = sct.monitors
+            # 메인 모니터 선택 (monitors[0]은 모든 모니터 통합, monitors[1]은 첫 번째 모니터)
+            monitor = monitors[1]
+            
+            # 스크린샷 찍기
+            screenshot = sct.grab(monitor)
+            
+            # 원본 BGRA 버퍼를 그대로 사용 (RGB 변환 없음)
+            # 캡처 결과를 메모리에 보관 (디스크 저장은 사용자가 저장할 때만)
+            self.last_capture = CaptureResult.from_bgra(
+                screenshot.raw, screenshot.width, screenshot.height, "full_screen",
+                left=monitor["left"], top=monitor["top"])
+            
+            print(f"Full screen capture successful! Size: {screenshot.width}x{screenshot.height}")
+            return self.last_capture
         finally:
             # 캡처 후 윈도우 상태 복원 (예외 발생해도 실행)
             if window_to_hide and ui_was_visible and not window_to_hide.isVisible():
@@ -143,7 +290,7 @@ class ScreenCapture:
         :param width: 너비
         :param height: 높이
         :param window_to_hide: 캡처 중 숨길 윈도우 객체
-        :return: 임시 파일 경로 (미리보기용)
+        :return: CaptureResult (미리보기/편집용 캡처 결과)
         """
         # 캡처 전에 윈도우가 보이지 않게 처리
         ui_was_visible = False
@@ -153,33 +300,24 @@ class ScreenCapture:
             if ui_was_visible:
                 # 캡처할 타겟 창을 더 확실하게 감지하기 위해 완전히 숨김
                 window_to_hide.hide()
-                # PyQt 이벤트 처리를 즉시 수행
-                QApplication.processEvents()
-                # 다른 창이 활성화될 시간 확보
-                time.sleep(0.2)
+                # 창이 실제로 사라지고 화면에 반영될 때까지 대기
+                self.readiness.wait_hidden(int(window_to_hide.winId()))
         
         try:
-            with mss.mss() as sct:
-                # 캡처할 영역 정의
-                area = {"top": y, "left": x, "width": width, "height": height}
-                
-                # 스크린샷 찍기
-                screenshot = sct.grab(area)
-                
-                # PIL Image 객체로 변환
-                img = Image.frombytes("RGB", screenshot.size, screenshot.rgb)
-                self.captured_image = img  # 이미지 저장
-                
-                # 임시 파일 생성 (미리보기용)
-                temp_dir = os.path.join(os.path.expanduser("~"), ".temp_ImageCapturePAAK")
-                if not os.path.exists(temp_dir):
-                    os.makedirs(temp_dir)
-                
-                temp_file = os.path.join(temp_dir, "temp_preview.png")
-                img.save(temp_file)
-                
-                print(f"Area capture successful! Temp file saved: {temp_file}")
-                return temp_file
+            sct = self._get_capture_session()
+            # 캡처할 영역 정의
+            area = {"top": y, "left": x, "width": width, "height": height}
+            
+            # 스크린샷 찍기
+            screenshot = sct.grab(area)
+            
+            # 원본 BGRA 버퍼를 그대로 사용 (RGB 변환 없음)
+            # 캡처 결과를 메모리에 보관 (디스크 저장은 사용자가 저장할 때만)
+            self.last_capture = CaptureResult.from_bgra(
+                screenshot.raw, screenshot.width, screenshot.height, "area", left=x, top=y)
+            
+            print(f"Area capture successful! Size: {screenshot.width}x{screenshot.height}")
+            return self.last_capture
         finally:
             # 캡처 후 윈도우 상태 복원 (예외 발생해도 실행)
             if window_to_hide and ui_was_visible and not window_to_hide.isVisible():
@@ -188,12 +326,147 @@ class ScreenCapture:
                 window_to_hide.raise_()
                 QApplication.processEvents()  # UI 갱신 즉시 처리
 
+    def capture_virtual_desktop(self, window_to_hide=None, per_monitor=False):
+        """
+        모든 모니터를 동시에 캡처 (가상 데스크톱 모드)
+        :param window_to_hide: 캡처 중 숨길 윈도우 객체
+        :param per_monitor: True이면 이어 붙이지 않고 모니터별 결과 리스트 반환
+        :return: CaptureResult (이어 붙인 가상 데스크톱) 또는 모니터별 CaptureResult 리스트
+        """
+        ui_was_visible = bool(window_to_hide and window_to_hide.isVisible())
+        if ui_was_visible:
+            window_to_hide.hide()
+            # 창이 실제로 사라지고 화면에 반영될 때까지 대기
+            self.readiness.wait_hidden(int(window_to_hide.winId()))
+        try:
+            if per_monitor:
+                monitors = self._get_capture_session().monitors[1:]
+                return self.desktop_grabber.grab_monitors(monitors)
+            self.last_capture = self._capture_virtual_desktop()
+            return self.last_capture
+        finally:
+            if ui_was_visible and not window_to_hide.isVisible():
+                window_to_hide.show()
+                window_to_hide.activateWindow()
+                window_to_hide.raise_()
+                QApplication.processEvents()  # UI 갱신 즉시 처리
+
+    def _capture_virtual_desktop(self):
+        """모든 모니터를 병렬로 캡처해 하나로 이어 붙인 결과 반환 (모니터 목록은 GUI 스레드 세션에서 가져옴)"""
+        monitors = self._get_capture_session().monitors[1:]
+        result = self.desktop_grabber.grab(monitors)
+        print(f"Virtual desktop capture successful! {len(monitors)} monitors, Size: {result.width}x{result.height}")
+        return result
+
+    def start_burst(self, count=None, interval_ms=None):
+        """
+        버스트 캡처 시작 (전용 스레드에서 캡처, 저장 큐에서 인코딩, 즉시 반환)
+        :param count: 캡처 장수 (None이면 설정값)
+        :param interval_ms: 캡처 간격 ms (None이면 설정값)
+        :return: BurstCapture (finished/failed 시그널 연결용), 이미 진행 중이면 None
+        """
+        if self.burst is not None and self.burst.is_running:
+            print("[Burst] Burst capture already running.")
+            return None
+        if count is None:
+            count = self.config_manager.get_setting("burst_count", 10) if self.config_manager else 10
+        if interval_ms is None:
+            interval_ms = self.config_manager.get_setting("burst_interval_ms", 100) if self.config_manager else 100
+        # 전체 화면 캡처와 같은 범위 사용
+        monitor = self._get_capture_session().monitors[self._full_screen_monitor_index()]
+        max_backlog = self.config_manager.get_setting("burst_backlog_frames", 8) if self.config_manager else 8
+        self.burst = BurstCapture(
+            monitor, count, interval_ms, self.save_queue,
+            name_fn=lambda frame, index: self.generate_save_path(frame, sequence=index),
+            max_backlog=max_backlog)
+        # 저장 대기열에 넣지 못한 프레임은 저장 실패와 같이 처리 (경로 예약 해제, 실패 알림)
+        self.burst.saveRejected.connect(self.save_queue.saveFailed)
+        self.burst.start()
+        print(f"[Burst] Started: {count} frames every {interval_ms} ms")
+        return self.burst
+
+    def _full_screen_monitor_index(self):
+        """전체 화면 캡처 범위에 해당하는 mss 모니터 인덱스 (0 = 모든 모니터를 포함하는 가상 데스크톱, 1 = 주 모니터)"""
+        return 0 if self.full_screen_mode == "virtual_desktop" else 1
+
+    def capture_full_screen_retroactive(self, keypress_time):
+        """
+        샘플러가 보관한 프레임 중 단축키 입력 시각과 가장 가까운 프레임을 캡처 결과로 사용 (대기 없음)
+        :param keypress_time: 단축키 입력 시각 (time.time() 기준)
+        :return: CaptureResult, 샘플러가 꺼져 있거나 프레임이 없으면 None
+        """
+        if self.frame_sampler is None or not self.frame_sampler.is_running:
+            return None
+        if self.frame_sampler.monitor_index != self._full_screen_monitor_index():
+            # 샘플러 범위가 현재 전체 화면 캡처 범위와 다르면 일반 캡처 사용
+            return None
+        frame = self.frame_sampler.buffer.closest(keypress_time)
+        if frame is None:
+            return None
+        self.last_capture = frame
+        print(f"Full screen capture from frame buffer: {(frame.timestamp - keypress_time) * 1000:+.0f} ms from keypress")
+        return self.last_capture
+
+    def get_buffered_frames(self):
+        """
+        샘플러가 보관 중인 프레임 목록 (이전 프레임 선택용)
+        :return: CaptureResult 리스트 (오래된 순서)
+        """
+        if self.frame_sampler is None:
+            return []
+        return self.frame_sampler.buffer.snapshot()
+
+    def grab_frozen_frame(self, window_to_hide=None):
+        """
+        가상 데스크톱 전체를 즉시 캡처하여 정지 화면으로 반환 (영역 선택 배경용)
+        last_capture는 변경하지 않으며, 숨긴 창은 복원하지 않습니다. (영역 선택 후 호출자가 표시)
+        :param window_to_hide: 캡처 전에 숨길 윈도우 객체
+        :return: CaptureResult (모든 모니터를 포함한 정지 화면, left/top은 가상 데스크톱 원점)
+        """
+        if window_to_hide and window_to_hide.isVisible():
+            window_to_hide.hide()
+            # 창이 실제로 사라지고 화면에 반영될 때까지 대기
+            self.readiness.wait_hidden(int(window_to_hide.winId()))
+            
+        sct = self._get_capture_session()
+        # monitors[0]은 모든 모니터를 포함하는 가상 데스크톱
+        monitor = sct.monitors[0]
+        screenshot = sct.grab(monitor)
+        frame = CaptureResult.from_bgra(
+            screenshot.raw, screenshot.width, screenshot.height, "frozen",
+            left=monitor["left"], top=monitor["top"])
+        print(f"Frozen frame captured: Origin({monitor['left']}, {monitor['top']}), Size({screenshot.width} x {screenshot.height})")
+        return frame
+
+    def capture_area_from_frame(self, frame, x, y, width, height):
+        """
+        정지 화면에서 지정된 영역을 잘라 캡처 결과로 사용 (재캡처/대기 없음)
+        :param frame: grab_frozen_frame()이 반환한 CaptureResult
+        :param x: 시작 x 좌표 (화면 기준 물리 픽셀)
+        :param y: 시작 y 좌표 (화면 기준 물리 픽셀)
+        :param width: 너비
+        :param height: 높이
+        :return: CaptureResult (미리보기/편집용 캡처 결과), 영역이 정지 화면 밖이면 None
+        """
+        # 화면 좌표 -> 정지 화면 내부 좌표로 변환 후 범위 제한
+        left = max(x - frame.left, 0)
+        top = max(y - frame.top, 0)
+        right = min(x - frame.left + width, frame.width)
+        bottom = min(y - frame.top + height, frame.height)
+        if right <= left or bottom <= top:
+            print(f"Selected area is outside the frozen frame: ({x}, {y}, {width}, {height})")
+            return None
+            
+        self.last_capture = frame.crop(left, top, right - left, bottom - top, mode="area")
+        print(f"Area capture successful (frozen frame)! Size: {right - left}x{bottom - top}")
+        return self.last_capture
+
     def capture_window(self, window_to_hide=None, hwnd=None):
         """
         선택한 창만 캡처하기 (창 내용만 직접 캡처)
         :param window_to_hide: 캡처 중 숨길 윈도우 객체
         :param hwnd: 캡처할 창의 핸들 (None인 경우 전체 화면 캡처)
-        :return: 임시 파일 경로 (미리보기용)
+        :return: CaptureResult (미리보기/편집용 캡처 결과)
         """
         # 캡처 전에 윈도우가 보이지 않게 처리
         ui_was_visible = False
@@ -202,8 +475,8 @@ class ScreenCapture:
             ui_was_visible = window_to_hide.isVisible()
             if ui_was_visible:
                 window_to_hide.hide()
-                QApplication.processEvents()
-                time.sleep(0.1)  # 짧은 대기 시간
+                # 창이 실제로 사라지고 화면에 반영될 때까지 대기
+                self.readiness.wait_hidden(int(window_to_hide.winId()))
         
         try:
             # 창 핸들이 유효한지 확인
@@ -216,14 +489,14 @@ class ScreenCapture:
                 if win32gui.IsIconic(hwnd):
                     print("Window is minimized, restoring.")
                     win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-                    time.sleep(0.2)  # 창이 복원될 때까지 대기
+                    self.readiness.wait_restored(hwnd)  # 창이 복원될 때까지 대기
                 
                 # 창 활성화 (더 안정적인 캡처를 위해)
                 try:
                     # 가장 앞으로 가져오기
                     win32gui.SetForegroundWindow(hwnd)
-                    # 약간의 지연을 추가하여 창이 활성화될 시간 확보
-                    time.sleep(0.3)
+                    # 창이 활성화되고 다시 그려진 화면이 표시될 때까지 대기
+                    self.readiness.wait_foreground(hwnd)
                 except Exception as e:
                     print(f"Window activation failed (ignored): {e}")
                 
@@ -260,36 +533,22 @@ class ScreenCapture:
                     return self.capture_full_screen(window_to_hide)
                 
                 # 직접 화면 영역 캡처 - 가장 정확한 방법으로 변경
-                with mss.mss() as sct:
-                    # 캡처 영역 정의 - 정확한 좌표 사용
-                    capture_area = {"top": top, "left": left, "width": width, "height": height}
-                    print(f"Capture area: Top-left({left}, {top}), Size({width} x {height})")
-                    
-                    # 캡처 실행
-                    screenshot = sct.grab(capture_area)
-                    
-                    # PIL Image 객체로 변환
-                    img = Image.frombytes("RGB", screenshot.size, screenshot.rgb)
-                    
-                    # 이미지 테두리를 다듬어서 문제 해결
-                    try:
-                        # 이미지에서 단색 테두리를 감지하고 제거
-                        img = self._clean_image_borders(img)
-                    except Exception as e:
-                        print(f"Error cleaning image borders: {e}")
-                    
-                    self.captured_image = img
-                    
-                    # 임시 파일 생성
-                    temp_dir = os.path.join(os.path.expanduser("~"), ".temp_ImageCapturePAAK")
-                    if not os.path.exists(temp_dir):
-                        os.makedirs(temp_dir)
-                    
-                    temp_file = os.path.join(temp_dir, "temp_preview.png")
-                    img.save(temp_file)
-                    
-                    print("Screen area capture complete")
-                    return temp_file
+                sct = self._get_capture_session()
+                # 캡처 영역 정의 - 정확한 좌표 사용
+                capture_area = {"top": top, "left": left, "width": width, "height": height}
+                print(f"Capture area: Top-left({left}, {top}), Size({width} x {height})")
+                
+                # 캡처 실행
+                screenshot = sct.grab(capture_area)
+                
+                # 원본 BGRA 버퍼를 그대로 사용 (RGB 변환 없음)
+                # 캡처 결과를 메모리에 보관 (창 제목/프로세스 이름 포함)
+                self.last_capture = CaptureResult.from_bgra(
+                    screenshot.raw, screenshot.width, screenshot.height, "window", left=left, top=top,
+                    window_title=title, process_name=self._get_process_name(hwnd))
+                
+                print("Screen area capture complete")
+                return self.last_capture
             else:
                 print("Invalid window handle, capturing full screen.")
                 return self.capture_full_screen(window_to_hide)
@@ -302,32 +561,19 @@ class ScreenCapture:
                 window_to_hide.raise_()
                 QApplication.processEvents()
                 
-    def _clean_image_borders(self, img):
+    def _get_process_name(self, hwnd):
         """
-        이미지 테두리를 정리하여 꺾인 선이나 불필요한 테두리를 제거합니다.
-        :param img: PIL Image 객체
-        :return: 정리된 PIL Image 객체
+        창 핸들로부터 프로세스 이름을 가져옵니다.
+        :param hwnd: 창 핸들
+        :return: 프로세스 이름 (실패 시 "Unknown")
         """
         try:
-            # 이미지 크기 확인
-            width, height = img.size
-            
-            # 테두리가 너무 작은 이미지는 처리하지 않음
-            if width < 10 or height < 10:
-                return img
-                
-            # 새로운 이미지 생성 (원본 크기에서 각 테두리 1픽셀씩 줄임)
-            new_width = width
-            new_height = height
-            
-            # 이미지를 그대로 복사
-            new_img = img.copy()
-            
-            print(f"Image border cleaning complete: {width}x{height} -> {new_width}x{new_height}")
-            return new_img
-        except Exception as e:
-            print(f"Image border cleaning error: {e}")
-            return img  # 오류 발생 시 원본 이미지 반환
+            # 윈도우의 프로세스 ID 가져오기
+            _, pid = win32process.GetWindowThreadProcessId(hwnd)
+            # 프로세스 이름 가져오기
+            return psutil.Process(pid).name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
+            return "Unknown"
 
     def get_window_list(self):
         """
@@ -337,14 +583,8 @@ class ScreenCapture:
         def enum_windows_callback(hwnd, windows):
             if win32gui.IsWindowVisible(hwnd) and win32gui.GetWindowText(hwnd):
                 window_title = win32gui.GetWindowText(hwnd)
-                # 윈도우의 프로세스 ID 가져오기
-                _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                try:
-                    # 프로세스 이름 가져오기
-                    process = psutil.Process(pid)
-                    process_name = process.name()
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    process_name = "Unknown"
+                # 윈도우의 프로세스 이름 가져오기
+                process_name = self._get_process_name(hwnd)
                 
                 # 최소화되지 않은 창만 리스트에 추가
                 if win32gui.IsIconic(hwnd) == 0 and window_title and len(window_title) > 0:
@@ -366,15 +606,10 @@ class ScreenCapture:
         :param filepath: 저장할 파일 경로 (None인 경우 기본 경로 사용)
         :return: 저장된 파일 경로
         """
-        if self.captured_image is None:
+        if self.last_capture is None:
             return None
             
-        if filepath is None:
-            # 기본 저장 경로 사용
-            filename = self._generate_filename()
-            # 경로 구분자 정규화
-            save_dir = os.path.normpath(self.save_dir)
-            filepath = os.path.join(save_dir, filename)
+        filepath = self._resolve_save_path(filepath)
         
         # 저장 디렉토리가 존재하는지 확인하고 없으면 생성
         directory = os.path.dirname(filepath)
@@ -382,17 +617,98 @@ class ScreenCapture:
             os.makedirs(directory)
             print(f"Save directory created: {directory}")
         
-        # 이미지 저장
-        self.captured_image.save(filepath)
+        # 이미지 저장 (인코딩은 이 시점에만 수행)
+        try:
+            self.last_capture.save(filepath, self.encoder)
+        finally:
+            self._release_path(filepath)
+        if self.history is not None:
+            self._record_history_async(filepath, self.last_capture)
+        return filepath
+
+    def _record_history_async(self, filepath, capture):
+        """저장한 캡처를 작업자 스레드에서 기록 (픽셀 해시 계산이 GUI 스레드를 막지 않도록)"""
+        history = self.history
+
+        def record():
+            try:
+                history.record(filepath, capture)
+            except Exception as e:
+                print(f"[History] Failed to record {filepath}: {e}")
+
+        threading.Thread(target=record, name="HistoryRecord", daemon=True).start()
+
+    def save_captured_image_async(self, filepath=None):
+        """
+        캡처한 이미지를 백그라운드 저장 큐에 넣고 즉시 반환 (GUI 스레드를 막지 않음)
+        완료/실패는 self.save_queue의 saveFinished/saveFailed 시그널로 전달됩니다.
+        :param filepath: 저장할 파일 경로 (None인 경우 기본 경로 사용)
+        :return: 큐에 추가된 경우 저장될 파일 경로, 캡처가 없거나 큐가 가득 찬 경우 None
+        """
+        if self.last_capture is None:
+            return None
+            
+        filepath = self._resolve_save_path(filepath)
+        # 현재 캡처 결과를 그대로 넘김 (이후 새 캡처/편집은 새 CaptureResult로 교체되므로 안전)
+        if self.save_queue.submit(self.last_capture, filepath):
+            return filepath
+        self._release_path(filepath)
+        return None
+
+    def _resolve_save_path(self, filepath):
+        """
+        저장 경로 결정
+        :param filepath: 지정된 파일 경로 (None인 경우 기본 저장 디렉토리 + 자동 파일명)
+        :return: 저장할 파일 경로
+        """
+        if filepath is None:
+            # 기본 저장 경로 사용
+            filepath = self.generate_save_path(self.last_capture)
         return filepath
 
-    def _generate_filename(self):
+    def generate_save_path(self, capture=None, sequence=None, directory=None):
         """
-        현재 시간 기반으로 파일명 생성
-        :return: 파일명 (PNG 형식)
+        겹치지 않는 저장 경로 생성 (여러 스레드에서 호출 가능)
+        같은 이름이 이미 있거나 저장 대기 중이면 _1, _2 ... 를 붙입니다.
+        :param capture: 캡처 시각을 이름에 사용할 CaptureResult (None이면 현재 시각)
+        :param sequence: 버스트 순번 (None이면 사용 안 함)
+        :param directory: 저장 디렉토리 (None이면 기본 저장 디렉토리)
+        :return: 저장할 파일 경로
         """
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        return f"screenshot_{timestamp}.png"
+        save_dir = os.path.normpath(directory or self.save_dir)
+        base = self._generate_filename(capture.timestamp if capture else None, sequence)
+        # auto 형식이면 캡처 내용을 분석해 확장자 결정 (256px 축소본 기준, 수 ms, 결정은 캡처에 캐시되어 저장 시 재사용)
+        extension = (capture.choose_encoder(self.encoder)[0].extension
+                     if capture is not None and self.encoder.is_auto else self.encoder.extension)
+        with self._name_lock:
+            filepath = os.path.join(save_dir, base + extension)
+            suffix = 1
+            while filepath in self._reserved_paths or os.path.exists(filepath):
+                filepath = os.path.join(save_dir, f"{base}_{suffix}{extension}")
+                suffix += 1
+            self._reserved_paths.add(filepath)
+        return filepath
+
+    def _release_path(self, filepath):
+        """저장이 끝난 경로를 예약 목록에서 제거 (이후에는 디스크 존재 여부로 충돌 확인)"""
+        with self._name_lock:
+            self._reserved_paths.discard(filepath)
+
+    def _generate_filename(self, timestamp=None, sequence=None):
+        """
+        캡처 시각 기반으로 파일명 생성 (확장자 제외)
+        :param timestamp: 캡처 시각 (time.time() 기준, None이면 현재 시각)
+        :param sequence: 버스트 순번 (정수, 템플릿에서 {seq:03d}처럼 형식 지정 가능, 템플릿에 {seq}가 없으면 끝에 _{seq:03d}를 붙임)
+        :return: 파일명 (확장자 제외)
+        """
+        moment = datetime.datetime.fromtimestamp(timestamp) if timestamp else datetime.datetime.now()
+        template = self.filename_template
+        if sequence is not None and "{seq" not in template:
+            template += "_{seq:03d}"
+        return template.format(
+            datetime=moment.strftime("%Y%m%d_%H%M%S"),
+            ms=f"{moment.microsecond // 1000:03d}",
+            seq=sequence if sequence is not None else _EmptyField())
         
     def set_save_directory(self, directory):
         """
@@ -406,6 +722,13 @@ class ScreenCapture:
             
             if not os.path.exists(self.save_dir):
                 os.makedirs(self.save_dir)
+
+            # 유휴 재압축도 새 폴더를 대상으로 함
+            if self.recompressor is not None:
+                self.recompressor.set_directory(self.save_dir)
+            # 새 폴더의 기존 캡처를 기록 색인에 반영 (백그라운드)
+            if self.history is not None:
+                self.history.rescan_async(self.save_dir)
             
             # 설정 관리자가 있으면 설정도 업데이트
             if self.config_manager:
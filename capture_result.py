@@ -0,0 +1,179 @@
+import time
+from PIL import Image
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage
+
+from utils import qimage_to_pil
+
+
+class CaptureResult:
+    """
+    캡처 결과 (픽셀 데이터 + 메타데이터)
+    임시 PNG 파일을 거치지 않고 캡처 모듈에서 GUI/편집기로 직접 전달됩니다.
+    파일 인코딩은 사용자가 실제로 저장할 때만 수행됩니다.
+
+    픽셀은 QImage(Format_RGB32, 메모리상 BGRA 순서)로 보관하며,
+    PIL Image는 저장/편집 등 실제로 필요할 때 한 번만 만들어 캐시합니다.
+    """
+    def __init__(self, image, mode, left=0, top=0, window_title=None, process_name=None, timestamp=None):
+        """
+        :param image: PIL Image 객체 (None이면 from_bgra/from_qimage에서 QImage를 채움)
+        :param mode: 캡처 방식 ('full_screen', 'area', 'window', 'edited' 등)
+        :param left: 캡처 영역의 화면 기준 x 좌표 (물리 픽셀)
+        :param top: 캡처 영역의 화면 기준 y 좌표 (물리 픽셀)
+        :param window_title: 창 캡처인 경우 창 제목
+        :param process_name: 창 캡처인 경우 프로세스 이름
+        :param timestamp: 캡처 시각 (time.time() 기준, None이면 현재 시각)
+        """
+        self._pil = image  # to_pil() 결과 캐시
+        self.mode = mode
+        self.left = left
+        self.top = top
+        self.window_title = window_title
+        self.process_name = process_name
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self._qimage = None  # to_qimage() 결과 캐시
+        self._auto_choice = None  # (auto 인코더, choose() 결과) 캐시 (저장 경로와 저장 작업자가 같은 결정을 사용)
+
+    @property
+    def image(self):
+        """PIL Image (필요할 때 변환)"""
+        return self.to_pil()
+
+    @property
+    def width(self):
+        if self._qimage is not None:
+            return self._qimage.width()
+        return self._pil.width
+
+    @property
+    def height(self):
+        if self._qimage is not None:
+            return self._qimage.height()
+        return self._pil.height
+
+    @property
+    def size(self):
+        return (self.width, self.height)
+
+    def to_pil(self):
+        """
+        PIL Image 반환
+        BGRA 프레임은 PIL의 "BGRX" raw 디코더로 QImage 버퍼에서 바로 한 번에 변환합니다. (중간 RGB 버퍼 없음)
+        """
+        if self._pil is None:
+            qimage = self._qimage
+            if qimage.format() in (QImage.Format_RGB32, QImage.Format_ARGB32):
+                ptr = qimage.constBits()
+                ptr.setsize(qimage.bytesPerLine() * qimage.height())
+                if qimage.format() == QImage.Format_RGB32:
+                    self._pil = Image.frombuffer("RGB", (qimage.width(), qimage.height()), ptr,
+                                                 "raw", "BGRX", qimage.bytesPerLine(), 1)
+                else:
+                    self._pil = Image.frombuffer("RGBA", (qimage.width(), qimage.height()), ptr,
+                                                 "raw", "BGRA", qimage.bytesPerLine(), 1)
+            else:
+                self._pil = qimage_to_pil(qimage)
+        return self._pil
+
+    def to_qimage(self):
+        """
+        QImage 반환 (미리보기, 전체 화면, 클립보드, 편집기에서 공용으로 사용)
+        한 번 변환한 결과를 캐시하며, QImage는 암시적 공유이므로 호출자가 수정해도 캐시는 안전합니다.
+        """
+        if self._qimage is None:
+            if self._pil.mode == "RGBA":
+                data = self._pil.tobytes("raw", "RGBA")
+                qimage = QImage(data, self.width, self.height, self.width * 4, QImage.Format_RGBA8888)
+            else:
+                rgb = self._pil if self._pil.mode == "RGB" else self._pil.convert("RGB")
+                data = rgb.tobytes("raw", "RGB")
+                qimage = QImage(data, self.width, self.height, self.width * 3, QImage.Format_RGB888)
+            # 파이썬 버퍼 수명과 분리하기 위해 복사본 보관
+            self._qimage = qimage.copy()
+        return self._qimage
+
+    def analysis_sample(self, size=256):
+        """
+        내용 분석용 축소본 (PIL Image, 긴 변 size 이하)
+        QImage에서 바로 최근접 축소하므로 전체 해상도 PIL 변환 없이 수 ms에 끝나고, 원래 색이 섞이지 않습니다.
+        """
+        if self._qimage is None:
+            return self._pil
+        if self._qimage.width() <= size and self._qimage.height() <= size:
+            return qimage_to_pil(self._qimage)
+        return qimage_to_pil(self._qimage.scaled(size, size, Qt.KeepAspectRatio, Qt.FastTransformation))
+
+    def choose_encoder(self, encoder):
+        """
+        이 캡처에 사용할 실제 인코더 (auto는 축소본으로 한 번만 분석하고 결과를 캐시)
+        :param encoder: 설정의 ImageEncoder
+        :return: encoder.choose()와 같은 (ImageEncoder, ContentStats 또는 None)
+        """
+        if not encoder.is_auto:
+            return encoder, None
+        if self._auto_choice is None or self._auto_choice[0] is not encoder:
+            self._auto_choice = (encoder, encoder.choose(self.analysis_sample()))
+        return self._auto_choice[1]
+
+    def save(self, filepath, encoder=None):
+        """
+        이미지를 파일로 저장 (인코딩은 여기서만 발생)
+        :param filepath: 저장할 파일 경로
+        :param encoder: 형식/품질을 정하는 ImageEncoder (None이면 확장자에 따른 Pillow 기본값)
+        """
+        if encoder is not None:
+            encoder.save(self.to_pil(), filepath, choice=self.choose_encoder(encoder))
+        else:
+            self.to_pil().save(filepath)
+
+    def with_qimage(self, qimage, mode=None):
+        """
+        메타데이터는 유지한 채 이미지만 교체한 새 CaptureResult 반환 (편집 결과 반영용)
+        :param qimage: 새 이미지 (QImage)
+        :param mode: 캡처 방식 (None이면 기존 값 유지)
+        """
+        result = CaptureResult.from_qimage(
+            qimage, mode or self.mode, left=self.left, top=self.top,
+            window_title=self.window_title, process_name=self.process_name,
+            timestamp=self.timestamp)
+        return result
+
+    def crop(self, x, y, width, height, mode="area"):
+        """
+        이미지의 일부 영역을 잘라 새 CaptureResult로 반환 (정지 화면에서 영역 선택 시 사용)
+        :param x: 이 이미지 기준 시작 x 좌표 (픽셀)
+        :param y: 이 이미지 기준 시작 y 좌표 (픽셀)
+        :param width: 너비
+        :param height: 높이
+        :param mode: 새 결과의 캡처 방식
+        :return: 화면 좌표(left/top)가 보정된 CaptureResult
+        """
+        cropped = self.to_qimage().copy(x, y, width, height)
+        return CaptureResult.from_qimage(cropped, mode, left=self.left + x, top=self.top + y,
+                                         window_title=self.window_title, process_name=self.process_name,
+                                         timestamp=self.timestamp)
+
+    @classmethod
+    def from_qimage(cls, qimage, mode="edited", **metadata):
+        """QImage로부터 CaptureResult 생성 (PIL 변환은 필요할 때 수행)"""
+        result = cls(None, mode, **metadata)
+        result._qimage = QImage(qimage)
+        return result
+
+    @classmethod
+    def from_bgra(cls, raw, width, height, mode, **metadata):
+        """
+        mss가 반환한 원본 BGRA 버퍼로부터 CaptureResult 생성
+        BGRA는 QImage.Format_RGB32의 메모리 배치와 같으므로 색 변환 없이 버퍼를 감싼 뒤
+        Qt 소유 메모리로 한 번만 복사합니다. (mss의 .rgb 변환 및 PIL 변환 생략)
+        :param raw: BGRA 바이트 버퍼 (screenshot.raw)
+        :param width: 너비 (픽셀)
+        :param height: 높이 (픽셀)
+        :param mode: 캡처 방식
+        """
+        view = QImage(raw, width, height, width * 4, QImage.Format_RGB32)
+        result = cls(None, mode, **metadata)
+        # view는 raw 버퍼를 참조하므로 수명과 분리하기 위해 복사 (memcpy 1회)
+        result._qimage = view.copy()
+        return result
@@ -0,0 +1,97 @@
+import struct
+import sys
+
+from PyQt5.QtGui import QImage
+
+# Windows BITMAPINFOHEADER / BITMAPV5HEADER 상수
+BI_RGB = 0
+BI_BITFIELDS = 3
+LCS_SRGB = 0x73524742  # 'sRGB'
+LCS_GM_IMAGES = 4
+PELS_PER_METER = 3780  # 96 DPI
+
+
+def _image_bytes(image):
+    """QImage 픽셀 버퍼를 bytes로 (복사 1회)"""
+    ptr = image.constBits()
+    ptr.setsize(image.byteCount())
+    return ptr.asstring()
+
+
+def build_dib(image):
+    """
+    QImage에서 CF_DIB 데이터 (BITMAPINFOHEADER + 24비트 BGR 행) 를 직접 생성
+    PNG/BMP 인코딩 없이 Qt 변환만 사용합니다. QImage의 행 간격은 4바이트 정렬이라 DIB 행 형식과 같습니다.
+    :param image: QImage
+    :return: bytes
+    """
+    # RGB888을 채널 순서만 바꾸면 BGR, DIB는 아래쪽 행부터 저장
+    rows = image.convertToFormat(QImage.Format_RGB888).rgbSwapped().mirrored(False, True)
+    pixels = _image_bytes(rows)
+    header = struct.pack("<IiiHHIIiiII", 40, rows.width(), rows.height(), 1, 24, BI_RGB,
+                         len(pixels), PELS_PER_METER, PELS_PER_METER, 0, 0)
+    return header + pixels
+
+
+def build_dib_v5(image):
+    """
+    QImage에서 CF_DIBV5 데이터 (BITMAPV5HEADER + 32비트 BGRA 행, 알파 포함) 를 직접 생성
+    ARGB32(비프리멀티플라이) 메모리 배치가 리틀 엔디언에서 BGRA이므로 행 순서만 뒤집습니다.
+    :param image: QImage
+    :return: bytes
+    """
+    rows = image.convertToFormat(QImage.Format_ARGB32).mirrored(False, True)
+    pixels = _image_bytes(rows)
+    header = struct.pack("<IiiHHIIiiII", 124, rows.width(), rows.height(), 1, 32, BI_BITFIELDS,
+                         len(pixels), PELS_PER_METER, PELS_PER_METER, 0, 0)
+    # 채널 마스크, 색 공간, 끝점(36바이트), 감마, 렌더링 의도, 프로파일 정보
+    header += struct.pack("<IIIII36sIIIIIII", 0x00FF0000, 0x0000FF00, 0x000000FF, 0xFF000000,
+                          LCS_SRGB, b"\0" * 36, 0, 0, 0, LCS_GM_IMAGES, 0, 0, 0)
+    return header + pixels
+
+
+class ClipboardBackend:
+    """이미지를 시스템 클립보드에 복사하는 기본 클래스 (플랫폼별 하위 클래스가 구현)"""
+    name = None
+
+    def copy_image(self, image):
+        """
+        :param image: 복사할 QImage
+        """
+        raise NotImplementedError
+
+
+class Win32ClipboardBackend(ClipboardBackend):
+    """pywin32로 CF_DIB (알파가 있으면 CF_DIBV5도) 를 직접 넣는 Windows 클립보드"""
+    name = "win32"
+
+    def copy_image(self, image):
+        import win32clipboard
+
+        dib_data = build_dib(image)
+        dib_v5_data = build_dib_v5(image) if image.hasAlphaChannel() else None
+        win32clipboard.OpenClipboard()
+        try:
+            win32clipboard.EmptyClipboard()
+            win32clipboard.SetClipboardData(win32clipboard.CF_DIB, dib_data)
+            if dib_v5_data is not None:
+                win32clipboard.SetClipboardData(win32clipboard.CF_DIBV5, dib_v5_data)
+        finally:
+            win32clipboard.CloseClipboard()
+
+
+class QtClipboardBackend(ClipboardBackend):
+    """QClipboard를 사용하는 클립보드 (Linux 등, 형식 변환은 Qt 플랫폼 플러그인이 처리)"""
+    name = "qt"
+
+    def copy_image(self, image):
+        from PyQt5.QtWidgets import QApplication
+
+        QApplication.clipboard().setImage(image)
+
+
+def create_clipboard_backend():
+    """현재 플랫폼에 맞는 ClipboardBackend 생성"""
+    if sys.platform == "win32":
+        return Win32ClipboardBackend()
+    return QtClipboardBackend()
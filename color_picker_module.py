@@ -1,13 +1,20 @@
 import sys
+from collections import OrderedDict
+
 from PyQt5.QtWidgets import (QDialog, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QSlider, QSpinBox, QLineEdit, QPushButton, QApplication, QGridLayout,
                              QStyleFactory)
-from PyQt5.QtGui import QColor, QPainter, QPixmap, QImage, QMouseEvent, QPen
+from PyQt5.QtGui import QColor, QPainter, QPixmap, QImage, QMouseEvent, QPen, QLinearGradient
 from PyQt5.QtCore import Qt, pyqtSignal, QPoint, QRect
 
 class ColorSpectrumWidget(QWidget):
     """색상 스펙트럼 및 명도/채도 선택 영역 위젯"""
     colorSelected = pyqtSignal(QColor)
+    # 생성한 스펙트럼 캐시 (대화상자를 다시 열어도 재사용하도록 클래스 단위로 공유)
+    SV_CACHE_SIZE = 64 # 보관할 SV 이미지 최대 개수 (가장 오래 쓰지 않은 것부터 버림)
+    _sv_cache = OrderedDict() # (hue, 너비, 높이) -> QPixmap
+    HUE_CACHE_SIZE = 8 # 보관할 Hue 막대 최대 개수 (높이별, 가장 오래 쓰지 않은 것부터 버림)
+    _hue_cache = OrderedDict() # 높이 -> QPixmap
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -20,39 +27,62 @@ class ColorSpectrumWidget(QWidget):
         self._current_pos = QPoint(self.width()-1, 0) # 초기 위치 (우상단 = 최대 채도, 최대 명도)
 
     def _generate_hue_spectrum(self):
-        """HUE 스펙트럼 이미지 생성"""
+        """HUE 스펙트럼 이미지 생성 (높이별 캐시)"""
         width = 20 # 스펙트럼 너비
         height = self.height()
         if height <= 0: height = 200 # 초기 높이
-        
+
+        pixmap = self._hue_cache.get(height)
+        if pixmap is not None:
+            self._hue_cache.move_to_end(height)
+            return pixmap
+
         img = QImage(width, height, QImage.Format_RGB32)
         painter = QPainter(img)
-        
-        for y in range(height):
-            hue = int((y / height) * 360)
-            color = QColor.fromHsv(hue, 255, 255)
-            painter.setPen(color)
-            painter.drawLine(0, y, width, y)
-            
+        # 채도/명도가 최대일 때 Hue는 여섯 원색 사이를 RGB로 선형 보간한 것과 같음
+        gradient = QLinearGradient(0, 0, 0, height)
+        for index in range(7):
+            gradient.setColorAt(index / 6, QColor.fromHsv((index * 60) % 360, 255, 255))
+        painter.fillRect(img.rect(), gradient)
         painter.end()
-        return QPixmap.fromImage(img)
+
+        pixmap = QPixmap.fromImage(img)
+        self._hue_cache[height] = pixmap
+        while len(self._hue_cache) > self.HUE_CACHE_SIZE:
+            self._hue_cache.popitem(last=False)
+        return pixmap
 
     def _generate_sv_spectrum(self):
-        """채도(S)/명도(V) 선택 영역 이미지 생성"""
+        """채도(S)/명도(V) 선택 영역 이미지 생성 ((hue, 크기)별 캐시)"""
         width = self.width() - 30 # Hue 슬라이더 영역 제외
         height = self.height()
         if width <= 0 or height <= 0: return QPixmap() # 크기 0 방지
-            
+
+        key = (self._hue, width, height)
+        pixmap = self._sv_cache.get(key)
+        if pixmap is not None:
+            self._sv_cache.move_to_end(key)
+            return pixmap
+
+        # 픽셀마다 계산하지 않고 두 그라디언트를 겹쳐 그림
+        # 가로: 흰색 -> 순색 (채도), 세로: 투명 -> 검정 (명도), 결과는 V * ((1 - S) + S * 순색) 으로 HSV와 같음
         img = QImage(width, height, QImage.Format_RGB32)
-        
-        for y in range(height):
-            for x in range(width):
-                saturation = int((x / width) * 255)
-                value = 255 - int((y / height) * 255)
-                color = QColor.fromHsv(self._hue, saturation, value)
-                img.setPixelColor(x, y, color)
-                
-        return QPixmap.fromImage(img)
+        painter = QPainter(img)
+        saturation_gradient = QLinearGradient(0, 0, width, 0)
+        saturation_gradient.setColorAt(0, QColor(255, 255, 255))
+        saturation_gradient.setColorAt(1, QColor.fromHsv(self._hue, 255, 255))
+        painter.fillRect(img.rect(), saturation_gradient)
+        value_gradient = QLinearGradient(0, 0, 0, height)
+        value_gradient.setColorAt(0, QColor(0, 0, 0, 0))
+        value_gradient.setColorAt(1, QColor(0, 0, 0, 255))
+        painter.fillRect(img.rect(), value_gradient)
+        painter.end()
+
+        pixmap = QPixmap.fromImage(img)
+        self._sv_cache[key] = pixmap
+        while len(self._sv_cache) > self.SV_CACHE_SIZE:
+            self._sv_cache.popitem(last=False)
+        return pixmap
 
     def paintEvent(self, event):
         painter = QPainter(self)
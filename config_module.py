@@ -31,13 +31,32 @@ class ConfigManager:
             
         self.default_settings = {
             "save_directory": os.path.join(os.path.expanduser("~"), "Pictures", "Screenshots"),
-            "image_format": "png",
+            "image_format": "png",  # 저장 형식 ("png", "webp", "jpeg", "qoi", "auto": 내용에 따라 PNG 또는 손실 압축)
             "show_preview": True,
             "auto_copy_to_clipboard": False,
             "auto_save": True,
-            "save_quality": 100,  # PNG의 경우 압축 레벨 (0-100)
+            "save_quality": 100,  # PNG의 경우 압축 레벨 (0-100), WebP는 100이면 무손실, JPEG/손실 WebP는 화질
             "start_on_boot": False, # 시작 시 실행 설정 추가
-            "start_in_tray": True   # 시작 시 트레이에서 실행 설정 추가
+            "start_in_tray": True,  # 시작 시 트레이에서 실행 설정 추가
+            "save_workers": 2,      # 백그라운드 저장 작업자 스레드 수
+            "save_queue_depth": 4,  # 저장 대기열 최대 길이 (초과 시 저장 요청 거부)
+            "frame_buffer_enabled": False, # 백그라운드 프레임 샘플링 (Alt+1 즉시 캡처용)
+            "frame_buffer_fps": 4,         # 초당 샘플링 횟수
+            "frame_buffer_budget_mb": 256, # 보관할 프레임의 최대 메모리 (MB)
+            "full_screen_mode": "primary", # 전체 화면 캡처 범위 ("primary" 또는 "virtual_desktop")
+            "filename_template": "screenshot_{datetime}_{ms}", # 파일명 템플릿 ({datetime}, {ms}, {seq}: 버스트 순번 정수, {seq:03d}처럼 형식 지정 가능)
+            "burst_count": 10,             # 버스트 캡처 장수 (Alt+4)
+            "burst_interval_ms": 100,      # 버스트 캡처 간격 (ms)
+            "burst_backlog_frames": 8,     # 저장 대기열이 가득 찰 때 메모리에 둘 최대 버스트 프레임 수 (넘으면 캡처가 잠시 멈춤)
+            "undo_budget_mb": 256,         # 편집기 실행 취소 기록의 최대 메모리 (MB)
+            "auto_lossy_quality": 85,      # image_format이 auto일 때 사진/영상 화면의 손실 압축 화질 (0-100)
+            "parallel_png_threshold_mp": 8, # 이 크기(메가픽셀) 이상의 PNG는 여러 코어로 나눠 압축 (0이면 사용 안 함)
+            "idle_recompress": False,       # 유휴 시간에 저장된 PNG를 최대 압축으로 다시 저장 (켜면 캡처 시 PNG는 가장 빠른 압축 사용)
+            "idle_recompress_format": "png", # 재압축 형식 ("png": 최적화 PNG, "webp": 무손실 WebP)
+            "idle_seconds": 120,            # 마지막 입력 후 이 시간(초)이 지나야 유휴로 판단
+            "idle_cpu_percent": 20,         # CPU 사용률이 이보다 낮을 때만 재압축 (%)
+            "history_enabled": True,        # 저장한 캡처를 기록 색인(SQLite)에 추가하고 시작 시 저장 폴더를 검사
+            "thumbnail_cache_mb": 256       # 썸네일/미리보기 디스크 캐시 최대 크기 (MB, 넘으면 오래 쓰지 않은 것부터 삭제)
         }
         self.settings = self.load_settings()
         
@@ -3,24 +3,27 @@ import os
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QLabel, QAction, 
                             QToolBar, QFileDialog, QMessageBox, QApplication, QDesktopWidget, 
                             QToolButton, QMenu, QColorDialog, QComboBox, QLineEdit)
-from PyQt5.QtGui import QPixmap, QImage, QIcon, QPainter, QPen, QColor, QPolygonF, QBrush, QFont, QFontMetrics, QCursor, QPainterPath, QTransform
+from PyQt5.QtGui import QPixmap, QImage, QIcon, QPainter, QPen, QColor, QPolygonF, QBrush, QFont, QFontMetrics, QCursor, QPainterPath, QTransform, QKeySequence
 from PyQt5.QtCore import Qt, QSize, QRect, QPoint, QRectF, QSizeF, QLineF, QPointF, pyqtSignal, QBuffer, QIODevice, QMimeData
 import math
 import traceback
-import io
-from PIL import Image
-import win32clipboard
 # 사용자 정의 색상 선택기 import
 from color_picker_module import CustomColorPicker 
 # 분리된 ImageCanvas import
 from canvas_widget import ImageCanvas
 # 유틸리티 함수 임포트 추가
-from utils import get_resource_path
+from utils import get_resource_path, pixelate_region
+from undo_store import UndoStore
+from clipboard_export import create_clipboard_backend
+from annotation_layer import (AnnotationLayer, ArrowAnnotation, EllipseAnnotation, RectangleAnnotation,
+                              HighlightAnnotation, TextAnnotation, flip_transform, rotate90_transform)
 
 class ImageEditor(QMainWindow):
     """이미지 편집 기능을 제공하는 창"""
     # 저장 완료 시그널 (저장된 파일 경로 전달)
     imageSaved = pyqtSignal(str)
+    # 편집 완료 시그널 (메모리 이미지 편집 시 결과 QImage 전달)
+    imageEdited = pyqtSignal(QImage)
     closed = pyqtSignal() # 창 닫힘 시그널 추가
     
     # 모자이크 레벨 상수 정의
@@ -31,14 +34,18 @@ class ImageEditor(QMainWindow):
     DEFAULT_FONT_SIZE = 12
     MAX_FONT_SIZE = 72
 
-    def __init__(self, image_path=None, parent=None):
+    def __init__(self, image_path=None, parent=None, image=None, undo_budget_mb=256):
         super().__init__(parent)
         self.image_path = image_path
         self.parent = parent
         self.original_image = None
         self.edited_image = None
-        self.undo_stack = []
-        self.redo_stack = [] # 다시 실행 스택 추가
+        # 실행 취소/다시 실행 기록 (변경된 타일만 보관, 메모리 예산 초과 시 오래된 기록부터 버림)
+        self.undo_store = UndoStore(budget_bytes=undo_budget_mb * 1024 * 1024)
+        # 화살표/도형/텍스트/하이라이트 주석 (이미지에 합치지 않고 저장/복사 시에만 합침)
+        self.annotation_layer = AnnotationLayer()
+        self.clipboard_backend = create_clipboard_backend() # 플랫폼별 클립보드 복사 방식
+        self.selected_annotation = None # 선택된 주석 도형 (이동/삭제 대상)
 
         # 도구 상태 변수 추가
         self.current_tool = None
@@ -52,6 +59,7 @@ class ImageEditor(QMainWindow):
         self.selected_content_pixmap = None # 띄어낸 이미지 콘텐츠 (QPixmap)
         self.selected_content_rect_widget = None # 띄어낸 콘텐츠의 현재 위치/크기 (QRect)
         self.is_selection_active = False # 콘텐츠가 띄어진 활성 상태인지 여부
+        self.lifted_annotation_change = None # 띄어낼 때 이미지에 합친 주석 도형 (병합 시 같은 Undo 항목에 기록)
         
         # 화살표 색상/두께 변수
         self.arrow_color = QColor(Qt.red) 
@@ -69,7 +77,7 @@ class ImageEditor(QMainWindow):
         self.highlight_color = QColor(255, 255, 0, 128) # 기본 노란색, 반투명 (Alpha 128)
         # 초기 선택값 12px에 대응하는 실제 그리기 두께 24px로 설정
         self.current_highlight_thickness = 24 
-        self.highlight_overlay_image = None # 하이라이트 오버레이 이미지
+        self.stroke_points = [] # 하이라이트 획 점 (위젯 좌표, 릴리스 시 주석으로 추가)
         
         # 펜 색상/두께 변수 추가
         self.pen_color = QColor(Qt.red) # 기본 빨간색
@@ -82,7 +90,10 @@ class ImageEditor(QMainWindow):
         # UI 초기화
         self.initUI()
         
-        if image_path and os.path.exists(image_path):
+
+        if image is not None:
+            self.load_image_data(image)
+        elif image_path and os.path.exists(image_path):
             self.load_image(image_path)
             
         self.center_on_screen()
@@ -105,28 +116,120 @@ class ImageEditor(QMainWindow):
         self.createToolBar()
 
     # Undo/Redo 함수 추가
-    def push_undo_state(self):
-        """현재 이미지 상태를 Undo 스택에 저장"""
+    def push_undo_state(self, transform=None, change=None, dirty_rect=None):
+        """
+        현재 이미지 상태를 Undo 기록에 저장 (직전 상태와 달라진 타일만 보관)
+        :param transform: 픽셀 대신 역연산으로 되돌릴 작업 (예: ("mirror", True, False), ("rotate", 90))
+        :param change: 함께 바뀐 주석 레이어 상태 (undo_fn, redo_fn)
+        :param dirty_rect: 바뀐 이미지 영역을 알고 있으면 그 영역 (QRect, 겹치는 타일만 비교)
+        """
         if self.edited_image:
-            # QImage는 깊은 복사가 필요할 수 있음
-            self.undo_stack.append(QImage(self.edited_image)) 
-            # 새로운 동작이 생기면 Redo 스택은 비워야 함
-            self.redo_stack.clear() 
-            # 스택 크기 제한 (선택적)
-            # if len(self.undo_stack) > 20: self.undo_stack.pop(0)
+            if transform:
+                self.undo_store.push_transform(self.edited_image, *transform, change=change)
+            else:
+                self.undo_store.push(self.edited_image, change=change, dirty_rect=dirty_rect)
             self.update_undo_redo_actions()
 
-    def undo_action_triggered(self):
-        """실행 취소 (상태는 작업 *후* 저장됨)"""
-        if len(self.undo_stack) > 1: # 현재 상태 외에 이전 상태가 있어야 함 (원본 상태는 Undo 불가)
-            # 현재 상태(Undo할 상태)를 Undo 스택에서 제거하고 Redo 스택에 추가
-            current_state = self.undo_stack.pop()
-            self.redo_stack.append(current_state) # 작업 후 상태 저장
+    # 주석 레이어 함수
+    def add_annotation(self, annotation):
+        """주석 도형 추가 (이미지 픽셀은 그대로이며 Undo 항목에는 도형 참조만 보관)"""
+        layer = self.annotation_layer
+        layer.add(annotation)
+        self.undo_store.push_change(lambda: layer.remove(annotation), lambda: layer.add(annotation))
+        self.image_canvas.refresh_view_region(annotation.bounds())
+        self.update_undo_redo_actions()
+
+    def record_annotation_move(self, annotation, dx, dy):
+        """캔버스에서 끝난 주석 도형 이동을 Undo 기록에 추가 (이동은 이미 적용된 상태)"""
+        layer = self.annotation_layer
+        self.undo_store.push_change(lambda: layer.translate(annotation, -dx, -dy),
+                                    lambda: layer.translate(annotation, dx, dy))
+        self.update_undo_redo_actions()
+        print(f"[Annotation] Moved by ({dx}, {dy})")
+
+    def delete_annotation(self, annotation):
+        """주석 도형 삭제"""
+        layer = self.annotation_layer
+        bounds = annotation.bounds()
+        index = layer.remove(annotation)
+        self.undo_store.push_change(lambda: layer.add(annotation, index), lambda: layer.remove(annotation))
+        if self.selected_annotation is annotation:
+            self.selected_annotation = None
+        self.image_canvas.refresh_view_region(bounds)
+        self.update_undo_redo_actions()
+        print("[Annotation] Deleted")
+
+    def transform_annotations(self, transform):
+        """
+        이미지 뒤집기/회전/자르기에 맞춰 주석 도형 좌표 변환
+        :return: push_undo_state에 넘길 (undo_fn, redo_fn)
+        """
+        layer = self.annotation_layer
+        inverse, _ = transform.inverted()
+        layer.apply_transform(transform)
+        return (lambda: layer.apply_transform(inverse), lambda: layer.apply_transform(transform))
+
+    def flattened_image(self):
+        """주석 도형을 합친 최종 이미지 (저장/복사용)"""
+        return self.annotation_layer.flatten(self.edited_image)
+
+    def bake_annotations(self, img_rect):
+        """
+        픽셀 작업 전에 영역과 겹치는 주석 도형을 편집 이미지에 합침
+        (모자이크가 도형을 가리고, 펜 획이 도형 위에 남고, 띄어낸 영역이 도형과 함께 움직이도록)
+        :return: (작업 후 Undo 기록에 함께 넘길 (undo_fn, redo_fn), 합친 도형 영역 QRect), 합친 도형이 없으면 (None, 빈 QRect)
+        """
+        layer = self.annotation_layer
+        baked = layer.bake(self.edited_image, img_rect)
+        if not baked:
+            return None, QRect()
+        baked_rect = QRect()
+        for _, annotation in baked:
+            baked_rect = baked_rect.united(annotation.bounds())
+            if self.selected_annotation is annotation:
+                self.selected_annotation = None
+
+        def restore():
+            for index, annotation in baked:
+                layer.add(annotation, index)
+
+        def bake_again():
+            for _, annotation in baked:
+                layer.remove(annotation)
+
+        print(f"[Annotation] Flattened {len(baked)} annotations into image at {baked_rect}")
+        return (restore, bake_again), baked_rect
+
+    @staticmethod
+    def combine_changes(*changes):
+        """여러 (undo_fn, redo_fn)을 하나로 묶음 (None은 건너뜀, 되돌릴 때는 역순)"""
+        changes = [change for change in changes if change is not None]
+        if not changes:
+            return None
+        if len(changes) == 1:
+            return changes[0]
 
-            # 이전 상태(이제 Undo 스택의 마지막 상태)를 편집 이미지로 복원
-            previous_state = self.undo_stack[-1]
-            self.edited_image = QImage(previous_state) # 복사본 사용
+        def undo():
+            for undo_fn, _ in reversed(changes):
+                undo_fn()
 
+        def redo():
+            for _, redo_fn in changes:
+                redo_fn()
+        return (undo, redo)
+
+    def restore_last_state(self):
+        """작업 중 오류 발생 시 마지막으로 기록된 상태로 편집 이미지 복구"""
+        last_state = self.undo_store.current_image()
+        if last_state is not None:
+            self.edited_image = last_state
+
+    def undo_action_triggered(self):
+        """실행 취소 (상태는 작업 *후* 저장됨, 원본 상태는 Undo 불가)"""
+        previous_state = self.undo_store.undo()
+        if previous_state is not None:
+            self.edited_image = previous_state
+            self.selected_annotation = None
             self.update_canvas()
             self.update_undo_redo_actions()
         # else:
@@ -134,14 +237,10 @@ class ImageEditor(QMainWindow):
 
     def redo_action_triggered(self):
         """다시 실행 (상태는 작업 *후* 저장됨)"""
-        if self.redo_stack:
-            # Redo 스택에서 상태(복원할 작업 후 상태)를 가져옴
-            redo_state = self.redo_stack.pop()
-            # 가져온 상태를 다시 Undo 스택에 추가
-            self.undo_stack.append(QImage(redo_state)) # 복사본 사용
-            # Redo 상태 적용
-            self.edited_image = QImage(redo_state) # 복사본 사용
-
+        redo_state = self.undo_store.redo()
+        if redo_state is not None:
+            self.edited_image = redo_state
+            self.selected_annotation = None
             self.update_canvas()
             self.update_undo_redo_actions()
             
@@ -150,9 +249,9 @@ class ImageEditor(QMainWindow):
         # 'undo_action'과 'redo_action' 속성이 있는지 확인 후 상태 업데이트
         if hasattr(self, 'undo_action'):
              # 원본 상태 외에 다른 상태가 있을 때만 Undo 활성화
-             self.undo_action.setEnabled(len(self.undo_stack) > 1)
+             self.undo_action.setEnabled(self.undo_store.can_undo)
         if hasattr(self, 'redo_action'):
-             self.redo_action.setEnabled(len(self.redo_stack) > 0)
+             self.redo_action.setEnabled(self.undo_store.can_redo)
 
     def reset_image(self):
         """이미지를 원본 상태로 되돌립니다."""
@@ -160,11 +259,12 @@ class ImageEditor(QMainWindow):
             print("[Reset] No original image to reset to.")
             return
         
-        if self.edited_image and self.edited_image != self.original_image:
+        if (self.edited_image and self.edited_image != self.original_image) or len(self.annotation_layer):
             print("[Reset] Resetting image to original state...")
-            # Redo 스택을 비우고, Undo 스택에는 원본 이미지만 남김
-            self.redo_stack.clear()
-            self.undo_stack = [QImage(self.original_image)]
+            # Undo/Redo 기록과 주석을 비우고 원본 이미지를 기준 상태로 설정
+            self.undo_store.reset(self.original_image)
+            self.annotation_layer.clear()
+            self.selected_annotation = None
             self.edited_image = QImage(self.original_image)
             
             self.update_canvas()
@@ -325,6 +425,33 @@ class ImageEditor(QMainWindow):
         
         self.toolbar.addWidget(mosaic_button) # 툴바에 버튼 위젯 추가
 
+        self.toolbar.addSeparator()
+
+        # 보기 버튼 (확대/축소, 창에 맞춤, 100%) - 마우스 휠 확대/축소, 가운데 버튼 드래그 이동도 지원
+        zoom_in_action = QAction("Zoom In", self)
+        zoom_in_action.setToolTip("Zoom in (Ctrl++, mouse wheel)")
+        zoom_in_action.setShortcuts([QKeySequence.ZoomIn, QKeySequence("Ctrl+=")])
+        zoom_in_action.triggered.connect(self.image_canvas.zoom_in)
+        self.toolbar.addAction(zoom_in_action)
+
+        zoom_out_action = QAction("Zoom Out", self)
+        zoom_out_action.setToolTip("Zoom out (Ctrl+-, mouse wheel)")
+        zoom_out_action.setShortcut(QKeySequence.ZoomOut)
+        zoom_out_action.triggered.connect(self.image_canvas.zoom_out)
+        self.toolbar.addAction(zoom_out_action)
+
+        fit_action = QAction("Fit", self)
+        fit_action.setToolTip("Fit image to window (Ctrl+0)")
+        fit_action.setShortcut(QKeySequence("Ctrl+0"))
+        fit_action.triggered.connect(self.image_canvas.zoom_to_fit)
+        self.toolbar.addAction(fit_action)
+
+        actual_size_action = QAction("100%", self)
+        actual_size_action.setToolTip("Actual pixels (Ctrl+1)")
+        actual_size_action.setShortcut(QKeySequence("Ctrl+1"))
+        actual_size_action.triggered.connect(self.image_canvas.zoom_actual_size)
+        self.toolbar.addAction(actual_size_action)
+
     def set_mosaic_tool(self, level):
         """모자이크 도구 활성화 및 레벨 설정"""
         self.current_tool = 'mosaic'
@@ -340,59 +467,28 @@ class ImageEditor(QMainWindow):
         self.image_canvas.update() # 혹시 이전 선택 영역 남아있을까봐 업데이트
 
     def apply_mosaic(self, img_rect, block_size):
-        """지정된 영역에 모자이크 효과 적용 (이미지 좌표 기준)"""
+        """
+        지정된 영역에 모자이크 효과 적용 (이미지 좌표 기준)
+        :return: push_undo_state에 함께 넘길 (바뀐 이미지 영역 QRect, 주석 레이어 변경 (undo_fn, redo_fn) 또는 None)
+        """
         if not self.edited_image or self.edited_image.isNull() or not img_rect.isValid() or block_size <= 0:
-            return
+            return QRect(), None
 
-        # QImage는 직접 수정 가능
-        painter = QPainter(self.edited_image)
-        
         # 실제 이미지 경계와 교차하는 영역만 처리
         target_rect = img_rect.intersected(self.edited_image.rect())
-        if not target_rect.isValid(): return
-
-        # 평균 색상을 먼저 계산 (수정 중인 이미지에 영향받지 않도록)
-        average_colors = {}
-        source_image = QImage(self.edited_image) # 계산용 복사본
-
-        for y in range(target_rect.top(), target_rect.bottom(), block_size):
-            for x in range(target_rect.left(), target_rect.right(), block_size):
-                # 현재 블록의 실제 영역 계산 (이미지 경계 및 target_rect 경계 고려)
-                current_block_width = min(block_size, target_rect.right() - x)
-                current_block_height = min(block_size, target_rect.bottom() - y)
-                block_rect = QRect(x, y, current_block_width, current_block_height)
-
-                if block_rect.width() <= 0 or block_rect.height() <= 0: continue
-
-                total_r, total_g, total_b, count = 0, 0, 0, 0
-                # 블록 내 픽셀 순회하며 평균 계산
-                for block_y in range(block_rect.top(), block_rect.bottom()):
-                    for block_x in range(block_rect.left(), block_rect.right()):
-                        # source_image에서 색상 값 가져오기
-                        pixel_color = QColor(source_image.pixel(block_x, block_y))
-                        total_r += pixel_color.red()
-                        total_g += pixel_color.green()
-                        total_b += pixel_color.blue()
-                        count += 1
-                
-                if count > 0:
-                    avg_r = total_r // count
-                    avg_g = total_g // count
-                    avg_b = total_b // count
-                    average_colors[(x, y)] = QColor(avg_r, avg_g, avg_b)
-
-        # 계산된 평균 색상으로 블록 채우기
-        for y in range(target_rect.top(), target_rect.bottom(), block_size):
-            for x in range(target_rect.left(), target_rect.right(), block_size):
-                if (x, y) in average_colors:
-                    current_block_width = min(block_size, target_rect.right() - x)
-                    current_block_height = min(block_size, target_rect.bottom() - y)
-                    block_rect = QRect(x, y, current_block_width, current_block_height)
-                    painter.fillRect(block_rect, average_colors[(x, y)])
-        
+        if not target_rect.isValid(): return QRect(), None
+
+        # 영역 위의 주석 도형도 모자이크로 가려지도록 먼저 이미지에 합침
+        change, baked_rect = self.bake_annotations(target_rect)
+        # 대상 영역만 복사해 블록 평균 계산 후 다시 그림 (전체 이미지 복사/픽셀 단위 반복 없음)
+        pixelated = pixelate_region(self.edited_image, target_rect, block_size)
+        painter = QPainter(self.edited_image)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.drawImage(target_rect.topLeft(), pixelated)
         painter.end()
         print(f"Applied mosaic to rect: {target_rect} with block size: {block_size}")
         # self.update_canvas() # mouseReleaseEvent에서 호출됨
+        return target_rect.united(baked_rect), change
 
     def activate_rectangle_tool(self):
         """사각형 그리기 도구 활성화, 색상/두께 선택 및 커서 변경"""
@@ -652,7 +748,9 @@ class ImageEditor(QMainWindow):
                 print("[DEBUG] edited_image.copy() finished")
                 self.edited_image = cropped_image
                 # self.original_image = QImage(self.edited_image) # 자른 후에는 원본도 업데이트 (선택적) -> 제거: 원본은 유지
-                self.push_undo_state() # 작업 후 상태 저장
+                # 주석 도형도 잘린 영역 기준 좌표로 이동
+                change = self.transform_annotations(QTransform.fromTranslate(-valid_img_rect.x(), -valid_img_rect.y()))
+                self.push_undo_state(change=change) # 작업 후 상태 저장
                 print("[DEBUG] Calling update_canvas after crop")
                 self.update_canvas()
                 print("[DEBUG] Calling initialize_overlay after crop")
@@ -662,8 +760,8 @@ class ImageEditor(QMainWindow):
                 print(f"[ApplyCrop] Error during cropping: {e}")
                 traceback.print_exc()
                 # 에러 발생 시 undo 스택 복구 시도 (주의 필요)
-                print("[DEBUG] Attempting to restore undo stack after crop error")
-                if self.undo_stack: self.undo_stack.pop()
+                print("[DEBUG] Restoring last recorded state after crop error")
+                self.restore_last_state()
             
             print("[DEBUG] Calling reset_tool_state after apply_crop")
             self.reset_tool_state()
@@ -723,6 +821,9 @@ class ImageEditor(QMainWindow):
             elif self.is_selection_active and event.key() in (Qt.Key_Return, Qt.Key_Enter):
                  print("[DEBUG] Enter key pressed with active selection. Merging...")
                  self.merge_selection()
+            # 선택된 주석 도형 삭제
+            elif self.selected_annotation is not None and event.key() in (Qt.Key_Delete, Qt.Key_Backspace):
+                 self.delete_annotation(self.selected_annotation)
             else:
                 super().keyPressEvent(event) # 다른 키 이벤트는 기본 처리
         except Exception as e:
@@ -736,23 +837,30 @@ class ImageEditor(QMainWindow):
             return False
             
         image = QImage(image_path)
-        if image.isNull():
+        if not self.load_image_data(image):
+            return False
+        
+        filename = os.path.basename(image_path)
+        self.setWindowTitle(f'Image Editor - {filename}')
+        return True
+
+    def load_image_data(self, image):
+        """메모리의 QImage를 편집기에 로드 (파일을 거치지 않음), Undo 스택 초기화"""
+        if image is None or image.isNull():
             QMessageBox.warning(self, "Error", "Failed to load image!")
             return False
             
         self.original_image = image
         self.edited_image = QImage(image) # 편집용 복사본 생성
         
-        # Undo/Redo 스택 초기화 및 초기 상태 추가
-        self.undo_stack = [QImage(self.original_image)] # 초기 상태는 원본
-        self.redo_stack = []
+        # Undo/Redo 기록 및 주석 초기화 (초기 상태는 원본)
+        self.undo_store.reset(self.original_image)
+        self.annotation_layer.clear()
+        self.selected_annotation = None
         self.update_undo_redo_actions() # 버튼 상태 업데이트
         
         self.update_canvas() # 초기 이미지 표시
         
-        filename = os.path.basename(image_path)
-        self.setWindowTitle(f'Image Editor - {filename}')
-        
         # 오버레이 이미지 초기화 (로드된 이미지 크기 기준)
         self.initialize_overlay()
         
@@ -772,154 +880,78 @@ class ImageEditor(QMainWindow):
         self.move(window_geometry.topLeft())
 
     def draw_arrow(self, img_start_pt, img_end_pt, color, thickness):
-        """이미지에 화살표 그리기 (두께 파라미터 추가)"""
+        """이미지에 화살표 주석 추가 (두께 파라미터 추가)"""
         print(f"[DrawArrow] Entered. Start: {img_start_pt}, End: {img_end_pt}, Color: {color.name()}, Thickness: {thickness}") # 두께 정보 추가
         if not self.edited_image or self.edited_image.isNull():
             print("[DrawArrow] Error: No edited image.") # 디버그 출력
             return
 
-        painter = QPainter(self.edited_image)
-        # thickness 파라미터 사용
-        pen = QPen(color, thickness, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin) 
-        painter.setPen(pen)
-        painter.setBrush(QBrush(color)) 
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        line = QLineF(img_start_pt, img_end_pt)
-        painter.drawLine(line)
-
-        # 두께에 비례하는 화살촉 크기
-        arrow_size = 3.0 * thickness + 4 
-        angle = math.atan2(-line.dy(), line.dx())
-
-        arrow_p1 = line.p2() - QPointF(math.cos(angle + math.pi / 6) * arrow_size,
-                                      -math.sin(angle + math.pi / 6) * arrow_size)
-        arrow_p2 = line.p2() - QPointF(math.cos(angle - math.pi / 6) * arrow_size,
-                                      -math.sin(angle - math.pi / 6) * arrow_size)
-                                      
-        arrow_head = QPolygonF([line.p2(), arrow_p1, arrow_p2])
-        painter.drawPolygon(arrow_head)
-        
-        painter.end()
-        print(f"[DrawArrow] Finished drawing.") # 디버그 출력
+        self.add_annotation(ArrowAnnotation(img_start_pt, img_end_pt, color, thickness))
+        print(f"[DrawArrow] Annotation added.") # 디버그 출력
 
     def draw_circle(self, img_rect, color, thickness):
-        """이미지에 원(타원) 그리기"""
+        """이미지에 원(타원) 주석 추가"""
         print(f"[DrawCircle] Entered. Rect: {img_rect}, Color: {color.name()}, Thickness: {thickness}")
         if not self.edited_image or self.edited_image.isNull():
             print("[DrawCircle] Error: No edited image.")
             return
 
-        painter = QPainter(self.edited_image)
-        pen = QPen(color, thickness, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
-        painter.setPen(pen)
-        painter.setBrush(Qt.NoBrush) # 원은 외곽선만 그림
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        painter.drawEllipse(img_rect)
-        
-        painter.end()
-        print(f"[DrawCircle] Finished drawing.")
+        self.add_annotation(EllipseAnnotation(img_rect, color, thickness))
+        print(f"[DrawCircle] Annotation added.")
 
     def draw_rectangle(self, img_rect, color, thickness):
-        """이미지에 사각형 그리기"""
+        """이미지에 사각형 주석 추가"""
         print(f"[DrawRectangle] Entered. Rect: {img_rect}, Color: {color.name()}, Thickness: {thickness}")
         if not self.edited_image or self.edited_image.isNull():
             print("[DrawRectangle] Error: No edited image.")
             return
 
-        painter = QPainter(self.edited_image)
-        pen = QPen(color, thickness, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
-        painter.setPen(pen)
-        painter.setBrush(Qt.NoBrush) # 사각형은 외곽선만 그림
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        painter.drawRect(img_rect)
-        
-        painter.end()
-        print(f"[DrawRectangle] Finished drawing.")
-
-    def draw_pen_segment(self, img_start_pt, img_end_pt, color, thickness):
-        """이미지에 펜 선분(Segment) 그리기 (불투명)"""
-        if not self.edited_image or self.edited_image.isNull() or not img_start_pt or not img_end_pt:
-            return
-        if img_start_pt == img_end_pt:
-            return
-
-        painter = QPainter(self.edited_image)
-        # 펜 색상은 불투명 (Alpha 255)
-        pen_color_opaque = QColor(color.red(), color.green(), color.blue(), 255)
-        pen = QPen(pen_color_opaque, thickness, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
-        painter.setPen(pen)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        painter.drawLine(img_start_pt, img_end_pt)
-        painter.end()
+        self.add_annotation(RectangleAnnotation(img_rect, color, thickness))
+        print(f"[DrawRectangle] Annotation added.")
+
+    def commit_pen_stroke(self, stroke):
+        """
+        펜 획 버퍼(StrokeBuffer)를 이미지에 한 번만 합치고 Undo 기록 (획 영역의 타일만 비교)
+        :return: 바뀐 이미지 영역 (QRect)
+        """
+        if not self.edited_image or self.edited_image.isNull() or stroke is None:
+            return QRect()
+        # 획 아래의 주석 도형을 먼저 이미지에 합쳐 획이 도형 밑으로 가려지지 않게 함
+        change, baked_rect = self.bake_annotations(stroke.bounds)
+        bounds = stroke.commit(self.edited_image)
+        if bounds.isEmpty() and change is None:
+            return bounds
+        self.image_canvas.refresh_image_region(bounds.united(baked_rect))
+        self.undo_store.push(self.edited_image, change=change, dirty_rect=bounds.united(baked_rect))
+        self.update_undo_redo_actions()
+        print(f"[PenStroke] Committed {len(stroke.points)} points, bounds: {bounds}")
+        return bounds
 
     def draw_highlight_stroke(self, img_points, color, thickness):
-        """이미지에 하이라이트 획(Polyline) 그리기"""
+        """이미지에 하이라이트 획(Polyline) 주석 추가"""
         print(f"[DrawHighlight] Entered. Points: {len(img_points)}, Color: {color.name(QColor.HexArgb)}, Thickness: {thickness}")
         if not self.edited_image or self.edited_image.isNull() or len(img_points) < 2:
             print("[DrawHighlight] Error: No edited image or not enough points.")
             return
 
-        painter = QPainter(self.edited_image)
         # QColor에 이미 투명도가 포함되어 있어야 함 (activate_highlight_tool에서 설정)
-        pen = QPen(color, thickness, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
-        painter.setPen(pen)
-        painter.setBrush(Qt.NoBrush)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Composition Mode 설정 (선택적, 기본값 SourceOver가 보통 적절)
-        # painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
-
-        # 이미지 좌표 점 리스트로 QPolygonF 생성
-        polygon = QPolygonF([QPointF(p) for p in img_points])
-        painter.drawPolyline(polygon)
-        
-        painter.end()
-        print(f"[DrawHighlight] Finished drawing.")
+        self.add_annotation(HighlightAnnotation(img_points, color, thickness))
+        print(f"[DrawHighlight] Annotation added.")
 
     def initialize_overlay(self):
-        """하이라이트 오버레이 이미지 초기화"""
-        if self.edited_image and not self.edited_image.isNull():
-            # ARGB32_Premultiplied가 투명도 처리에 더 효율적일 수 있음
-            self.highlight_overlay_image = QImage(self.edited_image.size(), QImage.Format_ARGB32_Premultiplied)
-            self.highlight_overlay_image.fill(Qt.transparent) # 투명하게 채움
-            print("[Overlay] Initialized")
-        else:
-            self.highlight_overlay_image = None
-            print("[Overlay] Cleared (no base image)")
+        """하이라이트 미리보기 초기화 (미리보기는 캔버스의 획 버퍼가 그리므로 이미지 크기의 버퍼가 필요 없음)"""
+        self.stroke_points = []
+        print("[Overlay] Initialized")
 
     def draw_text(self, img_position, text, color, size):
-        """이미지 상의 지정된 위치에 텍스트 그리기"""
+        """이미지 상의 지정된 위치에 텍스트 주석 추가 (img_position이 좌상단)"""
         print(f"[DrawText] Entered. Pos: {img_position}, Text: '{text}', Color: {color.name()}, Size: {size}")
         if not self.edited_image or self.edited_image.isNull() or not text:
             print("[DrawText] Error: No edited image or empty text.")
             return
 
-        painter = QPainter(self.edited_image)
-        font = QFont()
-        font.setPixelSize(size) # 픽셀 크기로 설정
-        painter.setFont(font)
-        painter.setPen(color) # 텍스트 색상 설정
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.setRenderHint(QPainter.TextAntialiasing)
-
-        # 폰트 메트릭스를 사용하여 텍스트 경계 계산
-        fm = QFontMetrics(painter.font())
-        bounding_rect = fm.boundingRect(text)
-
-        # img_position을 좌상단으로 하고 계산된 크기를 갖는 QRect 생성
-        # boundingRect는 때때로 음수 x/y를 가질 수 있으므로, 너비/높이만 사용
-        target_rect = QRect(img_position, bounding_rect.size())
-        # 필요하다면 약간의 패딩을 추가할 수 있음: target_rect.adjust(0, 0, 2, 2)
-
-        # img_position을 좌상단 기준으로 텍스트 그리기 (QRect과 정렬 플래그 사용)
-        painter.drawText(target_rect, Qt.AlignTop | Qt.AlignLeft, text)
-
-        painter.end()
-        print(f"[DrawText] Finished drawing text.")
+        self.add_annotation(TextAnnotation(img_position, text, color, size))
+        print(f"[DrawText] Annotation added.")
 
     def flip_horizontally(self):
         """이미지를 수평으로 뒤집습니다."""
@@ -930,8 +962,9 @@ class ImageEditor(QMainWindow):
         try:
             print("[FlipH] Flipping horizontally...")
             # self.push_undo_state() # 뒤집기 전 상태 저장 -> 작업 후로 이동
+            change = self.transform_annotations(flip_transform(self.edited_image.width(), self.edited_image.height(), True, False))
             self.edited_image = self.edited_image.mirrored(True, False)
-            self.push_undo_state() # 작업 후 상태 저장
+            self.push_undo_state(("mirror", True, False), change) # 작업 후 상태 저장 (역연산만 기록)
             self.update_canvas()
             self.update_undo_redo_actions()
             # 오버레이 재설정 (선택적이지만 안전함)
@@ -940,7 +973,7 @@ class ImageEditor(QMainWindow):
         except Exception as e:
             print(f"[FlipH] Error during horizontal flip: {e}")
             traceback.print_exc()
-            if self.undo_stack: self.undo_stack.pop() # 에러 시 undo 복구
+            self.restore_last_state() # 에러 시 마지막 기록 상태로 복구
 
     def flip_vertically(self):
         """이미지를 수직으로 뒤집습니다."""
@@ -951,8 +984,9 @@ class ImageEditor(QMainWindow):
         try:
             print("[FlipV] Flipping vertically...")
             # self.push_undo_state() # 뒤집기 전 상태 저장 -> 작업 후로 이동
+            change = self.transform_annotations(flip_transform(self.edited_image.width(), self.edited_image.height(), False, True))
             self.edited_image = self.edited_image.mirrored(False, True)
-            self.push_undo_state() # 작업 후 상태 저장
+            self.push_undo_state(("mirror", False, True), change) # 작업 후 상태 저장 (역연산만 기록)
             self.update_canvas()
             self.update_undo_redo_actions()
             # 오버레이 재설정
@@ -961,7 +995,7 @@ class ImageEditor(QMainWindow):
         except Exception as e:
             print(f"[FlipV] Error during vertical flip: {e}")
             traceback.print_exc()
-            if self.undo_stack: self.undo_stack.pop() # 에러 시 undo 복구
+            self.restore_last_state() # 에러 시 마지막 기록 상태로 복구
 
     def lift_selection(self, widget_rect):
         """주어진 위젯 영역의 이미지를 띄어내어 활성 선택 상태로 만듦"""
@@ -985,6 +1019,8 @@ class ImageEditor(QMainWindow):
         print(f"[LiftSelection] Copying image data from: {valid_img_rect}")
         try:
             # self.push_undo_state() # 띄어내기 전 상태 저장 -> 작업 후로 이동
+            # 영역 위의 주석 도형도 함께 옮겨지도록 먼저 이미지에 합침
+            self.lifted_annotation_change, _ = self.bake_annotations(valid_img_rect)
             # QPixmap으로 복사 (투명 배경 지원 위해)
             copied_image = self.edited_image.copy(valid_img_rect)
             self.selected_content_pixmap = QPixmap.fromImage(copied_image)
@@ -1006,7 +1042,9 @@ class ImageEditor(QMainWindow):
         except Exception as e:
             print(f"[LiftSelection] Error during lifting selection: {e}")
             traceback.print_exc()
-            if self.undo_stack: self.undo_stack.pop() # 에러 시 undo 복구
+            self.restore_last_state() # 에러 시 마지막 기록 상태로 복구
+            if self.lifted_annotation_change is not None:
+                self.lifted_annotation_change[0]() # 합친 주석 도형도 레이어로 되돌림
             self.reset_selection_state()
             self.current_tool = None # 도구 초기화
             
@@ -1015,6 +1053,7 @@ class ImageEditor(QMainWindow):
         self.is_selection_active = False
         self.selected_content_pixmap = None
         self.selected_content_rect_widget = None
+        self.lifted_annotation_change = None
         # self.selection_rect_widget = None # 필요시 추가
         print("[DEBUG] Selection state reset.")
             
@@ -1042,13 +1081,17 @@ class ImageEditor(QMainWindow):
             # self.reset_selection_state() # 예: 실패 시 초기화
             return
             
+        change = self.lifted_annotation_change
         try:
             # self.push_undo_state() # 병합 전 상태 저장 -> 작업 후로 이동
+            # 놓을 자리의 주석 도형은 붙여 넣는 콘텐츠에 가려지도록 먼저 이미지에 합침
+            target_change, _ = self.bake_annotations(img_target_rect)
+            change = self.combine_changes(self.lifted_annotation_change, target_change)
             painter = QPainter(self.edited_image)
             # QPixmap을 QRect에 맞춰 그림 (source rect는 QPixmap 전체)
             painter.drawPixmap(img_target_rect, self.selected_content_pixmap, self.selected_content_pixmap.rect())
             painter.end()
-            self.push_undo_state() # 작업 후 상태 저장
+            self.push_undo_state(change=change) # 작업 후 상태 저장 (띄어내기/병합 때 합친 주석 도형 포함)
             print("[MergeSelection] Selection merged successfully.")
             self.update_canvas()
             self.update_undo_redo_actions()
@@ -1056,7 +1099,9 @@ class ImageEditor(QMainWindow):
         except Exception as e:
             print(f"[MergeSelection] Error during merging: {e}")
             traceback.print_exc()
-            if self.undo_stack: self.undo_stack.pop() # 에러 시 undo 복구
+            self.restore_last_state() # 에러 시 마지막 기록 상태로 복구
+            if change is not None:
+                change[0]() # 합친 주석 도형도 레이어로 되돌림
             
         # 병합 성공/실패 여부와 관계없이 선택 상태는 초기화
         self.reset_selection_state()
@@ -1075,9 +1120,10 @@ class ImageEditor(QMainWindow):
             # QTransform을 사용하여 90도 회전 적용
             transform = QTransform()
             transform.rotate(90)
+            change = self.transform_annotations(rotate90_transform(self.edited_image.height()))
             self.edited_image = self.edited_image.transformed(transform, Qt.SmoothTransformation)
             
-            self.push_undo_state() # 작업 후 상태 저장
+            self.push_undo_state(("rotate", 90), change) # 작업 후 상태 저장 (역연산만 기록)
             self.update_canvas()
             self.update_undo_redo_actions()
             # 회전 후 이미지 크기가 변경되므로 오버레이 재설정
@@ -1086,53 +1132,20 @@ class ImageEditor(QMainWindow):
         except Exception as e:
             print(f"[Rotate] Error during rotation: {e}")
             traceback.print_exc()
-            if self.undo_stack: self.undo_stack.pop() # 에러 시 undo 복구
+            self.restore_last_state() # 에러 시 마지막 기록 상태로 복구
 
     def copy_to_clipboard(self):
-        """편집된 이미지를 Pillow와 pywin32를 사용하여 클립보드에 복사합니다."""
-        print("[DEBUG] copy_to_clipboard (Pillow/pywin32) called.")
+        """편집된 이미지를 클립보드에 복사합니다. (Windows는 DIB를 이미지 버퍼에서 직접 생성, 그 외는 Qt 클립보드)"""
+        print(f"[DEBUG] copy_to_clipboard ({self.clipboard_backend.name}) called.")
         if self.edited_image and not self.edited_image.isNull():
             print(f"[DEBUG] edited_image is valid. Size: {self.edited_image.size()}, Format: {self.edited_image.format()}")
             try:
-                # 1. QImage를 Pillow Image로 변환
-                buffer = QBuffer()
-                buffer.open(QIODevice.WriteOnly)
-                # PNG로 저장하여 투명도 유지 시도
-                self.edited_image.save(buffer, "PNG") 
-                buffer.seek(0) # 버퍼 포인터를 시작으로 이동
-                pil_image = Image.open(io.BytesIO(buffer.data()))
-                buffer.close()
-                print("[DEBUG] QImage converted to Pillow Image.")
-
-                # 2. Pillow Image를 DIB 형식으로 변환 (BMP 저장 후 헤더 제거)
-                output = io.BytesIO()
-                # Pillow 이미지를 BMP 형식으로 메모리에 저장 (RGB 모드로 변환 필요할 수 있음)
-                # pil_image = pil_image.convert("RGB") # 필요시 주석 해제
-                pil_image.save(output, "BMP")
-                bmp_data = output.getvalue()
-                output.close()
-                
-                # BMP 파일 헤더(14바이트)를 제외한 DIB 데이터 추출
-                # BMP 파일 구조상 DIB 데이터는 14바이트 이후부터 시작
-                dib_data = bmp_data[14:] 
-                print(f"[DEBUG] Pillow Image converted to DIB format (size: {len(dib_data)} bytes).")
-
-                # 3. win32clipboard를 사용하여 DIB 데이터 복사
-                win32clipboard.OpenClipboard()
-                win32clipboard.EmptyClipboard()
-                win32clipboard.SetClipboardData(win32clipboard.CF_DIB, dib_data)
-                win32clipboard.CloseClipboard()
-                print("[Copy] Image copied to clipboard using Pillow and pywin32 (CF_DIB).")
-                # self.close() # 복사 시그널에서 직접 닫지 않고, closeEvent에서 시그널 발생
-
+                # 주석 도형을 합친 이미지를 복사
+                self.clipboard_backend.copy_image(self.flattened_image())
+                print(f"[Copy] Image copied to clipboard ({self.clipboard_backend.name}).")
             except Exception as e:
-                print(f"[ERROR] Exception during clipboard operation (Pillow/pywin32): {e}")
+                print(f"[ERROR] Exception during clipboard operation ({self.clipboard_backend.name}): {e}")
                 traceback.print_exc()
-                # 실패 시 클립보드 닫기 시도
-                try:
-                    win32clipboard.CloseClipboard()
-                except Exception as e_close:
-                    print(f"[ERROR] Failed to close clipboard after error: {e_close}")
         else:
             if not self.edited_image:
                 print("[DEBUG] edited_image is None.")
@@ -1141,16 +1154,20 @@ class ImageEditor(QMainWindow):
             print("No valid image to copy.")
 
     def save_image_and_close(self):
-        """편집된 이미지를 원본 파일에 저장하고 창을 닫습니다."""
+        """
+        편집된 이미지를 원본 파일에 저장하고 창을 닫습니다.
+        파일 경로 없이 메모리 이미지로 열린 경우 imageEdited 시그널로 결과를 돌려줍니다.
+        """
         if not self.edited_image or self.edited_image.isNull():
             QMessageBox.warning(self, "Warning", "No edited image to save.")
             print("[Save] No image available to save.")
             return
             
         if not self.image_path:
-            QMessageBox.warning(self, "Warning", "Original image path is unknown. Cannot save.")
-            print("[Save] Original image path not set.")
-            # 또는 여기서 Save As 로직 호출 고려
+            # 메모리 이미지 편집: 디스크에 쓰지 않고 호출자에게 결과 전달
+            print("[Save] Returning edited image to caller (in-memory).")
+            self.imageEdited.emit(QImage(self.flattened_image()))
+            self.close() # 창 닫기
             return
 
         # 변경 사항이 있는지 확인 (선택적이지만 권장)
@@ -1161,7 +1178,8 @@ class ImageEditor(QMainWindow):
             
         try:
             print(f"[Save] Saving image to: {self.image_path}")
-            save_success = self.edited_image.save(self.image_path)
+            # 주석 도형은 저장할 때만 이미지에 합침
+            save_success = self.flattened_image().save(self.image_path)
             
             if save_success:
                 print("[Save] Image saved successfully.")
@@ -0,0 +1,144 @@
+import threading
+import time
+import traceback
+from collections import deque
+
+import mss
+
+from capture_result import CaptureResult
+
+
+class FrameRingBuffer:
+    """
+    최근 전체 화면 프레임을 보관하는 메모리 제한 링 버퍼
+    프레임 바이트 합계가 예산을 넘으면 가장 오래된 프레임부터 버립니다.
+    """
+    def __init__(self, byte_budget):
+        """
+        :param byte_budget: 보관할 프레임 바이트 합계의 최대값
+        """
+        self.byte_budget = byte_budget
+        self._frames = deque()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _frame_bytes(frame):
+        # BGRA 프레임 (픽셀당 4바이트)
+        return frame.width * frame.height * 4
+
+    def __len__(self):
+        with self._lock:
+            return len(self._frames)
+
+    @property
+    def total_bytes(self):
+        with self._lock:
+            return self._bytes
+
+    def append(self, frame):
+        """프레임 추가 (예산 초과 시 오래된 프레임 제거)"""
+        size = self._frame_bytes(frame)
+        if size > self.byte_budget:
+            # 한 장도 넣을 수 없는 예산이면 보관하지 않음
+            return
+        with self._lock:
+            self._frames.append(frame)
+            self._bytes += size
+            while self._bytes > self.byte_budget:
+                old = self._frames.popleft()
+                self._bytes -= self._frame_bytes(old)
+
+    def closest(self, timestamp):
+        """
+        지정 시각과 가장 가까운 프레임 반환
+        :param timestamp: 기준 시각 (time.time() 기준)
+        :return: CaptureResult, 버퍼가 비어 있으면 None
+        """
+        with self._lock:
+            if not self._frames:
+                return None
+            return min(self._frames, key=lambda frame: abs(frame.timestamp - timestamp))
+
+    def snapshot(self):
+        """현재 보관 중인 프레임 목록 (오래된 순서, 복사본 리스트)"""
+        with self._lock:
+            return list(self._frames)
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+
+
+class FrameSampler:
+    """
+    백그라운드에서 일정 간격으로 전체 화면을 캡처해 FrameRingBuffer에 넣는 샘플러
+    mss 세션은 스레드별 자원이므로 샘플러 스레드 안에서 따로 생성합니다.
+    """
+    def __init__(self, fps=4, byte_budget_mb=256, monitor_index=1, display_signature=None):
+        """
+        :param fps: 초당 샘플링 횟수
+        :param byte_budget_mb: 링 버퍼 메모리 예산 (MB)
+        :param monitor_index: 캡처할 mss 모니터 인덱스 (0 = 모든 모니터를 포함하는 가상 데스크톱, 1 = 주 모니터)
+        :param display_signature: 디스플레이 구성을 나타내는 값을 반환하는 함수 (바뀌면 세션 재생성)
+        """
+        self.interval = 1.0 / max(fps, 0.1)
+        self.monitor_index = monitor_index
+        self.display_signature = display_signature
+        self.buffer = FrameRingBuffer(int(byte_budget_mb * 1024 * 1024))
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """샘플링 스레드 시작"""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="FrameSampler", daemon=True)
+        self._thread.start()
+        print(f"[Frame Sampler] Started: {1.0 / self.interval:.1f} fps, budget {self.buffer.byte_budget // (1024 * 1024)} MB")
+
+    def stop(self):
+        """샘플링 스레드 종료 및 버퍼 비우기"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.buffer.clear()
+        print("[Frame Sampler] Stopped.")
+
+    def _run(self):
+        sct = None
+        signature = None
+        try:
+            while not self._stop_event.is_set():
+                started = time.perf_counter()
+                try:
+                    current = self.display_signature() if self.display_signature else None
+                    if sct is None or current != signature:
+                        if sct is not None:
+                            sct.close()
+                            # 해상도가 바뀌면 이전 프레임은 의미가 없으므로 버림
+                            self.buffer.clear()
+                        sct = mss.mss()
+                        signature = current
+                    monitor = sct.monitors[self.monitor_index]
+                    timestamp = time.time()
+                    screenshot = sct.grab(monitor)
+                    self.buffer.append(CaptureResult.from_bgra(
+                        screenshot.raw, screenshot.width, screenshot.height, "full_screen",
+                        left=monitor["left"], top=monitor["top"], timestamp=timestamp))
+                except Exception as e:
+                    print(f"[Frame Sampler] Error sampling frame: {e}")
+                    traceback.print_exc()
+                # 캡처에 걸린 시간을 빼고 다음 샘플까지 대기 (stop 시 즉시 깨어남)
+                elapsed = time.perf_counter() - started
+                self._stop_event.wait(max(self.interval - elapsed, 0.0))
+        finally:
+            if sct is not None:
+                sct.close()
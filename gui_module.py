@@ -6,7 +6,7 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QPushButton, QVBoxLayout
                            QWidget, QLabel, QFileDialog, QHBoxLayout, QMessageBox,
                            QFrame, QSizePolicy, QToolTip, QStatusBar, QDesktopWidget,
                            QShortcut, QDialog, QListWidget, QListWidgetItem, QAbstractItemView,
-                           QSystemTrayIcon, QAction, QMenu, QCheckBox)
+                           QSystemTrayIcon, QAction, QMenu, QCheckBox, QSlider, QDialogButtonBox)
 from PyQt5.QtGui import QPixmap, QIcon, QPainter, QPainterPath, QPen, QColor, QBrush, QFont, QKeySequence, QCursor, QImage
 from PyQt5.QtCore import Qt, QRect, QPoint, QRectF, QSize, QTimer, QEvent, QUrl, pyqtSignal
 from PyQt5.QtGui import QDesktopServices
@@ -16,11 +16,20 @@ import win32process
 import win32api  # 윈도우 API 추가
 import traceback 
 import logging # 로깅 모듈 임포트
+import threading
 
 # utils.py에서 함수 가져오기
-from utils import get_resource_path, qimage_to_pil, register_startup # register_startup 임포트 추가
+from utils import (get_resource_path, register_startup, virtual_desktop_geometry, screen_physical_rect,
+                   logical_to_physical, physical_rect_to_logical) # register_startup 임포트 추가
 # 편집기 모듈 가져오기
 from editor_module import ImageEditor
+# 캡처 결과 객체
+from capture_result import CaptureResult
+# 캡처 기록 갤러리
+from history_gallery import HistoryGallery
+from thumbnail_cache import ThumbnailCache
+# 미리보기 축소 작업자
+from preview_scaler import PreviewScaler
 
 # 클릭 가능한 피드백 라벨 클래스
 class FeedbackLabel(QLabel):
@@ -43,12 +52,11 @@ class FeedbackLabel(QLabel):
 # 클래스 정의 앞에 와야 함
 class FullScreenViewer(QWidget):
     """Displays an image in full screen mode using QPainter."""
-    def __init__(self, image_path: str, parent=None):
+    def __init__(self, image: QImage, parent=None):
         super().__init__(parent)
-        self.image_path = image_path
-        self.image = QImage(self.image_path)
+        self.image = image
         if self.image.isNull():
-             print(f"Error: Could not load image '{self.image_path}' for full screen.")
+             print("Error: Could not load image for full screen.")
         self.initUI()
 
     def initUI(self):
@@ -116,6 +124,9 @@ class CaptureUI(QMainWindow):
     captureFullScreenRequested = pyqtSignal()
     captureAreaRequested = pyqtSignal()
     captureWindowRequested = pyqtSignal()
+    captureBurstRequested = pyqtSignal()
+    # 편집기 저장 후 기록 색인 갱신 완료 (파일 경로, 작업자 스레드에서 emit)
+    historyUpdated = pyqtSignal(str)
 
     def __init__(self, capture_module):
         super().__init__()
@@ -124,11 +135,22 @@ class CaptureUI(QMainWindow):
         self.selection_start = QPoint()
         self.selection_end = QPoint()
         self.selection_rect = QRect()
-        self.last_capture_path = None
+        self.last_capture = None # 마지막 캡처 결과 (CaptureResult, 메모리에 보관)
         self.last_saved_file_path = None
+        self._last_capture_file = (None, None) # (CaptureResult, 저장 경로): 현재 캡처를 저장한 파일 (편집기 저장 반영 여부 판단)
         self.fullscreen_viewer = None 
+        self.history_gallery = None # 캡처 기록 갤러리 (처음 열 때 생성)
+        self.thumbnail_cache = None # 썸네일/미리보기 디스크 캐시 (설정 폴더의 thumbnails)
         # 창 상태 추적 변수 추가
         self._was_visible_before_capture = False 
+        # 영역 선택 중 표시할 정지 화면 (CaptureResult)
+        self._frozen_frame = None
+        # 진행 중인 버스트 캡처의 저장 완료 수 / 캡처 완료 여부
+        self._burst_saved = 0
+        self._burst_failed = 0
+        self._burst_done = False
+        # 마지막 전역 단축키 입력 시각 (HotkeyFilter가 설정, 프레임 버퍼 조회용)
+        self.hotkey_pressed_at = None
         # 단축키 ID 저장 변수 초기화
         self.hotkey_ids = {}
         
@@ -142,9 +164,25 @@ class CaptureUI(QMainWindow):
         # Create directory if it doesn't exist
         if not os.path.exists(self.default_save_dir):
             os.makedirs(self.default_save_dir)
+
+        # 썸네일 캐시는 갤러리를 열지 않아도 편집기 저장 시 무효화할 수 있도록 미리 생성
+        if self.capture_module.history is not None:
+            self.thumbnail_cache = ThumbnailCache(
+                os.path.join(self.config_manager.config_dir, "thumbnails"),
+                max_bytes=self.config_manager.get_setting("thumbnail_cache_mb", 256) * 1024 * 1024)
             
         # Initialize UI
         self.initUI()
+
+        # 미리보기 축소 (화면 크기의 프록시를 메모리에 두고 작업자 스레드에서 축소)
+        screen = QApplication.primaryScreen()
+        proxy_size = screen.size() * screen.devicePixelRatio() if screen else QSize(3840, 2160)
+        self.preview_scaler = PreviewScaler(proxy_size, self)
+        self.preview_scaler.scaled.connect(self._on_preview_scaled)
+        # 창 크기 조절 중 연속으로 들어오는 요청을 하나로 합침 (타이머를 다시 시작하면 마지막 요청만 실행)
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.timeout.connect(self.refresh_preview)
         
         # 단축키 설정
         # self.setup_shortcuts() # QShortcut 대신 전역 단축키 사용
@@ -156,6 +194,11 @@ class CaptureUI(QMainWindow):
         self.captureFullScreenRequested.connect(self.capture_full_screen)
         self.captureAreaRequested.connect(self.capture_area)
         self.captureWindowRequested.connect(self.capture_window)
+        self.captureBurstRequested.connect(self.capture_burst)
+        self.historyUpdated.connect(self.update_thumbnail)
+        # 백그라운드 저장 완료/실패 시그널 연결 (작업자 스레드 -> GUI 스레드로 큐잉됨)
+        self.capture_module.save_queue.saveFinished.connect(self.on_save_finished)
+        self.capture_module.save_queue.saveFailed.connect(self.on_save_failed)
 
     def setup_tray_icon(self):
         """시스템 트레이 아이콘 설정"""
@@ -209,7 +252,15 @@ class CaptureUI(QMainWindow):
                 print(f"[Exit] Unregistered hotkey: {key_name} (ID: {key_id})")
         except Exception as e:
             print(f"[Exit] Error unregistering hotkeys: {e}")
-        
+
+        # 썸네일/미리보기 작업자 정리
+        if self.history_gallery:
+            self.history_gallery.shutdown()
+        self.preview_scaler.stop()
+
+        # 캡처 세션 정리
+        self.capture_module.close()
+
         if self.tray_icon:
             self.tray_icon.hide()
         QApplication.quit()
@@ -370,6 +421,15 @@ class CaptureUI(QMainWindow):
 
         preview_header_layout.addStretch(1) # 공간 확장
 
+        # History 버튼 추가 (캡처 기록 갤러리, 기록 색인을 사용할 때만 표시)
+        self.history_btn = QPushButton('History')
+        self.history_btn.setFixedSize(80, 30)
+        self.history_btn.setToolTip('Browse and search saved captures')
+        self.history_btn.setStyleSheet("font-size: 8pt;")
+        self.history_btn.clicked.connect(self.show_history_gallery)
+        self.history_btn.setVisible(self.capture_module.history is not None)
+        preview_header_layout.addWidget(self.history_btn)
+
         # Copy 버튼 추가 (Edit 버튼 앞에)
         self.copy_btn = QPushButton('Copy')
         self.copy_btn.setFixedSize(80, 30)
@@ -379,6 +439,15 @@ class CaptureUI(QMainWindow):
         self.copy_btn.setEnabled(False) # 초기에는 비활성화
         preview_header_layout.addWidget(self.copy_btn)
 
+        # Earlier 버튼 추가 (프레임 버퍼에서 이전 프레임 선택)
+        self.earlier_btn = QPushButton('Earlier...')
+        self.earlier_btn.setFixedSize(80, 30)
+        self.earlier_btn.setToolTip('Pick an earlier frame from the frame buffer')
+        self.earlier_btn.setStyleSheet("font-size: 8pt;")
+        self.earlier_btn.clicked.connect(self.pick_earlier_frame)
+        self.earlier_btn.setVisible(self.capture_module.frame_sampler is not None) # 샘플러 사용 시에만 표시
+        preview_header_layout.addWidget(self.earlier_btn)
+
         # Edit 버튼 추가
         self.edit_btn = QPushButton('Edit')
         self.edit_btn.setFixedSize(80, 30) # 크기 설정 (임의)
@@ -626,10 +695,18 @@ class CaptureUI(QMainWindow):
         self._was_visible_before_capture = self.isVisible()
         print(f"[Capture Trigger] Window was visible before full screen capture: {self._was_visible_before_capture}")
         
-        # 트레이 상태일 때는 window_to_hide를 None으로 전달
-        window_to_hide = self if self._was_visible_before_capture else None
-        self.last_capture_path = self.capture_module.capture_full_screen(window_to_hide=window_to_hide)
-        print(f"[Capture Complete] Full screen capture attempted. Path: {self.last_capture_path}")
+        self.last_capture = None
+        # 트레이 상태에서는 프레임 버퍼의 키 입력 시점 프레임을 바로 사용 (창 숨김/대기 없음)
+        # 메인 창이 보이는 경우 버퍼 프레임에 메인 창이 찍혀 있으므로 기존 방식 사용
+        if not self._was_visible_before_capture:
+            keypress_time = self.hotkey_pressed_at or time.time()
+            self.hotkey_pressed_at = None
+            self.last_capture = self.capture_module.capture_full_screen_retroactive(keypress_time)
+        if not self.last_capture:
+            # 트레이 상태일 때는 window_to_hide를 None으로 전달
+            window_to_hide = self if self._was_visible_before_capture else None
+            self.last_capture = self.capture_module.capture_full_screen(window_to_hide=window_to_hide)
+        print(f"[Capture Complete] Full screen capture attempted. Success: {self.last_capture is not None}")
         
         # 캡처 후 창 상태 확인 및 처리
         if self._was_visible_before_capture: 
@@ -644,18 +721,17 @@ class CaptureUI(QMainWindow):
                 QTimer.singleShot(100, self._force_window_to_foreground)
             
             # 미리보기 업데이트 (지연 없이 바로 실행) -> 지연 추가
-            if self.last_capture_path:
-                # QTimer.singleShot(50, lambda p=self.last_capture_path: self.update_preview(p))
-                QTimer.singleShot(50, lambda: self.update_preview(self.last_capture_path))
+            if self.last_capture:
+                QTimer.singleShot(50, self.refresh_preview)
                 self.statusBar().showMessage('Full screen capture completed - Press Save button to save the image')
                 self.save_btn.setEnabled(True)
             else:
-                print("[Capture Complete] Capture failed (no path returned). Showing error message.")
+                print("[Capture Complete] Capture failed (no result returned). Showing error message.")
                 self.statusBar().showMessage('Full screen capture failed!')
                 self.save_btn.setEnabled(False)
         else: 
             print("[Capture Complete] Processing for tray capture...")
-            if self.last_capture_path: # 트레이 상태에서 캡처 성공
+            if self.last_capture: # 트레이 상태에서 캡처 성공
                 # --- 자동 저장 호출 제거 --- #
                 # print("[Tray Capture] Attempting auto-save for full screen...")
                 # self.save_image() 
@@ -668,7 +744,7 @@ class CaptureUI(QMainWindow):
                 QTimer.singleShot(100, self._force_window_to_foreground)
                 
                 # --- 미리보기 업데이트 (지연 포함) --- #
-                QTimer.singleShot(50, lambda: self.update_preview(self.last_capture_path))
+                QTimer.singleShot(50, self.refresh_preview)
                 
                 # --- 상태 표시줄 업데이트 및 버튼 활성화 --- #
                 self.statusBar().showMessage('Full screen capture completed - Press Save or Edit')
@@ -690,11 +766,20 @@ class CaptureUI(QMainWindow):
         self._was_visible_before_capture = self.isVisible()
         print(f"[Capture Trigger] Window was visible before area capture: {self._was_visible_before_capture}")
         
-        # AreaSelector 생성
-        self.area_selector = AreaSelector(self)
+        # 단축키 입력 순간의 화면을 정지 화면으로 캡처 (메인 창이 보이면 숨긴 뒤 캡처)
+        try:
+            self._frozen_frame = self.capture_module.grab_frozen_frame(
+                window_to_hide=self if self._was_visible_before_capture else None)
+        except Exception as e:
+            print(f"[Capture Trigger] Failed to grab frozen frame, falling back to live selection: {e}")
+            traceback.print_exc()
+            self._frozen_frame = None
+        
+        # AreaSelector 생성 (정지 화면을 배경으로 표시)
+        self.area_selector = AreaSelector(self, frozen_frame=self._frozen_frame)
         
         # 메인 창이 보이는 경우에만 숨김
-        if self._was_visible_before_capture:
+        if self._was_visible_before_capture and self.isVisible():
             print("[Capture Trigger] Hiding main window for area selection.")
             self.hide()
         
@@ -763,8 +848,8 @@ class CaptureUI(QMainWindow):
             
             # 트레이 상태 고려하여 window_to_hide 전달
             window_to_hide_capture = self if self._was_visible_before_capture else None
-            self.last_capture_path = self.capture_module.capture_window(window_to_hide=window_to_hide_capture, hwnd=hwnd)
-            print(f"[Capture Complete] Window capture attempted. Path: {self.last_capture_path}")
+            self.last_capture = self.capture_module.capture_window(window_to_hide=window_to_hide_capture, hwnd=hwnd)
+            print(f"[Capture Complete] Window capture attempted. Success: {self.last_capture is not None}")
             
             # 창 상태에 따라 처리 분기
             if self._was_visible_before_capture:
@@ -778,20 +863,19 @@ class CaptureUI(QMainWindow):
                     QTimer.singleShot(100, self._force_window_to_foreground)
                 
                 # 미리보기 업데이트 -> 지연 추가
-                if self.last_capture_path:
-                    # QTimer.singleShot(50, lambda p=self.last_capture_path: self.update_preview(p))
-                    QTimer.singleShot(50, lambda: self.update_preview(self.last_capture_path))
+                if self.last_capture:
+                    QTimer.singleShot(50, self.refresh_preview)
                     window_name = window_title if window_title else "Selected window"
                     self.statusBar().showMessage(f'Capture of window "{window_name}" completed - Press Save button to save the image')
                     self.save_btn.setEnabled(True)
                 else:
-                    print("[Capture Complete] Capture failed (no path returned). Showing error message.")
+                    print("[Capture Complete] Capture failed (no result returned). Showing error message.")
                     self.statusBar().showMessage(f'Capture of window "{window_title}" failed!')
                     self.save_btn.setEnabled(False)
 
             else: # 트레이 상태에서 캡처한 경우
                 print("[Capture Complete] Processing for tray capture...")
-                if self.last_capture_path:
+                if self.last_capture:
                     # --- 자동 저장 호출 제거 --- #
                     # print("[Tray Capture] Attempting auto-save for window capture...")
                     # self.save_image()
@@ -804,7 +888,7 @@ class CaptureUI(QMainWindow):
                     QTimer.singleShot(100, self._force_window_to_foreground)
 
                     # --- 미리보기 업데이트 (지연 포함) --- #
-                    QTimer.singleShot(50, lambda: self.update_preview(self.last_capture_path))
+                    QTimer.singleShot(50, self.refresh_preview)
 
                     # --- 상태 표시줄 업데이트 및 버튼 활성화 --- #
                     # window_title 변수가 이 범위에서 사용 가능하도록 확인 또는 수정 필요
@@ -839,6 +923,10 @@ class CaptureUI(QMainWindow):
         print(f"[Capture Process] Area selection processed. Rect: {rect}") # 로그 추가
         print(f"[Capture Process] Main window was visible before capture: {self._was_visible_before_capture}")
 
+        # 정지 화면은 이번 선택에서만 사용하고 해제
+        frozen_frame = self._frozen_frame
+        self._frozen_frame = None
+
         # 유효하지 않은 선택 영역인 경우 처리
         if rect.width() <= 5 or rect.height() <= 5:
             self.statusBar().showMessage('Area selection too small or canceled.')
@@ -848,11 +936,16 @@ class CaptureUI(QMainWindow):
             return
             
         print(f"[Capture Process] Attempting area capture for Rect: {rect}")
-        # 트레이 상태 고려하여 window_to_hide 전달
-        window_to_hide_capture = self if self._was_visible_before_capture else None
-        self.last_capture_path = self.capture_module.capture_area(
-            rect.x(), rect.y(), rect.width(), rect.height(), window_to_hide=window_to_hide_capture)
-        print(f"[Capture Complete] Area capture attempted. Path: {self.last_capture_path}")
+        if frozen_frame is not None:
+            # 정지 화면에서 바로 잘라냄 (창 숨김/대기/재캡처 없음, 사용자가 본 화면과 동일)
+            self.last_capture = self.capture_module.capture_area_from_frame(
+                frozen_frame, rect.x(), rect.y(), rect.width(), rect.height())
+        else:
+            # 트레이 상태 고려하여 window_to_hide 전달
+            window_to_hide_capture = self if self._was_visible_before_capture else None
+            self.last_capture = self.capture_module.capture_area(
+                rect.x(), rect.y(), rect.width(), rect.height(), window_to_hide=window_to_hide_capture)
+        print(f"[Capture Complete] Area capture attempted. Success: {self.last_capture is not None}")
         
         # 창 상태에 따라 처리 분기
         if self._was_visible_before_capture:
@@ -866,18 +959,17 @@ class CaptureUI(QMainWindow):
                 QTimer.singleShot(100, self._force_window_to_foreground)
                 
             # 미리보기 업데이트 -> 지연 추가
-            if self.last_capture_path:
-                # QTimer.singleShot(50, lambda p=self.last_capture_path: self.update_preview(p))
-                QTimer.singleShot(50, lambda: self.update_preview(self.last_capture_path))
+            if self.last_capture:
+                QTimer.singleShot(50, self.refresh_preview)
                 self.statusBar().showMessage('Area capture completed - Press Save button to save the image')
                 self.save_btn.setEnabled(True)
             else:
-                print("[Capture Complete] Capture failed (no path returned). Showing error message.")
+                print("[Capture Complete] Capture failed (no result returned). Showing error message.")
                 self.statusBar().showMessage('Area capture failed!')
                 self.save_btn.setEnabled(False)
         else: # 트레이 상태에서 캡처한 경우
              print("[Capture Complete] Processing for tray capture...")
-             if self.last_capture_path:
+             if self.last_capture:
                  # --- 자동 저장 호출 제거 --- #
                  # print("[Tray Capture] Attempting auto-save for area capture...")
                  # self.save_image()
@@ -890,7 +982,7 @@ class CaptureUI(QMainWindow):
                  QTimer.singleShot(100, self._force_window_to_foreground)
 
                  # --- 미리보기 업데이트 (지연 포함) --- #
-                 QTimer.singleShot(50, lambda: self.update_preview(self.last_capture_path))
+                 QTimer.singleShot(50, self.refresh_preview)
 
                  # --- 상태 표시줄 업데이트 및 버튼 활성화 --- #
                  self.statusBar().showMessage('Area capture completed - Press Save or Edit')
@@ -903,58 +995,41 @@ class CaptureUI(QMainWindow):
                  print(f"[Tray Capture] Area capture failed.")
                  # 실패 시 메인 창을 띄울 필요는 없음
 
-    def update_preview(self, image_path):
+    def refresh_preview(self):
+        """마지막 캡처 결과로 미리보기를 다시 그립니다."""
+        if self.last_capture:
+            self.update_preview(self.last_capture.to_qimage())
+
+    def update_preview(self, image):
         """Update captured image preview"""
-        print(f"[Update Preview] Called with path: {image_path}") # 로그 추가
-        if os.path.exists(image_path):
-            # 이미지 로드
-            pixmap = QPixmap(image_path)
-            
-            if pixmap.isNull():
-                print("[Update Preview Error] Failed to load QPixmap.") # 로그 추가
-                self.preview_label.setText('Cannot load image')
-                self.preview_label.setStyleSheet("#previewLabel { color: #888888; font-size: 8pt; background-color: white; }") 
-                self.edit_btn.setEnabled(False)
-                self.fullscreen_placeholder_btn.setEnabled(False)
-                self.copy_btn.setEnabled(False) # 복사 버튼 비활성화
-                return
-            
-            print("[Update Preview] QPixmap loaded successfully.") # 로그 추가
-            # 레이블 최대 크기 가져오기
+        print("[Update Preview] Called with in-memory image.") # 로그 추가
+        if image is not None and not image.isNull():
+            # 원본이 바뀐 경우에만 프록시를 다시 만들고, 축소는 작업자 스레드에서 수행 (완료 시 _on_preview_scaled)
+            self.preview_scaler.set_source(image)
             label_size = self.preview_label.size()
             print(f"[Update Preview] Preview label size: {label_size.width()}x{label_size.height()}") # 로그 추가
-            
-            # 레이블 크기에 맞게 이미지 스케일링 (꽉 차게 표시)
-            scaled_pixmap = pixmap.scaled(
-                label_size.width(),
-                label_size.height(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            print(f"[Update Preview] Scaled pixmap size: {scaled_pixmap.width()}x{scaled_pixmap.height()}") # 로그 추가
-            
-            # 스케일링된 이미지 설정
-            self.preview_label.setPixmap(scaled_pixmap)
-            self.preview_label.setStyleSheet("#previewLabel { background-color: black; }") 
-            print("[Update Preview] Pixmap set on label.") # 로그 추가
+            self.preview_scaler.request(label_size)
             
             # Edit 버튼 활성화
             self.edit_btn.setEnabled(True)
             self.fullscreen_placeholder_btn.setEnabled(True)
             self.copy_btn.setEnabled(True) # 복사 버튼 활성화
-            
-            # 콘솔에 디버깅 정보 출력 -> 로그로 대체
-            # print(f"원본 이미지 크기: {pixmap.width()}x{pixmap.height()}, "
-            #       f"레이블 크기: {label_size.width()}x{label_size.height()}, "
-            #       f"스케일링된 이미지 크기: {scaled_pixmap.width()}x{scaled_pixmap.height()}")
         else:
-            print(f"[Update Preview Error] Image path does not exist: {image_path}") # 로그 추가
+            print("[Update Preview Error] No image to display.") # 로그 추가
             self.preview_label.setText('Cannot load image')
             self.preview_label.setStyleSheet("#previewLabel { color: #888888; font-size: 8pt; background-color: white; }") 
             self.edit_btn.setEnabled(False)
             self.fullscreen_placeholder_btn.setEnabled(False)
             self.copy_btn.setEnabled(False) # 복사 버튼 비활성화
 
+    def _on_preview_scaled(self, generation, scaled_image):
+        """작업자 스레드에서 축소가 끝난 미리보기 표시 (작은 이미지만 QPixmap으로 변환)"""
+        if generation != self.preview_scaler.generation:
+            return # 그 사이 새 캡처로 바뀐 경우
+        self.preview_label.setPixmap(QPixmap.fromImage(scaled_image))
+        self.preview_label.setStyleSheet("#previewLabel { background-color: black; }") 
+        print(f"[Update Preview] Scaled preview set: {scaled_image.width()}x{scaled_image.height()}") # 로그 추가
+
     def set_save_path(self):
         """Set save path"""
         dir_path = QFileDialog.getExistingDirectory(
@@ -976,114 +1051,155 @@ class CaptureUI(QMainWindow):
     def save_image(self):
         """Save captured image"""
         print("[Save Image Triggered]") # 함수 시작 로그 추가
-        # Check if capture_module has the captured_image attribute and it's not None
-        if not hasattr(self.capture_module, 'captured_image') or self.capture_module.captured_image is None:
+        # 메모리에 보관된 캡처 결과 확인
+        if self.capture_module.last_capture is None:
             print("[Save Image Error] No captured image data found in capture_module.") # 로그 추가
-            # Try loading from last_capture_path as a fallback
-            if self.last_capture_path and os.path.exists(self.last_capture_path):
-                print("[Save Image Fallback] Trying to load image from last_capture_path:", self.last_capture_path)
-                try:
-                    # Load QImage, convert to PIL, and set it in capture_module
-                    q_img = QImage(self.last_capture_path)
-                    if not q_img.isNull():
-                        pil_img = qimage_to_pil(q_img)
-                        self.capture_module.captured_image = pil_img # 여기서 다시 설정
-                        print("[Save Image Fallback] Successfully loaded image from path and updated capture_module.")
-                    else:
-                        print("[Save Image Fallback Error] Failed to load QImage from path.")
-                        # 트레이 모드에서는 QMessageBox 사용 부적절 -> 로그만 남김
-                        # QMessageBox.warning(self, "Save Error", "Could not load the captured image data to save.")
-                        return # 저장 실패
-                except Exception as e:
-                     print(f"[Save Image Fallback Error] Exception loading image from path: {e}")
-                     # 트레이 모드에서는 QMessageBox 사용 부적절 -> 로그만 남김
-                     # QMessageBox.warning(self, "Save Error", f"Error loading captured image: {e}")
-                     return # 저장 실패
-            else:
-                print("[Save Image Error] No valid last_capture_path found either.")
-                # 트레이 모드에서는 QMessageBox 사용 부적절 -> 로그만 남김
-                # QMessageBox.warning(self, "Save Error", "There is no captured image to save.")
-                return # 저장 실패
-
-        # Fallback 후에도 capture_module.captured_image가 없는 경우 재확인
-        if not hasattr(self.capture_module, 'captured_image') or self.capture_module.captured_image is None:
-             print("[Save Image Error] Image data still missing after fallback attempt.")
-             return # 최종 저장 실패
+            # 트레이 모드에서는 QMessageBox 사용 부적절 -> 로그만 남김
+            return # 저장 실패
 
-        # Now we should have self.capture_module.captured_image available
         print("[Save Image] Found captured image data in capture_module.")
 
-        # Auto-generate filename (based on current date and time)
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"screenshot_{timestamp}.png"
-        
-        # Create save path
-        file_path = os.path.join(self.default_save_dir, filename)
+        # Auto-generate filename (캡처 시각 + 밀리초, 같은 이름이 있으면 번호를 붙여 덮어쓰기 방지)
+        file_path = self.capture_module.generate_save_path(
+            self.capture_module.last_capture, directory=self.default_save_dir)
         print(f"[Save Image] Generated save path: {file_path}")
         
-        try:
-            # 캡처 모듈의 저장 함수 호출
-            print("[Save Image] Calling capture_module.save_captured_image...") # 호출 전 로그
-            saved_path = self.capture_module.save_captured_image(file_path)
-            if saved_path:
-                self.last_saved_file_path = saved_path # 저장된 경로 저장
-                print(f"[Save Image Success] Image saved: {saved_path}") # Log success
-                # 상태 표시줄 메시지는 창이 보일 때만
-                if self.isVisible():
-                    self.statusBar().showMessage(f'Image saved: {saved_path}', 3000)
-                
-                # 트레이 알림 (저장 성공 시)
-                if self.tray_icon and not self.isVisible(): # 트레이 모드에서만 알림
-                     self.tray_icon.showMessage(
-                         "ImageCapturePAAK",
-                         f"Image saved: {os.path.basename(saved_path)}",
-                         QSystemTrayIcon.Information,
-                         2000
-                     )
-
-                # Capture module의 이미지 데이터도 업데이트 (Optional but good practice)
-                try:
-                    q_image = QImage(saved_path)
-                    if not q_image.isNull():
-                        pil_image = qimage_to_pil(q_image)
-                        self.capture_module.captured_image = pil_image # 저장 후에도 최신 데이터 유지
-                        print("[GUI] Capture module's internal image updated after save.")
-                    else:
-                        print("[GUI Error] Failed to load saved image into QImage for capture module update.")
-                except Exception as e:
-                    print(f"[GUI Error] Error updating capture module image after save: {e}")
-            else:
-                print("[Save Image Error] capture_module.save_captured_image returned None.")
-                # 트레이 모드에서는 QMessageBox 사용 부적절
-                # QMessageBox.warning(self, "Save Error", "Failed to save image.")
-                # 트레이 알림 (저장 실패 시)
-                if self.tray_icon and not self.isVisible():
-                     self.tray_icon.showMessage(
-                         "ImageCapturePAAK",
-                         "Failed to save image!",
-                         QSystemTrayIcon.Warning,
-                         2000
-                     )
-        except Exception as e:
-            print(f"[Save Image Error] Exception during saving: {e}") # Log exception
-            traceback.print_exc() # Print full traceback
-            # 트레이 모드에서는 QMessageBox 사용 부적절
-            # QMessageBox.critical(self, "Save Error", f"An error occurred while saving the file: {str(e)}")
-            # 트레이 알림 (저장 오류 시)
+        # 캡처 모듈의 비동기 저장 함수 호출 (인코딩/쓰기는 작업자 스레드에서 수행, 즉시 반환)
+        print("[Save Image] Queuing save via capture_module.save_captured_image_async...") # 호출 전 로그
+        queued_path = self.capture_module.save_captured_image_async(file_path)
+        if queued_path:
+            self._last_capture_file = (self.capture_module.last_capture, queued_path)
+            if self.isVisible():
+                self.statusBar().showMessage(f'Saving image: {queued_path}', 3000)
+        else:
+            print("[Save Image Error] Save queue is full, save request rejected.")
+            if self.isVisible():
+                self.statusBar().showMessage('Save queue is full - please try again', 3000)
+            # 트레이 알림 (대기열 초과 시)
             if self.tray_icon and not self.isVisible():
                  self.tray_icon.showMessage(
                      "ImageCapturePAAK",
-                     f"Error saving image: {e}",
-                     QSystemTrayIcon.Critical,
-                     3000
+                     "Failed to save image! (save queue is full)",
+                     QSystemTrayIcon.Warning,
+                     2000
                  )
 
+    def on_save_finished(self, saved_path):
+        """백그라운드 저장 완료 시 호출될 슬롯"""
+        self.last_saved_file_path = saved_path # 저장된 경로 저장
+        print(f"[Save Image Success] Image saved: {saved_path}") # Log success
+        # 버스트 프레임은 장마다 알리지 않고 모두 저장된 뒤 한 번만 알림
+        burst = self.capture_module.burst
+        if burst is not None and saved_path in burst.paths:
+            self._burst_saved += 1
+            self._check_burst_saved()
+            return
+        self.update_thumbnail(saved_path)
+        # 상태 표시줄 메시지는 창이 보일 때만
+        if self.isVisible():
+            self.statusBar().showMessage(f'Image saved: {saved_path}', 3000)
+        
+        # 트레이 알림 (저장 성공 시)
+        if self.tray_icon and not self.isVisible(): # 트레이 모드에서만 알림
+             self.tray_icon.showMessage(
+                 "ImageCapturePAAK",
+                 f"Image saved: {os.path.basename(saved_path)}",
+                 QSystemTrayIcon.Information,
+                 2000
+             )
+
+    def capture_burst(self):
+        """버스트 캡처 시작 (설정된 장수/간격으로 연속 캡처, 저장은 백그라운드)"""
+        print("[Capture Trigger] Burst capture requested.")
+        self._was_visible_before_capture = self.isVisible()
+        if self._was_visible_before_capture:
+            # 메인 창이 찍히지 않도록 숨긴 뒤 시작
+            self.hide()
+            self.capture_module.readiness.wait_hidden(int(self.winId()))
+        self._burst_saved = 0
+        self._burst_failed = 0
+        self._burst_done = False
+        burst = self.capture_module.start_burst()
+        if burst is None:
+            if self._was_visible_before_capture:
+                self.show()
+            return
+        burst.finished.connect(self.on_burst_finished)
+        burst.failed.connect(self.on_burst_failed)
+        if self.tray_icon and not self._was_visible_before_capture:
+            self.tray_icon.setToolTip('ImageCapturePAAK - Burst capture in progress')
+
+    def on_burst_finished(self, last_frame, paths):
+        """버스트 캡처 완료 시 호출될 슬롯 (마지막 프레임을 미리보기로 표시)"""
+        print(f"[Burst] Captured {len(paths)} frames, saving in background.")
+        self._burst_done = True
+        if self.tray_icon:
+            self.tray_icon.setToolTip('ImageCapturePAAK')
+        if last_frame is not None:
+            self.last_capture = self.capture_module.last_capture = last_frame
+            self._last_capture_file = (last_frame, paths[-1] if paths else None)
+            self.save_btn.setEnabled(True)
+        if self._was_visible_before_capture:
+            self.show()
+            self.activateWindow()
+            self.raise_()
+            if last_frame is not None:
+                QTimer.singleShot(50, self.refresh_preview)
+            self.statusBar().showMessage(f'Burst capture completed - {len(paths)} frames, saving...')
+        self._check_burst_saved()
+
+    def on_burst_failed(self, error):
+        """버스트 캡처 실패 시 호출될 슬롯"""
+        print(f"[Burst] Burst capture failed: {error}")
+        if self.tray_icon:
+            self.tray_icon.setToolTip('ImageCapturePAAK')
+        if self._was_visible_before_capture:
+            self.show()
+            self.statusBar().showMessage(f'Burst capture failed: {error}')
+
+    def _check_burst_saved(self):
+        """버스트 캡처가 끝났고 모든 프레임의 저장이 끝났으면(성공 또는 실패) 한 번 알림"""
+        burst = self.capture_module.burst
+        if burst is None or not self._burst_done or self._burst_saved + self._burst_failed < len(burst.paths):
+            return
+        message = f"Burst saved: {self._burst_saved} images"
+        if self._burst_failed:
+            message += f", {self._burst_failed} failed"
+        print(f"[Burst] {message}")
+        if self._burst_saved:
+            self.update_thumbnail(self.last_saved_file_path)
+        if self.isVisible():
+            self.statusBar().showMessage(message, 3000)
+        elif self.tray_icon:
+            self.tray_icon.showMessage("ImageCapturePAAK", message, QSystemTrayIcon.Information, 2000)
+        self.capture_module.burst = None
+
+    def on_save_failed(self, file_path, error):
+        """백그라운드 저장 실패 시 호출될 슬롯"""
+        print(f"[Save Image Error] Failed to save {file_path}: {error}") # Log exception
+        # 버스트 프레임 실패는 장마다 알리지 않고 완료 집계에 포함 (완료 알림에 실패 수 표시)
+        burst = self.capture_module.burst
+        if burst is not None and file_path in burst.paths:
+            self._burst_failed += 1
+            self._check_burst_saved()
+            return
+        if self.isVisible():
+            self.statusBar().showMessage(f'Failed to save image: {error}', 3000)
+        # 트레이 알림 (저장 오류 시)
+        if self.tray_icon and not self.isVisible():
+             self.tray_icon.showMessage(
+                 "ImageCapturePAAK",
+                 f"Error saving image: {error}",
+                 QSystemTrayIcon.Critical,
+                 3000
+             )
+
     def resizeEvent(self, event):
         """Update preview when window size changes"""
         # 창 크기가 변경되면 약간의 지연 후 프리뷰 업데이트
-        if hasattr(self, 'last_capture_path') and self.last_capture_path and os.path.exists(self.last_capture_path):
-            # QTimer를 사용하여 약간의 지연 후 업데이트 (레이아웃이 정착한 후)
-            QTimer.singleShot(100, lambda: self.update_preview(self.last_capture_path))
+        if getattr(self, 'last_capture', None):
+            # 크기 조절 중에는 타이머를 다시 시작해 멈춘 뒤 한 번만 축소 (레이아웃이 정착한 후)
+            self._preview_timer.start(100)
         
         # 부모 클래스의 resizeEvent 호출
         super().resizeEvent(event)
@@ -1092,9 +1208,9 @@ class CaptureUI(QMainWindow):
         """창 상태가 변경될 때 호출되는 이벤트 핸들러"""
         if event.type() == QEvent.WindowStateChange:
             # 창이 최대화되거나 복원될 때 프리뷰 업데이트
-            if hasattr(self, 'last_capture_path') and self.last_capture_path and os.path.exists(self.last_capture_path):
-                # 약간의 지연 후 업데이트 (창 상태 변경이 완료된 후)
-                QTimer.singleShot(300, lambda: self.update_preview(self.last_capture_path))
+            if getattr(self, 'last_capture', None):
+                # 약간의 지연 후 업데이트 (창 상태 변경이 완료된 후, 대기 중인 크기 조절 요청과 합침)
+                self._preview_timer.start(300)
         
         # 부모 클래스의 이벤트 핸들러 호출
         super().changeEvent(event)
@@ -1140,9 +1256,9 @@ class CaptureUI(QMainWindow):
             # 여기서 별도 처리는 불필요할 수 있음
             return 
             
-        if self.last_capture_path and os.path.exists(self.last_capture_path):
-            pixmap = QPixmap(self.last_capture_path)
-            if pixmap.isNull():
+        if self.last_capture:
+            image = self.last_capture.to_qimage()
+            if image.isNull():
                 self.statusBar().showMessage('Cannot load image for full screen preview.')
                 return
 
@@ -1152,7 +1268,7 @@ class CaptureUI(QMainWindow):
                 self.fullscreen_viewer.close()
                 self.fullscreen_viewer = None
             
-            self.fullscreen_viewer = FullScreenViewer(self.last_capture_path)
+            self.fullscreen_viewer = FullScreenViewer(image)
             # self.fullscreen_viewer.showFullScreen() # initUI에서 setGeometry 사용하므로 show() 호출
             self.fullscreen_viewer.show()
         else:
@@ -1160,12 +1276,12 @@ class CaptureUI(QMainWindow):
 
     def open_image_editor(self):
         """이미지 편집기 열기 (수정: edit_image 메서드 호출)"""
-        if not self.last_capture_path:
+        if not self.last_capture:
             QMessageBox.warning(self, "Error", "No image captured to edit!")
             return
             
-        # self.edit_image 메서드를 호출하여 편집기 열기 및 숨기기 로직 실행
-        self.edit_image(self.last_capture_path)
+        # self.edit_image 메서드를 호출하여 편집기 열기 및 숨기기 로직 실행 (메모리의 이미지 전달)
+        self.edit_image(image=self.last_capture.to_qimage())
         
         # 아래 코드는 edit_image 메서드로 이동되었으므로 주석 처리 또는 삭제
         # self.image_editor = ImageEditor(self.last_capture_path, self)
@@ -1177,17 +1293,17 @@ class CaptureUI(QMainWindow):
 
     def copy_image_to_clipboard(self):
         """현재 미리보기 이미지를 클립보드에 복사합니다."""
-        if self.last_capture_path and os.path.exists(self.last_capture_path):
+        if self.last_capture:
             try:
-                pixmap = QPixmap(self.last_capture_path)
-                if pixmap.isNull():
+                image = self.last_capture.to_qimage()
+                if image.isNull():
                     self.statusBar().showMessage('Failed to load image for copying', 3000)
                     return
                 
                 clipboard = QApplication.clipboard()
-                clipboard.setImage(pixmap.toImage()) # QPixmap을 QImage로 변환하여 복사
+                clipboard.setImage(image) # 메모리의 QImage를 바로 복사
                 self.statusBar().showMessage('Image copied to clipboard', 3000)
-                print(f"[Clipboard] Image copied from {self.last_capture_path}")
+                print("[Clipboard] Image copied from last capture")
 
             except Exception as e:
                 self.statusBar().showMessage(f'Error copying image: {e}', 3000)
@@ -1196,40 +1312,87 @@ class CaptureUI(QMainWindow):
             self.statusBar().showMessage('No image to copy', 3000)
 
     def handle_image_saved(self, saved_path):
-        """ImageEditor에서 이미지 저장 시 호출될 슬롯"""
+        """ImageEditor에서 이미지를 파일로 저장했을 때 호출될 슬롯"""
         print(f"[GUI] Received imageSaved signal for: {saved_path}")
-        self.last_capture_path = saved_path # 마지막 캡처 경로 업데이트
-        self.last_saved_file_path = saved_path # 마지막 저장 경로도 업데이트 (동일하게 취급)
-        self.update_preview(saved_path) # 프리뷰 업데이트
+        self.last_saved_file_path = saved_path # 마지막 저장 경로 업데이트
+        self._invalidate_history_entry(saved_path)
+        # 갤러리에서 연 다른 파일이면 캐시/갤러리만 갱신 (현재 캡처를 그 파일 픽셀과 이전 메타데이터로 바꾸지 않음)
+        if not self._is_current_capture_file(saved_path):
+            print("[GUI] Saved file is not the current capture, preview unchanged.")
+            return
+        q_image = QImage(saved_path)
+        if q_image.isNull():
+            print("[GUI] Failed to load saved image into QImage for capture update.")
+            return
+        self.handle_image_edited(q_image)
+        self._last_capture_file = (self.capture_module.last_capture, saved_path)
+
+    def _is_current_capture_file(self, path):
+        """path가 현재 캡처(last_capture)를 저장한 파일인지 확인"""
+        capture, capture_path = self._last_capture_file
+        if capture is None or capture is not self.capture_module.last_capture or not capture_path:
+            return False
+        return os.path.normcase(os.path.abspath(capture_path)) == os.path.normcase(os.path.abspath(path))
+
+    def _invalidate_history_entry(self, saved_path):
+        """
+        편집기가 덮어쓴 파일의 캐시된 썸네일/미리보기를 무효화하고 기록 색인을 갱신
+        새 픽셀 해시 계산(전체 디코드)은 GUI 스레드를 막지 않도록 작업자 스레드에서 수행합니다.
+        """
+        history = self.capture_module.history
+        if history is None:
+            return
+        entry = history.get(saved_path)
+        if entry and entry["content_hash"]:
+            self.thumbnail_cache.invalidate(entry["content_hash"])
+            if self.history_gallery:
+                self.history_gallery.invalidate(entry["content_hash"])
+
+        def record():
+            try:
+                history.record_file(saved_path)
+                self.historyUpdated.emit(saved_path)
+            except Exception as e:
+                print(f"[History] Failed to update {saved_path}: {e}")
+                traceback.print_exc()
+
+        threading.Thread(target=record, name="HistoryUpdate", daemon=True).start()
+
+    def handle_image_edited(self, edited_image):
+        """ImageEditor에서 편집이 완료되었을 때 호출될 슬롯 (메모리의 QImage 전달)"""
+        print(f"[GUI] Received edited image: {edited_image.width()}x{edited_image.height()}")
+        # 기존 캡처의 메타데이터는 유지하고 이미지만 교체
+        if self.last_capture:
+            self.last_capture = self.last_capture.with_qimage(edited_image)
+        else:
+            self.last_capture = CaptureResult.from_qimage(edited_image)
+        self.capture_module.last_capture = self.last_capture
+        self.refresh_preview() # 프리뷰 업데이트
+        self.save_btn.setEnabled(True)
         # 혹시 전체 화면 뷰어가 열려 있다면 업데이트
         if self.fullscreen_viewer and self.fullscreen_viewer.isVisible():
-             self.fullscreen_viewer.image = QImage(saved_path)
+             self.fullscreen_viewer.image = self.last_capture.to_qimage()
              self.fullscreen_viewer.update() # 다시 그리도록 요청
-             
-        # Capture module의 이미지 데이터도 업데이트
-        try:
-            q_image = QImage(saved_path)
-            if not q_image.isNull():
-                pil_image = qimage_to_pil(q_image)
-                self.capture_module.captured_image = pil_image
-                print("[GUI] Capture module's internal image updated.")
-            else:
-                print("[GUI] Failed to load saved image into QImage for capture module update.")
-        except Exception as e:
-            print(f"[GUI] Error updating capture module image: {e}")
 
     # --- edit_image 메서드 추가 ---
-    def edit_image(self, image_path):
-        """선택된 이미지를 편집기에 엽니다."""
-        print(f"[GUI DEBUG] edit_image called with path: {image_path}")
-        if image_path:
+    def edit_image(self, image_path=None, image=None):
+        """
+        선택된 이미지를 편집기에 엽니다.
+        :param image_path: 편집할 이미지 파일 경로 (저장 시 해당 파일에 덮어씀)
+        :param image: 편집할 메모리 이미지 (QImage, 저장 시 imageEdited 시그널로 반환)
+        """
+        print(f"[GUI DEBUG] edit_image called with path: {image_path}, in-memory image: {image is not None}")
+        if image_path or image is not None:
             try:
                 # ImageEditor 인스턴스 생성 (parent=None)
-                self.editor = ImageEditor(image_path, parent=None)
+                self.editor = ImageEditor(image_path, parent=None, image=image,
+                                          undo_budget_mb=self.config_manager.get_setting("undo_budget_mb", 256))
                 # 편집기가 닫힐 때 메인 창을 다시 표시하도록 closed 시그널 연결
                 self.editor.closed.connect(self.show)
                 # 편집기에서 이미지가 저장될 때 handle_image_saved 슬롯 호출하도록 연결
                 self.editor.imageSaved.connect(self.handle_image_saved)
+                # 메모리 이미지 편집이 완료될 때 handle_image_edited 슬롯 호출하도록 연결
+                self.editor.imageEdited.connect(self.handle_image_edited)
                 
                 # 편집기 창을 먼저 표시
                 self.editor.show()
@@ -1243,14 +1406,41 @@ class CaptureUI(QMainWindow):
                 self.show()
                 QMessageBox.warning(self, "Editor Error", f"Failed to open image editor: {e}")
         else:
-            print("[GUI Warning] No image path provided to edit_image")
+            print("[GUI Warning] No image provided to edit_image")
 
-    # --- update_thumbnail 메서드 추가 (기능은 추후 구현) ---
     def update_thumbnail(self, image_path):
-        """캡처 완료 후 썸네일을 업데이트합니다 (현재는 비어 있음)."""
+        """저장 완료 후 캡처 기록 갤러리를 갱신합니다 (갤러리가 열려 있을 때만, 닫혀 있으면 다음에 열 때 갱신)."""
         print(f"[GUI DEBUG] update_thumbnail called with path: {image_path}") # 로그 메시지 수정
-        # TODO: 썸네일 업데이트 로직 구현 (필요시)
-        pass
+        if self.history_gallery and self.history_gallery.isVisible():
+            self.history_gallery.refresh()
+
+    def show_history_gallery(self):
+        """캡처 기록 갤러리 창 표시 (처음 열 때 생성)"""
+        history = self.capture_module.history
+        if history is None:
+            return
+        if self.history_gallery is None:
+            self.history_gallery = HistoryGallery(history, self.thumbnail_cache)
+            # 더블클릭한 캡처를 편집기로 열기
+            self.history_gallery.captureActivated.connect(lambda path: self.edit_image(image_path=path))
+        else:
+            self.history_gallery.refresh()
+        self.history_gallery.show()
+        self.history_gallery.activateWindow()
+        self.history_gallery.raise_()
+
+    def pick_earlier_frame(self):
+        """프레임 버퍼에서 이전 프레임을 골라 캡처 결과로 사용"""
+        frames = self.capture_module.get_buffered_frames()
+        if not frames:
+            self.statusBar().showMessage('No buffered frames available', 3000)
+            return
+        dialog = FramePickerDialog(frames, current=self.last_capture, parent=self)
+        if dialog.exec_() == QDialog.Accepted and dialog.selected_frame is not None:
+            self.last_capture = self.capture_module.last_capture = dialog.selected_frame
+            self.refresh_preview()
+            self.save_btn.setEnabled(True)
+            self.statusBar().showMessage('Earlier frame selected - Press Save or Edit', 3000)
 
     # 단축키 ID 설정 메소드 추가
     def set_hotkey_ids(self, ids):
@@ -1258,6 +1448,55 @@ class CaptureUI(QMainWindow):
         self.hotkey_ids = ids
         print(f"[Hotkey] Received hotkey IDs: {self.hotkey_ids}")
 
+class FramePickerDialog(QDialog):
+    """프레임 버퍼에 보관된 프레임 중 하나를 고르는 대화상자"""
+    def __init__(self, frames, current=None, parent=None):
+        """
+        :param frames: CaptureResult 리스트 (오래된 순서)
+        :param current: 처음 선택할 프레임 (없으면 가장 최근 프레임)
+        """
+        super().__init__(parent)
+        self.frames = frames
+        self.selected_frame = None
+        self.setWindowTitle('Pick Frame')
+        self.resize(720, 480)
+
+        layout = QVBoxLayout(self)
+        self.image_label = QLabel()
+        self.image_label.setAlignment(Qt.AlignCenter)
+        self.image_label.setMinimumSize(640, 360)
+        self.image_label.setStyleSheet("background-color: black;")
+        layout.addWidget(self.image_label, 1)
+
+        self.time_label = QLabel()
+        self.time_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.time_label)
+
+        self.slider = QSlider(Qt.Horizontal)
+        self.slider.setRange(0, len(frames) - 1)
+        self.slider.valueChanged.connect(self.show_frame)
+        layout.addWidget(self.slider)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        index = frames.index(current) if current in frames else len(frames) - 1
+        self.slider.setValue(index)
+        self.show_frame(index)
+
+    def show_frame(self, index):
+        """슬라이더 위치의 프레임 표시"""
+        frame = self.frames[index]
+        self.selected_frame = frame
+        pixmap = QPixmap.fromImage(frame.to_qimage()).scaled(
+            self.image_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.image_label.setPixmap(pixmap)
+        age = self.frames[-1].timestamp - frame.timestamp
+        self.time_label.setText(f"{index + 1} / {len(self.frames)}  ({age:.2f} s before latest)")
+
+
 class WindowSelector(QWidget):
     """마우스 호버로 캡처할 창을 선택하는 위젯"""
     def __init__(self, parent=None):
@@ -1330,7 +1569,8 @@ class WindowSelector(QWidget):
         # 전체 화면 크기로 설정
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setGeometry(QApplication.primaryScreen().geometry())
+        # 모든 모니터를 덮도록 가상 데스크톱 크기로 설정
+        self.setGeometry(virtual_desktop_geometry())
         self.setCursor(Qt.CrossCursor)
         
         # 안내 텍스트 표시
@@ -1346,11 +1586,11 @@ class WindowSelector(QWidget):
         self.info_label.setAlignment(Qt.AlignCenter)
         self.info_label.setFixedWidth(300)  # 너비 수정: 600 -> 300
         
-        # 화면 하단에 표시
-        rect = self.geometry()
+        # 주 화면 하단에 표시 (위젯 좌표 기준)
+        rect = QApplication.primaryScreen().geometry().translated(-self.geometry().topLeft())
         self.info_label.move(
-            (rect.width() - self.info_label.width()) // 2,
-            rect.height() - self.info_label.height() - 60
+            rect.x() + (rect.width() - self.info_label.width()) // 2,
+            rect.y() + rect.height() - self.info_label.height() - 60
         )
         
     def find_window_at_position(self, pos):
@@ -1381,22 +1621,8 @@ class WindowSelector(QWidget):
             logical_cursor_pos = QCursor.pos()
             logging.debug(f"[WindowSelector] Checking mouse. Logical pos: {logical_cursor_pos.x()},{logical_cursor_pos.y()}") # 로그 추가
             
-            # 현재 화면의 devicePixelRatio 가져오기
-            screen = QApplication.screenAt(logical_cursor_pos) # 마우스 커서가 있는 화면
-            if not screen:
-                screen = QApplication.primaryScreen() # 실패 시 주 화면 사용
-            
-            if screen:
-                device_pixel_ratio = screen.devicePixelRatio()
-            else:
-                device_pixel_ratio = 1.0 # Fallback
-            logging.debug(f"[WindowSelector] Device Pixel Ratio: {device_pixel_ratio}") # 로그 추가
-                
-            # 논리적 좌표를 물리적 픽셀 좌표로 변환
-            physical_cursor_pos = QPoint(
-                int(logical_cursor_pos.x() * device_pixel_ratio),
-                int(logical_cursor_pos.y() * device_pixel_ratio)
-            )
+            # 논리적 좌표를 물리적 픽셀 좌표로 변환 (마우스 커서가 있는 화면의 devicePixelRatio 사용)
+            physical_cursor_pos = logical_to_physical(logical_cursor_pos)
             logging.debug(f"[WindowSelector] Calculated physical pos: {physical_cursor_pos.x()},{physical_cursor_pos.y()}") # 로그 추가
             
             # 물리적 좌표로 마우스 위치에 있는 창 찾기
@@ -1440,8 +1666,12 @@ class WindowSelector(QWidget):
         
         # 현재 창 강조 표시
         if self.current_rect and self.current_hwnd and self.current_title:
-            # 현재 화면의 devicePixelRatio 가져오기
-            screen = self.screen() # 위젯이 속한 화면 가져오기
+            # 물리적 좌표(self.current_rect)를 논리적 좌표로 변환 (화면별 배율 적용 후 위젯 좌표로 이동)
+            global_rect = physical_rect_to_logical(self.current_rect)
+            logical_rect = global_rect.translated(-self.geometry().x(), -self.geometry().y())
+            
+            # 창이 있는 화면의 devicePixelRatio 가져오기 (장식 크기 조정용)
+            screen = QApplication.screenAt(global_rect.center().toPoint())
             if not screen:
                 screen = QApplication.primaryScreen() # 실패 시 주 화면 사용
             
@@ -1449,14 +1679,6 @@ class WindowSelector(QWidget):
                 device_pixel_ratio = screen.devicePixelRatio()
             else:
                 device_pixel_ratio = 1.0 # Fallback
-                
-            # 물리적 좌표(self.current_rect)를 논리적 좌표로 변환
-            logical_rect = QRectF(
-                self.current_rect.x() / device_pixel_ratio,
-                self.current_rect.y() / device_pixel_ratio,
-                self.current_rect.width() / device_pixel_ratio,
-                self.current_rect.height() / device_pixel_ratio
-            )
 
             # 선택된 창 영역은 더 투명하게 (논리적 좌표 사용)
             highlight_area = QPainterPath()
@@ -1599,9 +1821,15 @@ class WindowSelector(QWidget):
 
 class AreaSelector(QWidget):
     """Widget for selecting screen area"""
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, frozen_frame=None):
+        """
+        :param parent: 선택 결과를 받을 CaptureUI
+        :param frozen_frame: 배경으로 표시할 정지 화면 (CaptureResult, None이면 실시간 화면 위에 표시)
+        """
         super().__init__(None)  # Create as top-level window without parent
         self.parent = parent
+        self.frozen_frame = frozen_frame
+        self.frozen_image = frozen_frame.to_qimage() if frozen_frame is not None else None
         self.initUI()
         self.selection_start = QPoint()
         self.selection_end = QPoint()
@@ -1612,7 +1840,8 @@ class AreaSelector(QWidget):
         # Set window to full screen size
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setGeometry(QApplication.primaryScreen().geometry())
+        # 모든 모니터를 덮도록 가상 데스크톱 크기로 설정
+        self.setGeometry(virtual_desktop_geometry())
         
         # Set transparent background
         self.setAttribute(Qt.WA_TranslucentBackground)
@@ -1625,6 +1854,15 @@ class AreaSelector(QWidget):
         """Paint event for displaying selection area"""
         painter = QPainter(self)
         
+        # 정지 화면이 있으면 화면마다 해당 영역을 배경으로 그림 (화면별 물리 픽셀 -> 논리 좌표)
+        if self.frozen_image is not None:
+            origin = self.geometry().topLeft()
+            for screen in QApplication.screens():
+                physical = screen_physical_rect(screen)
+                source_rect = QRectF(physical.translated(-self.frozen_frame.left, -self.frozen_frame.top))
+                target_rect = QRectF(screen.geometry().translated(-origin))
+                painter.drawImage(target_rect, self.frozen_image, source_rect)
+        
         # Draw semi-transparent overlay over entire screen
         painter.fillRect(self.rect(), QColor(0, 0, 0, 50))
         
@@ -1714,21 +1952,13 @@ class AreaSelector(QWidget):
             # Calculate selection area (logical pixels)
             selection_rect = QRect(self.selection_start, self.selection_end).normalized()
 
-            # Get Device Pixel Ratio for scaling
-            # AreaSelector는 최상위 위젯이므로 application에서 가져오거나 primaryScreen 사용
-            screen = QApplication.primaryScreen()
-            if screen:
-                device_pixel_ratio = screen.devicePixelRatio()
-            else:
-                device_pixel_ratio = 1.0 # Fallback
-
             # Scale the rectangle coordinates to physical pixels
-            physical_rect = QRect(
-                int(selection_rect.x() * device_pixel_ratio),
-                int(selection_rect.y() * device_pixel_ratio),
-                int(selection_rect.width() * device_pixel_ratio),
-                int(selection_rect.height() * device_pixel_ratio)
-            )
+            # 위젯 좌표 -> 전역 논리 좌표 -> 꼭짓점이 속한 화면의 배율로 물리 좌표 변환
+            origin = self.geometry().topLeft()
+            physical_top_left = logical_to_physical(selection_rect.topLeft() + origin)
+            physical_bottom_right = logical_to_physical(
+                QPoint(selection_rect.x() + selection_rect.width(), selection_rect.y() + selection_rect.height()) + origin)
+            physical_rect = QRect(physical_top_left, physical_bottom_right - QPoint(1, 1))
             
             # Close window after selection is complete
             self.close()
@@ -1737,6 +1967,7 @@ class AreaSelector(QWidget):
             if self.parent:
                 # 선택 영역이 너무 작으면 메인 창을 직접 표시
                 if physical_rect.width() < 10 or physical_rect.height() < 10:
+                    self.parent._frozen_frame = None # 정지 화면 해제
                     self.parent.show()
                     self.parent.statusBar().showMessage('Area selection too small - canceled.')
                 else:
@@ -1749,5 +1980,6 @@ class AreaSelector(QWidget):
         if event.key() == Qt.Key_Escape:
             self.close()
             if self.parent:
+                self.parent._frozen_frame = None # 정지 화면 해제
                 self.parent.show()
                 self.parent.statusBar().showMessage('Rectangular area selection canceled.') 
\ No newline at end of file
@@ -0,0 +1,357 @@
+import datetime
+import hashlib
+import os
+import threading
+import traceback
+from collections import OrderedDict
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QObject, QSize, Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QImage, QImageReader, QPixmap
+from PyQt5.QtWidgets import QHBoxLayout, QLabel, QLineEdit, QListView, QVBoxLayout, QWidget
+
+from thumbnail_cache import thumbnail_size
+
+
+class ThumbnailLoader(QObject):
+    """
+    썸네일 비동기 로더 (작업자 스레드 풀)
+    디스크 캐시에 있으면 그 파일을, 없으면 원본을 축소 디코드(QImageReader.setScaledSize, JPEG는 DCT 단계에서 축소)한 뒤
+    디스크 캐시에 저장합니다. 최근 요청부터 처리하고 오래된 요청은 버리므로 빠르게 스크롤해도 화면에 보이는 항목이 먼저 채워집니다.
+    완료된 썸네일은 개수 제한 메모리 캐시(LRU)에 보관합니다.
+    """
+    # 썸네일 준비 완료 (키)
+    thumbnailReady = pyqtSignal(str)
+
+    MAX_PENDING = 64  # 대기 요청 최대 개수 (넘으면 가장 오래된 요청부터 버림)
+
+    def __init__(self, disk_cache, size, workers=None, memory_items=300, parent=None):
+        """
+        :param disk_cache: ThumbnailCache (None이면 디스크 캐시 사용 안 함)
+        :param size: 썸네일 최대 크기 (QSize)
+        :param workers: 작업자 스레드 수 (None이면 코어 수, 최대 4)
+        :param memory_items: 메모리에 보관할 썸네일 수
+        """
+        super().__init__(parent)
+        self.disk_cache = disk_cache
+        self.size = QSize(size)
+        self.memory_items = memory_items
+        self._memory = OrderedDict()  # 키 -> QImage (LRU)
+        self._pending = OrderedDict()  # 키 -> 원본 경로 (끝이 최근 요청)
+        self._in_flight = set()
+        self._condition = threading.Condition()
+        self._stopped = False
+        count = workers or min(4, os.cpu_count() or 1)
+        self._threads = [threading.Thread(target=self._worker, name=f"ThumbnailWorker-{i}", daemon=True)
+                         for i in range(count)]
+        for thread in self._threads:
+            thread.start()
+
+    def cached(self, key):
+        """메모리 캐시의 썸네일 (없으면 None, GUI 스레드에서 호출)"""
+        with self._condition:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+            return image
+
+    def request(self, key, path):
+        """썸네일 요청 (이미 대기 중이면 최근 요청으로 올림)"""
+        with self._condition:
+            if key in self._memory or key in self._in_flight:
+                return
+            self._pending[key] = path
+            self._pending.move_to_end(key)
+            while len(self._pending) > self.MAX_PENDING:
+                self._pending.popitem(last=False)
+            self._condition.notify()
+
+    def forget(self, key):
+        """메모리 캐시에서 제거 (원본이 바뀌어 디스크 캐시도 무효화된 경우)"""
+        with self._condition:
+            self._memory.pop(key, None)
+
+    def clear_pending(self):
+        """대기 중인 요청 모두 취소 (검색어 변경 등으로 목록이 바뀌었을 때)"""
+        with self._condition:
+            self._pending.clear()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._pending.clear()
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                key, path = self._pending.popitem(last=True)
+                self._in_flight.add(key)
+            image = None
+            try:
+                image = self._load(key, path)
+            except Exception as e:
+                print(f"[Gallery] Failed to load thumbnail for {path}: {e}")
+                traceback.print_exc()
+            with self._condition:
+                self._in_flight.discard(key)
+                if image is None or self._stopped:
+                    continue
+                self._memory[key] = image
+                while len(self._memory) > self.memory_items:
+                    self._memory.popitem(last=False)
+            self.thumbnailReady.emit(key)
+
+    def _load(self, key, path):
+        """작업자 스레드에서 실행: 디스크 캐시 확인 후 없으면 원본을 축소 디코드"""
+        if self.disk_cache is not None:
+            image = self.disk_cache.get(key, self.size)
+            if image is not None:
+                return image
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        source_size = reader.size()
+        if source_size.isValid():
+            reader.setScaledSize(thumbnail_size(source_size, self.size))
+        image = reader.read()
+        if image.isNull():
+            print(f"[Gallery] Cannot decode {path}: {reader.errorString()}")
+            return None
+        if image.width() > self.size.width() or image.height() > self.size.height():
+            # 크기를 미리 알 수 없는 형식은 디코드 후 축소
+            image = image.scaled(self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        if self.disk_cache is not None:
+            self.disk_cache.put(key, self.size, image)
+        return image
+
+
+class HistoryModel(QAbstractListModel):
+    """
+    캡처 기록 목록 모델 (페이지 단위로 필요할 때만 조회)
+    QListView가 화면에 보이는 항목의 data()만 호출하므로 썸네일도 보이는 항목만 요청됩니다.
+    """
+    PAGE_SIZE = 200
+    PathRole = Qt.UserRole + 1
+    KeyRole = Qt.UserRole + 2
+
+    def __init__(self, history, loader, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.loader = loader
+        self.query = ""
+        self._rows = []
+        self._rows_by_key = {}  # 썸네일 키 -> 행 번호 목록
+        self._exhausted = False
+        self._placeholder = QImage(loader.size, QImage.Format_RGB32)
+        self._placeholder.fill(QColor("#dddddd"))
+        loader.thumbnailReady.connect(self._on_thumbnail_ready)
+
+    @staticmethod
+    def thumbnail_key(row):
+        """썸네일 키 (픽셀 해시, 없으면 경로와 수정 시각)"""
+        if row["content_hash"]:
+            return row["content_hash"]
+        return hashlib.blake2b(f"{row['path']}|{row['mtime']}".encode(), digest_size=16).hexdigest()
+
+    def set_query(self, text):
+        """검색어를 바꾸고 처음부터 다시 조회"""
+        self.beginResetModel()
+        self.query = text
+        self._rows = []
+        self._rows_by_key = {}
+        self._exhausted = False
+        self.endResetModel()
+        self.loader.clear_pending()
+
+    def reload(self):
+        self.set_query(self.query)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        rows = self.history.search(self.query, limit=self.PAGE_SIZE, offset=len(self._rows))
+        if len(rows) < self.PAGE_SIZE:
+            self._exhausted = True
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for offset, row in enumerate(rows):
+            self._rows_by_key.setdefault(self.thumbnail_key(row), []).append(first + offset)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return datetime.datetime.fromtimestamp(row["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
+        if role == Qt.DecorationRole:
+            key = self.thumbnail_key(row)
+            image = self.loader.cached(key)
+            if image is None:
+                self.loader.request(key, row["path"])
+                return self._placeholder
+            return image
+        if role == Qt.ToolTipRole:
+            lines = [row["name"], f"{row['width']}x{row['height']}, {row['size'] / 1024:.0f} KB"]
+            if row["window_title"]:
+                lines.append(row["window_title"])
+            if row["process_name"]:
+                lines.append(row["process_name"])
+            return "\n".join(lines)
+        if role == self.PathRole:
+            return row["path"]
+        if role == self.KeyRole:
+            return self.thumbnail_key(row)
+        return None
+
+    def _on_thumbnail_ready(self, key):
+        for row in self._rows_by_key.get(key, ()):
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+
+class HistoryGallery(QWidget):
+    """
+    캡처 기록 갤러리 창
+    목록은 가상화된 QListView(아이콘 모드, 균일 크기)로 보이는 항목만 그리며,
+    썸네일은 ThumbnailLoader가 작업자 스레드에서 축소 디코드해 디스크/메모리에 캐시합니다.
+    선택한 항목의 미리보기도 같은 디스크 캐시에 더 큰 크기로 보관하므로 다시 선택할 때 원본을 디코드하지 않습니다.
+    """
+    # 항목 더블클릭 시 (파일 경로)
+    captureActivated = pyqtSignal(str)
+
+    THUMBNAIL_SIZE = QSize(160, 100)
+    PREVIEW_SIZE = QSize(640, 400)
+
+    def __init__(self, history, disk_cache, parent=None):
+        super().__init__(parent)
+        self.setWindowFlags(Qt.Window)
+        self.setWindowTitle("Capture History")
+        self.resize(760, 560)
+
+        self.loader = ThumbnailLoader(disk_cache, self.THUMBNAIL_SIZE, parent=self)
+        # 미리보기는 한 번에 하나만 보므로 작업자 1개, 최근 몇 장만 메모리에 보관
+        self.preview_loader = ThumbnailLoader(disk_cache, self.PREVIEW_SIZE, workers=1, memory_items=8, parent=self)
+        self.preview_loader.thumbnailReady.connect(self._on_preview_ready)
+        self._preview_key = None
+        self.model = HistoryModel(history, self.loader, self)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(8)
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search by file name, window title or process")
+        self.search_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.search_edit)
+
+        self.view = QListView()
+        self.view.setViewMode(QListView.IconMode)
+        self.view.setResizeMode(QListView.Adjust)
+        self.view.setMovement(QListView.Static)
+        # 모든 항목이 같은 크기이므로 배치 계산에 항목별 크기를 묻지 않음 (수만 개에서도 레이아웃이 빠름)
+        self.view.setUniformItemSizes(True)
+        self.view.setLayoutMode(QListView.Batched)
+        self.view.setBatchSize(200)
+        self.view.setIconSize(self.THUMBNAIL_SIZE)
+        self.view.setGridSize(QSize(self.THUMBNAIL_SIZE.width() + 16, self.THUMBNAIL_SIZE.height() + 36))
+        self.view.setSpacing(4)
+        self.view.setModel(self.model)
+        self.view.doubleClicked.connect(self._on_double_clicked)
+        self.view.selectionModel().currentChanged.connect(self._on_current_changed)
+
+        self.preview_label = QLabel("Select a capture to preview")
+        self.preview_label.setAlignment(Qt.AlignCenter)
+        self.preview_label.setFixedWidth(320)
+        self.preview_label.setStyleSheet("font-size: 8pt; color: #888888; background-color: #222222;")
+
+        content_layout = QHBoxLayout()
+        content_layout.addWidget(self.view, 1)
+        content_layout.addWidget(self.preview_label)
+        layout.addLayout(content_layout, 1)
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("font-size: 8pt; color: #555555;")
+        layout.addWidget(self.status_label)
+
+        # 입력이 멈춘 뒤 한 번만 검색
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(250)
+        self._search_timer.timeout.connect(self._apply_search)
+        self.search_edit.textChanged.connect(self._search_timer.start)
+        self._update_status()
+
+    def _apply_search(self):
+        self.model.set_query(self.search_edit.text().strip())
+        self._update_status()
+
+    def _update_status(self):
+        total = self.model.history.count()
+        self.status_label.setText(f"{total} captures" + (f" - searching '{self.model.query}'" if self.model.query else ""))
+
+    def refresh(self):
+        """새 캡처가 기록되었을 때 목록을 처음부터 다시 조회 (첫 페이지만 읽음)"""
+        self.model.reload()
+        self._update_status()
+
+    def _on_current_changed(self, current, previous):
+        """선택한 캡처의 미리보기 표시 (캐시에 없으면 작업자가 준비한 뒤 표시)"""
+        if not current.isValid():
+            return
+        self._preview_key = self.model.data(current, HistoryModel.KeyRole)
+        image = self.preview_loader.cached(self._preview_key)
+        if image is None:
+            self.preview_loader.clear_pending()
+            self.preview_loader.request(self._preview_key, self.model.data(current, HistoryModel.PathRole))
+            self.preview_label.setText("Loading...")
+            return
+        self._show_preview(image)
+
+    def _on_preview_ready(self, key):
+        if key == self._preview_key:
+            self._show_preview(self.preview_loader.cached(key))
+
+    def _show_preview(self, image):
+        if image is None:
+            return
+        # 캐시된 미리보기 크기에서 라벨 크기로만 축소 (원본 디코드 없음)
+        pixmap = QPixmap.fromImage(image).scaled(self.preview_label.size(), Qt.KeepAspectRatio,
+                                                 Qt.SmoothTransformation)
+        self.preview_label.setPixmap(pixmap)
+
+    def invalidate(self, key):
+        """편집으로 바뀐 캡처의 메모리 썸네일/미리보기 제거 (디스크 캐시는 ThumbnailCache.invalidate)"""
+        self.loader.forget(key)
+        self.preview_loader.forget(key)
+        if key == self._preview_key:
+            self._preview_key = None
+
+    def _on_double_clicked(self, index):
+        path = self.model.data(index, HistoryModel.PathRole)
+        if path:
+            self.captureActivated.emit(path)
+
+    def closeEvent(self, event):
+        self.loader.clear_pending()
+        self.preview_loader.clear_pending()
+        super().closeEvent(event)
+
+    def shutdown(self):
+        """작업자 스레드 종료 (앱 종료 시)"""
+        self.loader.stop()
+        self.preview_loader.stop()
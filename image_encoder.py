@@ -0,0 +1,214 @@
+import io
+import os
+from collections import namedtuple
+
+from PIL import Image, features
+
+from png_parallel import save_png_parallel
+
+# 화면 내용 분석 결과 (색 수, 가장 많은 32색이 차지하는 비율, 밝기 엔트로피, 분석에 쓴 축소본)
+ContentStats = namedtuple("ContentStats", ["colors", "flat_ratio", "entropy", "sample"])
+
+
+def analyze_content(image, sample_size=256):
+    """
+    축소본으로 화면 내용 분석 (수 ms)
+    글자/UI 화면은 몇 가지 색이 넓은 면적을 차지하고, 사진/영상은 색이 고르게 퍼져 엔트로피가 높습니다.
+    :param image: PIL Image
+    :param sample_size: 축소본의 긴 변 길이 (픽셀)
+    :return: ContentStats
+    """
+    width, height = image.size
+    scale = min(1.0, sample_size / max(width, height, 1))
+    # 원래 색이 섞이지 않도록 최근접 축소 (평균 축소는 글자 가장자리에 없던 색을 만듦)
+    sample = image.resize((max(1, round(width * scale)), max(1, round(height * scale))), Image.NEAREST)
+    if sample.mode != "RGB":
+        sample = sample.convert("RGB")
+    pixels = sample.width * sample.height
+    colors = sorted(sample.getcolors(maxcolors=pixels), reverse=True)
+    flat_ratio = sum(count for count, _ in colors[:32]) / pixels
+    return ContentStats(len(colors), flat_ratio, sample.convert("L").entropy(), sample)
+
+
+class ImageEncoder:
+    """
+    설정(image_format, save_quality)에 따라 캡처 이미지를 파일로 인코딩
+    지원 형식: png (save_quality -> zlib 압축 레벨), webp (100이면 무손실, 그 외 손실), jpeg, qoi
+    "auto"는 이미지마다 내용을 분석해 글자/UI 화면은 PNG, 사진/영상 화면은 손실 WebP(없으면 JPEG)로 저장합니다.
+    현재 Pillow에서 쓸 수 없는 형식은 PNG로 대신 저장합니다.
+    """
+    FORMATS = {
+        # 형식 이름 -> (Pillow 형식, 확장자)
+        "png": ("PNG", ".png"),
+        "webp": ("WEBP", ".webp"),
+        "jpeg": ("JPEG", ".jpg"),
+        "qoi": ("QOI", ".qoi"),
+    }
+    ALIASES = {"jpg": "jpeg"}
+    AUTO = "auto"
+    # auto 판정 기준: 색이 이보다 많고, 상위 32색 면적 비율이 낮고, 엔트로피가 높으면 사진/영상으로 봄
+    PALETTE_COLORS = 256
+    FLAT_RATIO_THRESHOLD = 0.5
+    ENTROPY_THRESHOLD = 5.0
+
+    def __init__(self, image_format="png", quality=100, lossy_quality=85, parallel_png_threshold_mp=8, fast_png=False):
+        """
+        :param image_format: 형식 이름 ("png", "webp", "jpeg"/"jpg", "qoi", "auto")
+        :param quality: 0-100 (PNG는 압축 레벨, WebP는 100이면 무손실, JPEG/손실 WebP는 화질)
+        :param lossy_quality: auto에서 사진/영상 화면을 손실 압축할 때의 화질 (0-100)
+        :param parallel_png_threshold_mp: 이 크기(메가픽셀) 이상의 PNG는 여러 코어로 나눠 압축 (0이면 사용 안 함)
+        :param fast_png: True이면 PNG를 가장 빠른 압축 레벨로 저장 (유휴 시간 재압축이 나중에 크기를 줄임)
+        """
+        self.quality = max(0, min(int(quality), 100))
+        self.lossy_quality = max(1, min(int(lossy_quality), 99))
+        self.parallel_png_threshold_mp = parallel_png_threshold_mp
+        self.fast_png = fast_png
+        self.format = self._resolve_format(image_format)
+
+    @classmethod
+    def from_settings(cls, config_manager):
+        """설정 관리자에서 형식과 품질을 읽어 생성 (설정 관리자가 없으면 기본 PNG)"""
+        if config_manager is None:
+            return cls()
+        return cls(config_manager.get_setting("image_format", "png"),
+                   config_manager.get_setting("save_quality", 100),
+                   config_manager.get_setting("auto_lossy_quality", 85),
+                   config_manager.get_setting("parallel_png_threshold_mp", 8),
+                   config_manager.get_setting("idle_recompress", False))
+
+    def _derived(self, image_format, quality):
+        """같은 설정으로 형식/품질만 바꾼 인코더 (auto의 실제 인코더)"""
+        return ImageEncoder(image_format, quality, self.lossy_quality, self.parallel_png_threshold_mp, self.fast_png)
+
+    @property
+    def is_auto(self):
+        return self.format == self.AUTO
+
+    @classmethod
+    def is_supported(cls, image_format):
+        """현재 환경의 Pillow로 해당 형식을 쓸 수 있는지 확인"""
+        image_format = cls.ALIASES.get(image_format, image_format)
+        if image_format not in cls.FORMATS:
+            return False
+        if image_format == "webp":
+            return features.check("webp")
+        pil_format = cls.FORMATS[image_format][0]
+        Image.init()
+        return pil_format in Image.SAVE
+
+    def _resolve_format(self, image_format):
+        name = self.ALIASES.get(str(image_format).lower(), str(image_format).lower())
+        if name == self.AUTO:
+            return name
+        if not self.is_supported(name):
+            print(f"[Encoder] Format '{image_format}' is not available, saving as PNG instead.")
+            return "png"
+        return name
+
+    @property
+    def extension(self):
+        """저장 파일 확장자 (점 포함, auto는 이미지를 모를 때 PNG 기준)"""
+        return self.FORMATS["png" if self.is_auto else self.format][1]
+
+    def choose(self, image):
+        """
+        이미지에 사용할 실제 인코더 선택 (auto가 아니면 자기 자신)
+        :param image: PIL Image
+        :return: (ImageEncoder, ContentStats 또는 None)
+        """
+        if not self.is_auto:
+            return self, None
+        stats = analyze_content(image)
+        photo_like = (stats.colors > self.PALETTE_COLORS and stats.flat_ratio < self.FLAT_RATIO_THRESHOLD
+                      and stats.entropy >= self.ENTROPY_THRESHOLD)
+        if photo_like:
+            lossy_format = "webp" if self.is_supported("webp") else "jpeg"
+            return self._derived(lossy_format, self.lossy_quality), stats
+        return self._derived("png", self.quality), stats
+
+    def select(self, image):
+        """이미지에 사용할 실제 인코더 (저장 경로의 확장자를 정할 때 사용, 캡처는 CaptureResult.choose_encoder 사용)"""
+        return self.choose(image)[0]
+
+    def _format_for_path(self, filepath):
+        """파일 경로의 확장자에 해당하는 형식 이름 (알 수 없으면 None)"""
+        if not isinstance(filepath, str):
+            return None
+        extension = os.path.splitext(filepath)[1].lower()
+        for name, (_, format_extension) in self.FORMATS.items():
+            if extension == format_extension or (name == "jpeg" and extension == ".jpeg"):
+                return name
+        return None
+
+    def use_parallel_png(self, image):
+        """큰 이미지이고 코어가 여럿이면 병렬 PNG 인코더 사용 (Pillow의 PNG 저장은 zlib을 한 코어에서만 실행)"""
+        threshold = self.parallel_png_threshold_mp
+        return (bool(threshold) and image.width * image.height >= threshold * 1000000
+                and (os.cpu_count() or 1) > 1)
+
+    @property
+    def png_compress_level(self):
+        """save_quality(0-100)를 zlib 압축 레벨(0-9)로 변환 (100 = 최대 압축, fast_png이면 1)"""
+        if self.fast_png:
+            return 1
+        return round(self.quality * 9 / 100)
+
+    def save_options(self, image):
+        """
+        Pillow save()에 넘길 형식별 옵션
+        :param image: 저장할 PIL Image (모드 확인용)
+        :return: (저장할 PIL Image, 옵션 딕셔너리)
+        """
+        if self.format == "png":
+            return image, {"compress_level": self.png_compress_level}
+        if self.format == "webp":
+            if self.quality >= 100:
+                # 무손실: quality는 압축 노력 정도, method는 속도/크기 절충 (0 빠름 - 6 작음)
+                return image, {"lossless": True, "quality": 80, "method": 4}
+            return image, {"quality": self.quality, "method": 4}
+        if self.format == "jpeg":
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            # 화면 글자가 번지지 않도록 높은 화질에서는 색차 서브샘플링 사용 안 함 (4:4:4)
+            return image, {"quality": max(1, min(self.quality, 95)),
+                           "subsampling": 0 if self.quality >= 90 else 2}
+        return image, {}
+
+    def save(self, image, filepath, choice=None):
+        """
+        PIL Image를 설정된 형식으로 저장 (auto는 내용에 따라 형식 선택 후 결정과 절약 크기를 기록)
+        :param image: PIL Image
+        :param filepath: 저장할 파일 경로 (또는 쓰기 가능한 파일 객체)
+        :param choice: 이미 분석한 choose() 결과 (auto에서 같은 이미지를 다시 분석하지 않도록, None이면 여기서 분석)
+        """
+        if self.is_auto:
+            self._save_auto(image, filepath, choice)
+            return
+        if self.format == "png" and self.use_parallel_png(image):
+            save_png_parallel(image, filepath, level=self.png_compress_level)
+            return
+        image, options = self.save_options(image)
+        image.save(filepath, self.FORMATS[self.format][0], **options)
+
+    def _save_auto(self, image, filepath, choice=None):
+        encoder, stats = choice if choice is not None else self.choose(image)
+        # 저장 경로는 같은 분석으로 정해지므로 보통 일치하며, 다르면 경로의 확장자를 따름
+        path_format = self._format_for_path(filepath)
+        if path_format and path_format != encoder.format and self.is_supported(path_format):
+            quality = self.quality if path_format in ("png", "qoi") else self.lossy_quality
+            encoder = self._derived(path_format, quality)
+        encoder.save(image, filepath)
+
+        size = os.path.getsize(filepath) if isinstance(filepath, str) else filepath.tell()
+        kind = "text/UI" if encoder.format == "png" else "photo/video"
+        message = (f"[Encoder] auto: {kind} (colors {stats.colors}, flat {stats.flat_ratio:.0%}, "
+                   f"entropy {stats.entropy:.2f}) -> {encoder.format} q{encoder.quality}, {size / 1024:.0f} KB")
+        if encoder.format != "png":
+            # 축소본을 두 형식으로 인코딩한 크기 비율로 PNG 대비 절약량 추정
+            png_sample, lossy_sample = io.BytesIO(), io.BytesIO()
+            self._derived("png", self.quality).save(stats.sample, png_sample)
+            encoder.save(stats.sample, lossy_sample)
+            ratio = lossy_sample.tell() / max(png_sample.tell(), 1)
+            if ratio > 0:
+                message += f", ~{(size / ratio - size) / 1024:.0f} KB smaller than PNG (est.)"
+        print(message)
@@ -4,6 +4,7 @@ import os
 # import keyboard
 # pywin32 관련 모듈 임포트
 import ctypes
+import time
 from ctypes import wintypes
 import win32con
 import win32gui
@@ -43,8 +44,11 @@ class HotkeyFilter(QAbstractNativeEventFilter):
             hotkey_id = msg.wParam
             key_name = self.id_to_key.get(hotkey_id)
             print(f"[Hotkey Event] Native event filter caught WM_HOTKEY. ID: {hotkey_id:X}, Key: {key_name}") # ID 16진수 출력
+            # 메시지 생성 시각(msg.time, 부팅 후 ms)으로 실제 키 입력 시각 계산 (프레임 버퍼 조회용)
+            elapsed_ms = (ctypes.windll.kernel32.GetTickCount() - msg.time) & 0xFFFFFFFF
+            self.ui.hotkey_pressed_at = time.time() - elapsed_ms / 1000.0
 
-            # 등록된 키 이름과 비교하여 해당하는 시그널 발생 (Alt+1/2/3 기준)
+            # 등록된 키 이름과 비교하여 해당하는 시그널 발생 (Alt+1/2/3/4 기준)
             if key_name == 'Alt+1':
                 print("[Hotkey Event] Alt+1 pressed, emitting captureFullScreenRequested signal.")
                 self.ui.captureFullScreenRequested.emit()
@@ -54,6 +58,9 @@ class HotkeyFilter(QAbstractNativeEventFilter):
             elif key_name == 'Alt+3':
                 print("[Hotkey Event] Alt+3 pressed, emitting captureWindowRequested signal.")
                 self.ui.captureWindowRequested.emit()
+            elif key_name == 'Alt+4':
+                print("[Hotkey Event] Alt+4 pressed, emitting captureBurstRequested signal.")
+                self.ui.captureBurstRequested.emit()
 
             return True, 0
 
@@ -81,18 +88,19 @@ def main():
     # UI 초기화
     ui = CaptureUI(capture_module)
 
-    # --- 전역 단축키 ID 정의 및 등록 (Alt+1/2/3) --- #
+    # --- 전역 단축키 ID 정의 및 등록 (Alt+1/2/3/4) --- #
     HOTKEY_IDS = {
         'Alt+1': 0xC001, # 전체 화면
         'Alt+2': 0xC002, # 영역
-        'Alt+3': 0xC003  # 창
+        'Alt+3': 0xC003, # 창
+        'Alt+4': 0xC004  # 버스트 (연속 캡처)
     }
     registered_hotkeys = {}
 
     # Modifier 설정 (Alt)
     MODIFIERS = win32con.MOD_ALT # Shift 제거
 
-    print("Registering global hotkeys (Alt+1/2/3) using pywin32 (assuming success for filter)...") # 로그 메시지 수정
+    print("Registering global hotkeys (Alt+1/2/3/4) using pywin32 (assuming success for filter)...") # 로그 메시지 수정
     try:
         # Alt+1 등록 (전체 화면, ID: 0xC001)
         if win32gui.RegisterHotKey(None, HOTKEY_IDS['Alt+1'], MODIFIERS, 0x31): # VK_1
@@ -121,6 +129,15 @@ def main():
         # 실패 여부와 관계없이 필터를 위해 등록 정보 추가 (진단용)
         registered_hotkeys['Alt+3'] = HOTKEY_IDS['Alt+3']
 
+        # Alt+4 등록 (버스트, ID: 0xC004)
+        if win32gui.RegisterHotKey(None, HOTKEY_IDS['Alt+4'], MODIFIERS, 0x34): # VK_4
+            print(f"Registered hotkey Alt+4 (ID: {HOTKEY_IDS['Alt+4']:X})")
+        else:
+            error_code = ctypes.GetLastError()
+            print(f"Warning: RegisterHotKey for Alt+4 returned False, but GetLastError is {error_code}. Proceeding anyway.")
+        # 실패 여부와 관계없이 필터를 위해 등록 정보 추가 (진단용)
+        registered_hotkeys['Alt+4'] = HOTKEY_IDS['Alt+4']
+
         # 등록된 ID를 UI 객체에 전달
         ui.set_hotkey_ids(registered_hotkeys)
 
@@ -0,0 +1,134 @@
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import ImageChops
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+COLOR_TYPES = {1: 0, 3: 2, 4: 6}  # 채널 수 -> PNG 색 형식 (회색, RGB, RGBA)
+FILTER_UP = 2
+WINDOW_SIZE = 32768  # deflate 창 크기 (앞 조각의 마지막 32KB를 사전으로 사용)
+_ADLER_BASE = 65521
+
+
+def _zlib_header(level):
+    """zlib 스트림 헤더 (압축 레벨 표시 비트 포함)"""
+    if level <= 1:
+        return b"\x78\x01"
+    if level <= 5:
+        return b"\x78\x5e"
+    if level == 6:
+        return b"\x78\x9c"
+    return b"\x78\xda"
+
+
+def _adler32_combine(adler1, adler2, length2):
+    """앞 데이터의 adler32와 뒤 데이터(length2 바이트)의 adler32로 전체 adler32 계산 (zlib의 adler32_combine)"""
+    remainder = length2 % _ADLER_BASE
+    sum1 = adler1 & 0xFFFF
+    sum2 = (remainder * sum1) % _ADLER_BASE
+    sum1 += (adler2 & 0xFFFF) + _ADLER_BASE - 1
+    sum2 += ((adler1 >> 16) & 0xFFFF) + ((adler2 >> 16) & 0xFFFF) + _ADLER_BASE - remainder
+    if sum1 >= _ADLER_BASE:
+        sum1 -= _ADLER_BASE
+    if sum1 >= _ADLER_BASE:
+        sum1 -= _ADLER_BASE
+    if sum2 >= (_ADLER_BASE << 1):
+        sum2 -= (_ADLER_BASE << 1)
+    if sum2 >= _ADLER_BASE:
+        sum2 -= _ADLER_BASE
+    return sum1 | (sum2 << 16)
+
+
+def _chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def _compress_strip(filter_rows, stride, first_row, last_row, level, is_last):
+    """
+    가로 띠 하나를 필터링하고 독립된 deflate 블록으로 압축 (작업자 스레드, 필터링/압축 중에는 GIL을 놓음)
+    :return: (압축 데이터, 필터링된 원본의 adler32, 필터링된 원본 길이)
+    """
+    filter_byte = bytes((FILTER_UP,))
+
+    def filtered_rows(first, last):
+        filtered = filter_rows(first, last)
+        return b"".join(filter_byte + filtered[offset:offset + stride] for offset in range(0, len(filtered), stride))
+
+    rows = filtered_rows(first_row, last_row)
+    # 앞 띠의 마지막 32KB(필터링된 원본)를 사전으로 주면 띠 경계에서도 압축률이 거의 유지됨
+    dictionary = b""
+    if first_row > 0:
+        rows_needed = WINDOW_SIZE // (stride + 1) + 1
+        dictionary = filtered_rows(max(0, first_row - rows_needed), first_row)[-WINDOW_SIZE:]
+    compressor = (zlib.compressobj(level, zlib.DEFLATED, -15, zdict=dictionary) if dictionary
+                  else zlib.compressobj(level, zlib.DEFLATED, -15))
+    # 마지막 띠만 스트림을 끝내고, 나머지는 바이트 경계로 맞춰(sync flush) 그대로 이어 붙일 수 있게 함
+    data = compressor.compress(rows) + compressor.flush(zlib.Z_FINISH if is_last else zlib.Z_SYNC_FLUSH)
+    return data, zlib.adler32(rows), len(rows)
+
+
+def encode_png(width, height, channels, filter_rows, level=6, workers=None, strip_bytes=1 << 20):
+    """
+    PNG 인코딩 (가로 띠를 여러 코어에서 동시에 압축해 하나의 IDAT 스트림으로 이어 붙임, pigz 방식)
+    :param width: 너비
+    :param height: 높이
+    :param channels: 1(회색), 3(RGB), 4(RGBA)
+    :param filter_rows: (첫 행, 끝 행) -> 해당 행들에 Up 필터를 적용한 픽셀 데이터 (행 사이 여백 없음)
+                        첫 행 위는 0으로 된 행으로 봄
+    :param level: zlib 압축 레벨 (0-9)
+    :param workers: 작업자 스레드 수 (None이면 CPU 코어 수)
+    :param strip_bytes: 띠 하나의 대략적인 원본 크기 (바이트)
+    :return: PNG 파일 데이터 (bytes)
+    """
+    stride = width * channels
+    rows_per_strip = max(1, strip_bytes // max(stride, 1))
+    strips = [(row, min(row + rows_per_strip, height)) for row in range(0, height, rows_per_strip)]
+    workers = workers or os.cpu_count() or 1
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(strips)), thread_name_prefix="PngStrip") as executor:
+        futures = [executor.submit(_compress_strip, filter_rows, stride, first, last, level, index == len(strips) - 1)
+                   for index, (first, last) in enumerate(strips)]
+        results = [future.result() for future in futures]
+
+    adler = 1  # 빈 데이터의 adler32
+    for _, strip_adler, length in results:
+        adler = _adler32_combine(adler, strip_adler, length)
+
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, COLOR_TYPES[channels], 0, 0, 0)
+    parts = [PNG_SIGNATURE, _chunk(b"IHDR", ihdr)]
+    for index, (data, _, _) in enumerate(results):
+        if index == 0:
+            data = _zlib_header(level) + data
+        if index == len(results) - 1:
+            data += struct.pack(">I", adler)
+        parts.append(_chunk(b"IDAT", data))
+    parts.append(_chunk(b"IEND", b""))
+    return b"".join(parts)
+
+
+def save_png_parallel(image, filepath, level=6, workers=None):
+    """
+    PIL Image를 병렬 PNG 인코더로 저장
+    Up 필터는 띠와 한 행 위로 밀린 띠의 바이트 차이(mod 256)이므로 Pillow의 C 연산(subtract_modulo)으로 계산합니다.
+    :param image: PIL Image (L, RGB, RGBA 외의 모드는 RGB/RGBA로 변환)
+    :param filepath: 저장할 파일 경로 (또는 쓰기 가능한 파일 객체)
+    """
+    if image.mode not in ("L", "RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    image.load()  # 작업자 스레드들이 동시에 읽기 전에 픽셀을 불러 둠
+    width = image.width
+
+    def filter_rows(first, last):
+        current = image.crop((0, first, width, last))
+        # 이미지 밖(첫 행 위)을 자르면 0으로 채워짐
+        previous = image.crop((0, first - 1, width, last - 1))
+        return ImageChops.subtract_modulo(current, previous).tobytes()
+
+    data = encode_png(width, image.height, len(image.getbands()), filter_rows, level, workers)
+    if isinstance(filepath, str):
+        with open(filepath, "wb") as f:
+            f.write(data)
+    else:
+        filepath.write(data)
@@ -0,0 +1,98 @@
+import threading
+import time
+import traceback
+from collections import deque
+
+from PyQt5.QtCore import QObject, QSize, Qt, pyqtSignal
+from PyQt5.QtGui import QImage
+
+
+class PreviewScaler(QObject):
+    """
+    미리보기 축소 작업자 (전용 스레드)
+    원본을 화면 크기 정도의 중간 크기 프록시로 한 번만 줄여 메모리에 두고, 이후 창 크기가 바뀔 때는 프록시에서만 부드럽게 축소합니다.
+    QImage 연산은 GUI 스레드 밖에서 안전하므로 축소는 작업자 스레드에서 수행하고, 결과만 시그널로 GUI 스레드에 넘깁니다.
+    요청이 몰리면 가장 마지막 요청만 처리합니다.
+    """
+    # 축소 완료 (원본 세대 번호, 축소된 QImage)
+    scaled = pyqtSignal(int, QImage)
+    SCALE_TIMES_KEPT = 256  # 보관할 최근 축소 시간 수
+
+    def __init__(self, proxy_size, parent=None):
+        """
+        :param proxy_size: 프록시 최대 크기 (QSize, 보통 화면 물리 해상도, 미리보기 라벨이 이보다 커지지 않음)
+        """
+        super().__init__(parent)
+        self.proxy_size = QSize(proxy_size)
+        self.generation = 0  # set_source마다 증가 (이전 원본의 늦은 결과를 버리는 데 사용)
+        self.scale_times = deque(maxlen=self.SCALE_TIMES_KEPT)  # 최근 요청별 축소 시간 (ms, 오래 실행되는 트레이 앱이므로 개수 제한)
+        self._source = None
+        self._source_key = None
+        self._proxy = None
+        self._proxy_generation = -1
+        self._request = None  # (세대, QSize), 가장 마지막 요청만 보관
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="PreviewScaler", daemon=True)
+        self._thread.start()
+
+    def set_source(self, image):
+        """
+        미리보기 원본 설정 (같은 이미지면 기존 프록시 유지)
+        :param image: QImage (암시적 공유이므로 복사하지 않음)
+        """
+        with self._condition:
+            if image.cacheKey() == self._source_key:
+                return
+            self._source = QImage(image)
+            self._source_key = image.cacheKey()
+            self.generation += 1
+            self._request = None
+            self._proxy = None  # 이전 원본의 프록시 해제
+
+    def request(self, size):
+        """현재 원본을 size에 맞게 축소 요청 (완료 시 scaled 시그널)"""
+        with self._condition:
+            if self._source is None or size.isEmpty():
+                return
+            self._request = (self.generation, QSize(size))
+            self._condition.notify()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join(timeout=2.0)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._request is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                generation, size = self._request
+                self._request = None
+                source = self._source
+                proxy = self._proxy if self._proxy_generation == generation else None
+            try:
+                start = time.perf_counter()
+                if proxy is None:
+                    proxy = self._make_proxy(source)
+                    with self._condition:
+                        if generation == self.generation:
+                            self._proxy, self._proxy_generation = proxy, generation
+                result = proxy.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                self.scale_times.append((time.perf_counter() - start) * 1000)
+            except Exception as e:
+                print(f"[Preview] Error scaling preview: {e}")
+                traceback.print_exc()
+                continue
+            if generation == self.generation:
+                self.scaled.emit(generation, result)
+
+    def _make_proxy(self, source):
+        """원본이 프록시 크기보다 크면 한 번 축소 (창 크기를 바꿀 때마다 원본 전체를 다시 훑지 않도록)"""
+        if source.width() <= self.proxy_size.width() and source.height() <= self.proxy_size.height():
+            return source
+        return source.scaled(self.proxy_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
@@ -0,0 +1,238 @@
+import ctypes
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+
+import psutil
+from PIL import Image
+
+
+def user_idle_seconds():
+    """
+    마지막 키보드/마우스 입력 후 지난 시간 (초)
+    Windows 외에는 입력 시각을 알 수 없으므로 None (CPU 사용률로만 판단)
+    """
+    if sys.platform != "win32":
+        return None
+
+    class LASTINPUTINFO(ctypes.Structure):
+        _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+    info = LASTINPUTINFO()
+    info.cbSize = ctypes.sizeof(info)
+    if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+        return None
+    return ((ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF) / 1000.0
+
+
+def _lower_thread_priority():
+    """현재 스레드의 우선순위를 가장 낮게 설정 (실패해도 무시)"""
+    try:
+        if sys.platform == "win32":
+            THREAD_PRIORITY_IDLE = -15
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_IDLE)
+        elif hasattr(os, "setpriority"):
+            # Linux는 스레드 ID별로 nice 값을 가짐
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except Exception as e:
+        print(f"[Recompress] Could not lower thread priority: {e}")
+
+
+class IdleRecompressor:
+    """
+    유휴 시간에 저장 폴더의 PNG 캡처를 최대 압축으로 다시 저장하는 백그라운드 작업
+    캡처 시점에는 가장 빠른 압축으로 저장하고, 사용자가 자리를 비웠을 때 최적화 PNG 또는 무손실 WebP로 바꿉니다.
+    새 파일은 디코드한 픽셀이 원본과 같고 크기가 더 작을 때만 원본을 원자적으로 교체하며,
+    처리한 파일과 절약한 바이트는 상태 파일(JSON)에 기록합니다.
+    """
+    SCAN_INTERVAL = 60.0  # 처리할 파일이 없을 때 다시 확인하는 간격 (초)
+    MIN_FILE_AGE = 60.0  # 저장/편집 중인 파일을 건드리지 않도록, 수정 후 이 시간이 지난 파일만 처리 (초)
+
+    def __init__(self, directory, state_path, target="png", idle_seconds=120, cpu_percent=20, busy_paths=None,
+                 on_replaced=None):
+        """
+        :param directory: 재압축할 캡처 저장 폴더
+        :param state_path: 처리 기록 상태 파일 경로 (JSON)
+        :param target: "png" (최적화 PNG, 같은 파일명) 또는 "webp" (무손실 WebP, 확장자 변경)
+        :param idle_seconds: 마지막 입력 후 이 시간이 지나야 유휴로 판단 (Windows)
+        :param cpu_percent: 전체 CPU 사용률이 이보다 낮을 때만 작업
+        :param busy_paths: 저장 대기 중인 경로 집합을 반환하는 함수 (해당 파일은 건너뜀)
+        :param on_replaced: 파일을 교체한 뒤 작업자 스레드에서 호출할 함수 (이전 경로, 새 경로), 형식이 바뀌면 두 경로가 다름
+        """
+        self.directory = directory
+        self.state_path = state_path
+        self.target = target
+        self.idle_seconds = idle_seconds
+        self.cpu_percent = cpu_percent
+        self.busy_paths = busy_paths or (lambda: set())
+        self.on_replaced = on_replaced
+        self.state = self._load_state()
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    @property
+    def bytes_reclaimed(self):
+        return self.state.get("bytes_reclaimed", 0)
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {"files": {}, "bytes_reclaimed": 0}
+
+    def _save_state(self):
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(temp_path, self.state_path)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="IdleRecompressor", daemon=True)
+        self._thread.start()
+        print(f"[Recompress] Started (target: {self.target}, reclaimed so far: {self.bytes_reclaimed / 1024 / 1024:.1f} MB)")
+
+    def stop(self, timeout=5.0):
+        """중단 (진행 중인 파일은 교체 전이면 버리고 끝냄)"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def set_directory(self, directory):
+        """저장 폴더 변경 (실행 중이면 멈췄다가 새 폴더로 다시 시작, 대기 중인 검사 간격을 기다리지 않음)"""
+        was_running = self._thread is not None and self._thread.is_alive()
+        if was_running:
+            self.stop()
+        self.directory = directory
+        print(f"[Recompress] Directory changed: {directory}")
+        if was_running:
+            self.start()
+
+    def is_idle(self):
+        """사용자 입력이 없고 CPU가 한가한지 확인 (CPU 사용률은 1초 동안 측정)"""
+        idle = user_idle_seconds()
+        if idle is not None and idle < self.idle_seconds:
+            return False
+        return psutil.cpu_percent(interval=1.0) < self.cpu_percent
+
+    def pending_files(self):
+        """아직 재압축하지 않은 PNG 파일 목록 (오래된 것부터)"""
+        done = self.state["files"]
+        busy = self.busy_paths()
+        now = time.time()
+        candidates = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        for name in names:
+            if not name.lower().endswith(".png"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            record = done.get(name)
+            if record and record.get("mtime") == stat.st_mtime and record.get("size") == stat.st_size:
+                continue  # 이미 처리했고 이후 바뀌지 않음
+            if path in busy or now - stat.st_mtime < self.MIN_FILE_AGE:
+                continue
+            candidates.append((stat.st_mtime, path))
+        return [path for _, path in sorted(candidates)]
+
+    def _run(self):
+        _lower_thread_priority()
+        while not self._stop_event.is_set():
+            try:
+                files = self.pending_files()
+                if not files:
+                    self._stop_event.wait(self.SCAN_INTERVAL)
+                    continue
+                for path in files:
+                    # 파일마다 유휴 상태를 다시 확인 (사용자가 돌아오면 바로 멈춤)
+                    while not self._stop_event.is_set() and not self.is_idle():
+                        self._stop_event.wait(self.idle_seconds / 4)
+                    if self._stop_event.is_set():
+                        return
+                    self.recompress(path)
+            except Exception as e:
+                print(f"[Recompress] Error in recompression loop: {e}")
+                traceback.print_exc()
+                self._stop_event.wait(self.SCAN_INTERVAL)
+
+    def recompress(self, path):
+        """
+        파일 하나를 최대 압축으로 다시 저장
+        :return: 절약한 바이트 (교체하지 않았으면 0)
+        """
+        directory, name = os.path.split(path)
+        stat = os.stat(path)
+        # 교체 전에 원본 파일을 닫아야 함 (Windows는 열린 파일을 교체할 수 없음)
+        with Image.open(path) as source:
+            image = source.copy()
+        original_pixels = image.tobytes()
+
+        if self.target == "webp":
+            new_path = os.path.splitext(path)[0] + ".webp"
+            options = {"format": "WEBP", "lossless": True, "quality": 100, "method": 6}
+        else:
+            new_path = path
+            options = {"format": "PNG", "optimize": True}
+        if new_path != path and os.path.exists(new_path):
+            print(f"[Recompress] Skipped {name}: {os.path.basename(new_path)} already exists")
+            self._record(name, stat, 0)
+            return 0
+
+        temp_path = os.path.join(directory, f".{name}.recompress.tmp")
+        try:
+            image.save(temp_path, **options)
+            # 디코드 결과가 원본과 픽셀 단위로 같은지 확인
+            with Image.open(temp_path) as encoded:
+                identical = encoded.convert(image.mode).tobytes() == original_pixels
+            new_size = os.path.getsize(temp_path)
+            if not identical or new_size >= stat.st_size or self._stop_event.is_set():
+                os.remove(temp_path)
+                if not self._stop_event.is_set():
+                    print(f"[Recompress] Kept {name}: {'pixels differ' if not identical else 'not smaller'}")
+                    self._record(name, stat, 0)
+                return 0
+            # 원본이 처리 중에 바뀌었으면 교체하지 않음 (다음 검사에서 다시 처리)
+            if os.stat(path).st_mtime != stat.st_mtime:
+                os.remove(temp_path)
+                return 0
+            # 수정 시각을 유지해 캡처 날짜순 정렬이 바뀌지 않도록 함
+            os.utime(temp_path, (stat.st_atime, stat.st_mtime))
+            os.replace(temp_path, new_path)
+            if new_path != path:
+                os.remove(path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        saved = stat.st_size - new_size
+        new_stat = os.stat(new_path)
+        self._record(os.path.basename(new_path), new_stat, saved)
+        if new_path != path:
+            self.state["files"].pop(name, None)
+        self._save_state()
+        print(f"[Recompress] {name} -> {os.path.basename(new_path)}: {stat.st_size / 1024:.0f} KB -> "
+              f"{new_size / 1024:.0f} KB (total reclaimed {self.bytes_reclaimed / 1024 / 1024:.1f} MB)")
+        if self.on_replaced is not None:
+            self.on_replaced(path, new_path)
+        return saved
+
+    def _record(self, name, stat, saved):
+        self.state["files"][name] = {"mtime": stat.st_mtime, "size": stat.st_size, "saved": saved}
+        self.state["bytes_reclaimed"] = self.bytes_reclaimed + saved
+        if not saved:
+            self._save_state()
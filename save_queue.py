@@ -0,0 +1,109 @@
+import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class SaveQueue(QObject):
+    """
+    백그라운드 저장 큐
+    이미지 인코딩(zlib)과 디스크 쓰기를 스레드 풀에서 수행하여 GUI 스레드(단축키 처리 포함)를 막지 않습니다.
+    완료/실패는 Qt 시그널로 알리며, 작업자 스레드에서 emit해도 수신 측(GUI 스레드)에서 큐잉되어 실행됩니다.
+    """
+    # 저장 완료 시그널 (저장된 파일 경로)
+    saveFinished = pyqtSignal(str)
+    # 저장 실패 시그널 (파일 경로, 오류 메시지)
+    saveFailed = pyqtSignal(str, str)
+
+    def __init__(self, max_workers=2, max_pending=4, encoder=None, history=None, parent=None):
+        """
+        :param max_workers: 동시에 인코딩/저장할 작업자 스레드 수
+        :param max_pending: 대기 + 진행 중 작업의 최대 개수 (초과 시 submit이 거부됨)
+        :param encoder: 저장 형식/품질을 정하는 ImageEncoder (None이면 확장자에 따른 기본값)
+        :param history: 저장 후 기록할 CaptureHistory (None이면 기록 안 함)
+        """
+        super().__init__(parent)
+        self.encoder = encoder
+        self.history = history
+        self.max_pending = max(1, max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="SaveWorker")
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def pending_count(self):
+        """대기 + 진행 중인 저장 작업 수"""
+        with self._lock:
+            return self._pending
+
+    def submit(self, capture, filepath, block=False):
+        """
+        저장 작업을 큐에 추가
+        :param capture: 저장할 CaptureResult (작업 중 교체되어도 안전하도록 참조만 보관)
+        :param filepath: 저장할 파일 경로
+        :param block: True이면 큐에 자리가 날 때까지 대기 (GUI 스레드에서는 사용하지 않음)
+        :return: 큐에 추가되었으면 True, 큐가 가득 찼거나 종료된 경우 False
+        """
+        if self._closed:
+            print("[Save Queue] Queue is closed, rejecting save request.")
+            return False
+        # 큐가 가득 차면 GUI 스레드를 막지 않고 바로 거부 (block=True인 경우 자리가 날 때까지 대기)
+        if not self._slots.acquire(blocking=block):
+            print(f"[Save Queue] Queue is full ({self.max_pending} pending), rejecting: {filepath}")
+            return False
+        with self._lock:
+            self._pending += 1
+        try:
+            self._executor.submit(self._run, capture, filepath)
+        except RuntimeError as e:
+            # 종료 중인 executor에 제출한 경우
+            self._release()
+            print(f"[Save Queue] Failed to submit save job: {e}")
+            return False
+        print(f"[Save Queue] Queued save: {filepath} (pending: {self.pending_count})")
+        return True
+
+    def _run(self, capture, filepath):
+        """작업자 스레드에서 실행: 디렉토리 생성, 인코딩, 저장"""
+        try:
+            directory = os.path.dirname(filepath)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory, exist_ok=True)
+                print(f"Save directory created: {directory}")
+            capture.save(filepath, self.encoder)
+            print(f"[Save Queue] Saved: {filepath}")
+            self._record_history(filepath, capture)
+            self.saveFinished.emit(filepath)
+        except Exception as e:
+            print(f"[Save Queue] Error saving {filepath}: {e}")
+            traceback.print_exc()
+            self.saveFailed.emit(filepath, str(e))
+        finally:
+            self._release()
+
+    def _record_history(self, filepath, capture):
+        """기록 색인에 추가 (실패해도 저장 자체는 성공으로 처리)"""
+        if self.history is None:
+            return
+        try:
+            self.history.record(filepath, capture)
+        except Exception as e:
+            print(f"[Save Queue] Failed to record history for {filepath}: {e}")
+            traceback.print_exc()
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def shutdown(self, wait=True):
+        """
+        큐 종료
+        :param wait: True이면 대기 중인 저장 작업이 모두 끝날 때까지 기다림 (종료 시 캡처 유실 방지)
+        """
+        self._closed = True
+        self._executor.shutdown(wait=wait)
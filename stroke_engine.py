@@ -0,0 +1,95 @@
+import math
+
+from PyQt5.QtCore import Qt, QRect, QPoint
+from PyQt5.QtGui import QImage, QPainter, QPen, QColor
+
+
+class StrokeBuffer:
+    """
+    펜/하이라이트 획 하나를 위한 작은 버퍼
+    획이 지나간 영역 크기의 투명 이미지에 선분을 누적하고, 마우스를 놓을 때 한 번만 원본에 합칩니다.
+    버퍼에는 불투명 색으로 그리고 합칠 때 투명도를 적용하므로, 반투명 획이 겹치는 부분도 진해지지 않습니다.
+    """
+    GROW_MARGIN = 128  # 버퍼를 키울 때 미리 확보할 여유 (픽셀)
+
+    def __init__(self, color, thickness):
+        """
+        :param color: 획 색상 (알파 값은 합칠 때의 투명도로 사용)
+        :param thickness: 획 두께 (이미지 픽셀)
+        """
+        self.color = QColor(color.red(), color.green(), color.blue(), 255)
+        self.opacity = color.alpha() / 255.0
+        self.thickness = thickness
+        self.points = []  # 입력된 점 (이미지 좌표)
+        self.buffer = None  # 획 영역 크기의 ARGB 이미지
+        self.origin = QPoint()  # 버퍼 (0, 0)의 이미지 좌표
+        self.bounds = QRect()  # 실제로 그려진 영역 (이미지 좌표)
+
+    def is_empty(self):
+        return self.bounds.isEmpty()
+
+    def add_point(self, point):
+        """
+        점을 추가하고 직전 점과 잇는 선분을 버퍼에 그림
+        :param point: 이미지 좌표 (QPoint)
+        :return: 새로 그려진 영역 (이미지 좌표 QRect, 그린 것이 없으면 빈 QRect)
+        """
+        previous = self.points[-1] if self.points else None
+        self.points.append(QPoint(point))
+        if previous is None or previous == point:
+            return QRect()
+        pad = int(math.ceil(self.thickness / 2)) + 2
+        segment_rect = QRect(previous, point).normalized().adjusted(-pad, -pad, pad, pad)
+        self._ensure_capacity(segment_rect)
+
+        painter = QPainter(self.buffer)
+        painter.translate(-self.origin)
+        painter.setPen(QPen(self.color, self.thickness, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.drawLine(previous, point)
+        painter.end()
+
+        self.bounds = self.bounds.united(segment_rect)
+        return segment_rect
+
+    def _ensure_capacity(self, rect):
+        """rect가 버퍼 안에 들어가도록 버퍼 확장 (확장 시 여유를 두어 재할당 횟수를 줄임)"""
+        current = QRect(self.origin, self.buffer.size()) if self.buffer is not None else QRect()
+        if current.contains(rect):
+            return
+        margin = max(self.GROW_MARGIN, max(current.width(), current.height()) // 2)
+        grown = rect.adjusted(-margin, -margin, margin, margin)
+        if not current.isNull():
+            grown = grown.united(current)
+        buffer = QImage(grown.size(), QImage.Format_ARGB32_Premultiplied)
+        buffer.fill(Qt.transparent)
+        if self.buffer is not None:
+            painter = QPainter(buffer)
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.drawImage(current.topLeft() - grown.topLeft(), self.buffer)
+            painter.end()
+        self.buffer = buffer
+        self.origin = grown.topLeft()
+
+    def paint(self, painter):
+        """painter(이미지 좌표 기준)에 현재까지의 획 그리기 (미리보기)"""
+        if self.buffer is None:
+            return
+        painter.save()
+        painter.setOpacity(self.opacity)
+        painter.drawImage(self.origin, self.buffer)
+        painter.restore()
+
+    def commit(self, image):
+        """
+        획을 이미지에 한 번에 합침
+        :param image: 대상 QImage
+        :return: 바뀐 영역 (이미지 좌표 QRect)
+        """
+        if self.buffer is None or self.bounds.isEmpty():
+            return QRect()
+        painter = QPainter(image)
+        painter.setOpacity(self.opacity)
+        painter.drawImage(self.origin, self.buffer)
+        painter.end()
+        return self.bounds.intersected(image.rect())
@@ -0,0 +1,136 @@
+import os
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtCore import QSize, Qt
+from PyQt5.QtGui import QImage
+
+
+class ThumbnailCache:
+    """
+    디스크 썸네일/미리보기 캐시 (용량 제한 LRU)
+    축소 이미지를 (키, 크기)별 JPEG 파일로 보관해 같은 캡처를 다시 볼 때 원본을 디코드하지 않습니다.
+    키는 캡처 기록의 픽셀 해시이므로 파일 이름이 바뀌거나 재압축되어도 그대로 재사용됩니다.
+    최근 사용 순서는 파일 수정 시각으로 기록해 다음 실행에도 유지하며, 합계가 예산을 넘으면 가장 오래 쓰지 않은 파일부터 지웁니다.
+    여러 작업자 스레드에서 동시에 사용할 수 있습니다.
+    """
+    QUALITY = 85  # 캐시 JPEG 화질
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        """
+        :param directory: 캐시 폴더 (없으면 생성)
+        :param max_bytes: 캐시 파일 합계의 최대 크기 (바이트)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # 파일 이름 -> 크기 (앞쪽이 오래 쓰지 않은 것)
+        self._total = 0
+        self._load_index()
+
+    def _load_index(self):
+        """폴더의 캐시 파일을 수정 시각(마지막 사용 시각) 순으로 읽어 LRU 순서 복원"""
+        files = []
+        for item in os.scandir(self.directory):
+            if not item.is_file():
+                continue
+            if item.name.endswith(".tmp"):
+                # 쓰다가 종료된 임시 파일
+                self._remove(item.name)
+                continue
+            stat = item.stat()
+            files.append((stat.st_mtime, item.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._total += size
+        self._evict()
+
+    @property
+    def total_bytes(self):
+        with self._lock:
+            return self._total
+
+    @staticmethod
+    def _name(key, size):
+        return f"{key}_{size.width()}x{size.height()}.jpg"
+
+    def path_for(self, key, size):
+        """(키, 크기)에 해당하는 캐시 파일 경로"""
+        return os.path.join(self.directory, self._name(key, size))
+
+    def get(self, key, size):
+        """
+        캐시된 축소 이미지 반환 (사용 시각 갱신)
+        :param key: 내용 키 (픽셀 해시)
+        :param size: 최대 크기 (QSize)
+        :return: QImage, 없으면 None
+        """
+        name = self._name(key, size)
+        with self._lock:
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+        path = os.path.join(self.directory, name)
+        image = QImage(path)
+        if image.isNull():
+            # 밖에서 지워졌거나 손상된 파일
+            with self._lock:
+                self._total -= self._entries.pop(name, 0)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return image
+
+    def put(self, key, size, image):
+        """축소 이미지 저장 (임시 파일에 쓴 뒤 교체하므로 읽는 쪽이 덜 쓰인 파일을 보지 않음)"""
+        name = self._name(key, size)
+        path = os.path.join(self.directory, name)
+        temp_path = path + f".{threading.get_ident()}.tmp"
+        if not image.save(temp_path, "JPG", self.QUALITY):
+            return
+        os.replace(temp_path, path)
+        file_size = os.path.getsize(path)
+        with self._lock:
+            self._total += file_size - self._entries.pop(name, 0)
+            self._entries[name] = file_size
+        self._evict()
+
+    def invalidate(self, key):
+        """키의 모든 크기 삭제 (원본 파일이 편집으로 바뀌었을 때)"""
+        prefix = f"{key}_"
+        with self._lock:
+            names = [name for name in self._entries if name.startswith(prefix)]
+            for name in names:
+                self._total -= self._entries.pop(name)
+        for name in names:
+            self._remove(name)
+        if names:
+            print(f"[Thumbnail Cache] Invalidated {len(names)} entries for {key}")
+
+    def _evict(self):
+        """예산을 넘으면 가장 오래 쓰지 않은 파일부터 삭제"""
+        removed = []
+        with self._lock:
+            while self._total > self.max_bytes and self._entries:
+                name, file_size = self._entries.popitem(last=False)
+                self._total -= file_size
+                removed.append(name)
+        for name in removed:
+            self._remove(name)
+
+    def _remove(self, name):
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            # 다른 스레드가 읽는 중(Windows) 등: 다음 실행의 색인 로드 때 다시 정리됨
+            pass
+
+
+def thumbnail_size(source, size):
+    """원본 크기(QSize)를 비율을 유지한 채 size 안에 맞춘 크기 (확대하지 않음)"""
+    if source.width() <= size.width() and source.height() <= size.height():
+        return QSize(source)
+    return source.scaled(size, Qt.KeepAspectRatio)
@@ -0,0 +1,127 @@
+import math
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt, QRect, QRectF
+from PyQt5.QtGui import QPainter, QPixmap
+
+
+class TilePyramid:
+    """
+    편집 이미지의 밉맵 피라미드 (타일 단위 QPixmap 캐시)
+    레벨 0은 원본, 레벨 k는 1/2^k 축소본이며, 화면 배율에 맞는 레벨에서 보이는 타일만 그립니다.
+    축소 레벨과 타일은 처음 필요할 때 만들고, 편집 시에는 바뀐 영역만 다시 만듭니다.
+    """
+    TILE_SIZE = 256
+
+    def __init__(self, image, tile_size=TILE_SIZE, max_tiles=256):
+        """
+        :param image: 원본 QImage (복사하면 편집할 때마다 분리 복사가 일어나므로 같은 객체를 그대로 참조)
+        :param tile_size: 타일 한 변의 크기 (픽셀)
+        :param max_tiles: 보관할 타일 QPixmap 최대 개수 (초과 시 가장 오래 쓰지 않은 타일부터 버림)
+        """
+        self.image = image
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self._levels = {0: image}  # 레벨 -> QImage (1 이상은 처음 필요할 때 생성)
+        self._tiles = OrderedDict()  # (레벨, tx, ty) -> QPixmap, 최근 사용 순
+        # 가장 작은 레벨: 이미지 전체가 타일 하나에 들어가는 크기
+        longest = max(image.width(), image.height(), 1)
+        self.max_level = max(0, math.ceil(math.log2(longest / tile_size))) if longest > tile_size else 0
+
+    def level_for_scale(self, scale):
+        """화면 배율에 맞는 레벨 (표시 크기보다 작지 않은 가장 작은 축소본)"""
+        if scale >= 1.0 or scale <= 0:
+            return 0
+        return min(int(math.floor(math.log2(1.0 / scale))), self.max_level)
+
+    def level_image(self, level):
+        """레벨 이미지 (없으면 바로 위 레벨을 절반으로 축소해 생성)"""
+        image = self._levels.get(level)
+        if image is None:
+            parent = self.level_image(level - 1)
+            image = parent.scaled(max(1, (parent.width() + 1) // 2), max(1, (parent.height() + 1) // 2),
+                                  Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            self._levels[level] = image
+        return image
+
+    def tile(self, level, tx, ty):
+        """타일 QPixmap (캐시에 없으면 레벨 이미지에서 잘라 생성)"""
+        key = (level, tx, ty)
+        pixmap = self._tiles.get(key)
+        if pixmap is None:
+            size = self.tile_size
+            source = self.level_image(level)
+            rect = QRect(tx * size, ty * size, size, size).intersected(source.rect())
+            pixmap = QPixmap.fromImage(source.copy(rect))
+            self._tiles[key] = pixmap
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+        else:
+            self._tiles.move_to_end(key)
+        return pixmap
+
+    def invalidate(self, img_rect):
+        """
+        원본의 일부가 바뀌었을 때 호출: 만들어진 축소 레벨의 해당 영역을 다시 축소하고 겹치는 타일을 버림
+        :param img_rect: 바뀐 영역 (원본 이미지 좌표, QRect)
+        """
+        rect = img_rect.intersected(self.image.rect())
+        if rect.isEmpty():
+            return
+        level_rects = {0: rect}
+        for level in range(1, self.max_level + 1):
+            parent_rect = level_rects[level - 1]
+            # 절반 크기 레벨에서 바깥쪽으로 맞춘 영역
+            left, top = parent_rect.left() // 2, parent_rect.top() // 2
+            right, bottom = (parent_rect.right() + 2) // 2, (parent_rect.bottom() + 2) // 2
+            level_rects[level] = QRect(left, top, right - left, bottom - top)
+            image = self._levels.get(level)
+            if image is None:
+                continue
+            dest = level_rects[level].intersected(image.rect())
+            parent = self._levels[level - 1]
+            source = QRectF(dest.x() * 2, dest.y() * 2, dest.width() * 2, dest.height() * 2)
+            painter = QPainter(image)
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+            painter.drawImage(QRectF(dest), parent, source.intersected(QRectF(parent.rect())))
+            painter.end()
+        size = self.tile_size
+        for key in [key for key in self._tiles if key[0] in level_rects]:
+            level, tx, ty = key
+            if level_rects[level].intersects(QRect(tx * size, ty * size, size, size)):
+                del self._tiles[key]
+
+    def draw(self, painter, origin, scale, clip_rect):
+        """
+        보이는 타일만 그림
+        :param painter: 대상 QPainter (위젯 좌표)
+        :param origin: 원본 이미지 (0, 0)의 위젯 좌표 (QPointF)
+        :param scale: 원본 1픽셀의 표시 크기 (위젯 픽셀)
+        :param clip_rect: 다시 그릴 위젯 영역 (QRect)
+        :return: 그린 타일 수
+        """
+        level = self.level_for_scale(scale)
+        source = self.level_image(level)
+        factor = 2 ** level
+        level_scale = scale * factor  # 레벨 1픽셀의 표시 크기
+        size = self.tile_size
+
+        # 다시 그릴 영역에 해당하는 레벨 좌표 범위
+        first_x = max(0, int((clip_rect.left() - origin.x()) / level_scale) // size)
+        first_y = max(0, int((clip_rect.top() - origin.y()) / level_scale) // size)
+        last_x = min((source.width() - 1) // size, int((clip_rect.right() + 1 - origin.x()) / level_scale) // size)
+        last_y = min((source.height() - 1) // size, int((clip_rect.bottom() + 1 - origin.y()) / level_scale) // size)
+
+        drawn = 0
+        for ty in range(first_y, last_y + 1):
+            for tx in range(first_x, last_x + 1):
+                pixmap = self.tile(level, tx, ty)
+                # 이웃 타일 사이에 틈이 생기지 않도록 경계를 같은 규칙으로 반올림
+                left = round(origin.x() + tx * size * level_scale)
+                top = round(origin.y() + ty * size * level_scale)
+                right = round(origin.x() + (tx * size + pixmap.width()) * level_scale)
+                bottom = round(origin.y() + (ty * size + pixmap.height()) * level_scale)
+                painter.drawPixmap(QRect(left, top, right - left, bottom - top), pixmap, pixmap.rect())
+                drawn += 1
+        return drawn
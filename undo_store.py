@@ -0,0 +1,358 @@
+import zlib
+
+from PyQt5.QtGui import QImage, QTransform
+
+
+class _UndoEntry:
+    """
+    실행 취소 항목 하나
+    적용(apply)하면 이미지를 다른 쪽 상태로 바꾸고, 항목에는 바꾸기 전 상태가 남습니다. (undo/redo 공용)
+    """
+    kind = None
+
+    def apply(self, image):
+        raise NotImplementedError
+
+    @property
+    def nbytes(self):
+        return 0
+
+    def compress(self):
+        """보관 데이터 압축 (오래된 항목용)"""
+        pass
+
+
+class _TileEntry(_UndoEntry):
+    """변경된 타일만 보관하는 항목 (펜, 도형, 모자이크, 텍스트 등)"""
+    kind = "tiles"
+
+    def __init__(self, tiles):
+        # tiles: [(x, y, w, h, bytes)], bytes는 다른 쪽 상태의 타일 픽셀 (압축 시 zlib)
+        self.tiles = tiles
+        self.compressed = False
+
+    @property
+    def nbytes(self):
+        return sum(len(tile[4]) for tile in self.tiles)
+
+    def compress(self):
+        if not self.compressed:
+            self.tiles = [(x, y, w, h, zlib.compress(data, 1)) for x, y, w, h, data in self.tiles]
+            self.compressed = True
+
+    def apply(self, image):
+        image = QImage(image)
+        bpp = image.depth() // 8
+        bpl = image.bytesPerLine()
+        view = _writable_view(image)
+        swapped = []
+        for x, y, w, h, data in self.tiles:
+            if self.compressed:
+                data = zlib.decompress(data)
+            row_bytes = w * bpp
+            current = bytearray(row_bytes * h)
+            for row in range(h):
+                start = (y + row) * bpl + x * bpp
+                current[row * row_bytes:(row + 1) * row_bytes] = view[start:start + row_bytes]
+                view[start:start + row_bytes] = data[row * row_bytes:(row + 1) * row_bytes]
+            swapped.append((x, y, w, h, bytes(current)))
+        # 바뀐 타일은 최근 사용 데이터이므로 압축하지 않은 상태로 보관
+        self.tiles = swapped
+        self.compressed = False
+        return image
+
+
+class _FullEntry(_UndoEntry):
+    """이미지 전체를 보관하는 항목 (자르기 등 크기/형식이 바뀌는 작업)"""
+    kind = "full"
+
+    def __init__(self, image):
+        self.image = image
+        self.packed = None  # 압축된 (bytes, width, height, bytesPerLine, format)
+
+    @property
+    def nbytes(self):
+        if self.packed is not None:
+            return len(self.packed[0])
+        return self.image.byteCount()
+
+    def compress(self):
+        if self.packed is None:
+            image = self.image
+            ptr = image.constBits()
+            ptr.setsize(image.byteCount())
+            self.packed = (zlib.compress(ptr.asstring(), 1), image.width(), image.height(),
+                           image.bytesPerLine(), image.format())
+            self.image = None
+
+    def apply(self, image):
+        stored = self.image
+        if stored is None:
+            data, width, height, bpl, image_format = self.packed
+            stored = QImage(zlib.decompress(data), width, height, bpl, image_format).copy()
+        self.image, self.packed = image, None
+        return stored
+
+
+class _TransformEntry(_UndoEntry):
+    """픽셀 없이 역연산만 보관하는 항목 (뒤집기, 90도 회전)"""
+    kind = "transform"
+
+    def __init__(self, operation, *args):
+        self.operation = operation
+        self.args = args
+        self.inverted = True  # True: 적용 시 역연산 (undo 방향)
+
+    def apply(self, image):
+        if self.operation == "mirror":
+            # 뒤집기는 자기 자신이 역연산
+            result = image.mirrored(*self.args)
+        else:
+            degrees = -self.args[0] if self.inverted else self.args[0]
+            transform = QTransform()
+            transform.rotate(degrees)
+            result = image.transformed(transform)
+        self.inverted = not self.inverted
+        return result
+
+
+class _ChangeEntry(_UndoEntry):
+    """이미지 밖의 상태 변경 (주석 레이어 등): 되돌리기/다시 하기 함수 쌍만 보관"""
+    kind = "change"
+
+    def __init__(self, undo_fn, redo_fn):
+        self.undo_fn = undo_fn
+        self.redo_fn = redo_fn
+        self.undone = False
+
+    def apply(self, image):
+        (self.redo_fn if self.undone else self.undo_fn)()
+        self.undone = not self.undone
+        return image
+
+
+class _CompositeEntry(_UndoEntry):
+    """한 번의 작업으로 함께 바뀐 이미지와 기타 상태 (예: 뒤집기 + 주석 레이어 변환)"""
+    kind = "composite"
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    @property
+    def nbytes(self):
+        return sum(entry.nbytes for entry in self.entries)
+
+    def compress(self):
+        for entry in self.entries:
+            entry.compress()
+
+    def apply(self, image):
+        for entry in self.entries:
+            image = entry.apply(image)
+        # 다음 적용(반대 방향)은 역순으로
+        self.entries.reverse()
+        return image
+
+
+def _writable_view(image):
+    ptr = image.bits()  # 쓰기 가능한 버퍼 (공유 중이면 여기서 분리됨)
+    ptr.setsize(image.byteCount())
+    return memoryview(ptr)
+
+
+def _readonly_view(image):
+    """이미지 버퍼를 복사하지 않는 읽기 전용 뷰 (필요한 행/열만 잘라서 비교)"""
+    ptr = image.constBits()
+    ptr.setsize(image.byteCount())
+    return memoryview(ptr).toreadonly()
+
+
+def _rows_equal(old, new, start, row_bytes, rows, bpl):
+    """start부터 rows개 행의 row_bytes 구간이 같은지 (행마다 해당 구간만 복사해 비교)"""
+    if row_bytes == bpl:
+        end = start + rows * bpl
+        return old[start:end].tobytes() == new[start:end].tobytes()
+    for row in range(rows):
+        offset = start + row * bpl
+        if old[offset:offset + row_bytes].tobytes() != new[offset:offset + row_bytes].tobytes():
+            return False
+    return True
+
+
+class UndoStore:
+    """
+    메모리 예산이 있는 실행 취소/다시 실행 저장소
+    작업 후 상태를 넘기면 직전 상태와 타일 단위로 비교해 바뀐 타일만 보관하고,
+    뒤집기/회전은 역연산만 기록합니다. 오래된 항목은 압축하며, 예산을 넘으면 가장 오래된 항목부터 버립니다.
+    """
+    def __init__(self, budget_bytes=256 * 1024 * 1024, tile_size=128, hot_entries=8):
+        """
+        :param budget_bytes: 항목 데이터의 최대 메모리 (바이트)
+        :param tile_size: 비교/보관 타일 크기 (픽셀)
+        :param hot_entries: 압축하지 않고 둘 최근 항목 수
+        """
+        self.budget_bytes = budget_bytes
+        self.tile_size = tile_size
+        self.hot_entries = hot_entries
+        self._undo = []
+        self._redo = []
+        self._current = None  # 마지막으로 기록된 상태 (QImage, 암시적 공유)
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    @property
+    def memory_bytes(self):
+        """항목 데이터가 차지하는 메모리 (바이트, 현재 상태 이미지 제외)"""
+        return sum(entry.nbytes for entry in self._undo) + sum(entry.nbytes for entry in self._redo)
+
+    def current_image(self):
+        """마지막으로 기록된 상태 (작업 중 오류 발생 시 복구용)"""
+        return QImage(self._current) if self._current is not None else None
+
+    def reset(self, image):
+        """모든 기록을 지우고 주어진 이미지를 기준 상태로 설정"""
+        self._undo.clear()
+        self._redo.clear()
+        self._current = QImage(image)
+
+    def push(self, image, change=None, dirty_rect=None):
+        """
+        작업 후 상태 기록 (직전 상태와 다른 타일만 보관)
+        :param image: 작업 후 이미지 (QImage)
+        :param change: 함께 바뀐 이미지 밖의 상태 (undo_fn, redo_fn), 없으면 None
+        :param dirty_rect: 바뀐 영역을 알고 있으면 그 영역 (QRect, 겹치는 타일만 비교), 모르면 None
+        """
+        if self._current is None:
+            self.reset(image)
+            return
+        previous = self._current
+        if (previous.size() != image.size() or previous.format() != image.format()
+                or previous.depth() < 8):
+            entry = _FullEntry(previous)
+        else:
+            tiles = self._diff_tiles(previous, image, dirty_rect)
+            if not tiles:
+                if change is not None:
+                    self.push_change(*change)
+                return  # 바뀐 것이 없으면 기록하지 않음
+            entry = _TileEntry(tiles)
+        self._record(self._with_change(entry, change), image)
+
+    def push_transform(self, image, operation, *args, change=None):
+        """
+        역연산으로 되돌릴 수 있는 작업 기록 (픽셀 보관 없음)
+        :param image: 작업 후 이미지
+        :param operation: "mirror" (args: horizontal, vertical) 또는 "rotate" (args: degrees, 90의 배수)
+        :param change: 함께 바뀐 이미지 밖의 상태 (undo_fn, redo_fn), 없으면 None
+        """
+        if self._current is None:
+            self.reset(image)
+            return
+        self._record(self._with_change(_TransformEntry(operation, *args), change), image)
+
+    def push_change(self, undo_fn, redo_fn):
+        """
+        이미지는 그대로이고 다른 상태만 바뀐 작업 기록 (예: 주석 도형 추가/이동, 항목 크기는 수십 바이트)
+        :param undo_fn: 되돌릴 때 호출할 함수
+        :param redo_fn: 다시 실행할 때 호출할 함수
+        """
+        if self._current is None:
+            return
+        self._record(_ChangeEntry(undo_fn, redo_fn), self._current)
+
+    @staticmethod
+    def _with_change(entry, change):
+        if change is None:
+            return entry
+        return _CompositeEntry([entry, _ChangeEntry(*change)])
+
+    def undo(self):
+        """
+        실행 취소
+        :return: 복원된 이미지 (QImage), 취소할 항목이 없으면 None
+        """
+        if not self._undo:
+            return None
+        entry = self._undo.pop()
+        self._current = entry.apply(self._current)
+        self._redo.append(entry)
+        self._enforce_budget()
+        return QImage(self._current)
+
+    def redo(self):
+        """
+        다시 실행
+        :return: 복원된 이미지 (QImage), 다시 실행할 항목이 없으면 None
+        """
+        if not self._redo:
+            return None
+        entry = self._redo.pop()
+        self._current = entry.apply(self._current)
+        self._undo.append(entry)
+        self._enforce_budget()
+        return QImage(self._current)
+
+    def _record(self, entry, image):
+        self._undo.append(entry)
+        # 새로운 동작이 생기면 Redo 기록은 비워야 함
+        self._redo.clear()
+        self._current = QImage(image)
+        self._enforce_budget()
+
+    def _enforce_budget(self):
+        # 최근 항목을 제외한 오래된 항목 압축
+        for entry in self._undo[:-self.hot_entries] if self.hot_entries else self._undo:
+            entry.compress()
+        for entry in self._redo[:-self.hot_entries] if self.hot_entries else self._redo:
+            entry.compress()
+        # 예산 초과 시 가장 오래된 실행 취소 항목부터, 그다음 가장 먼 다시 실행 항목부터 버림
+        total = self.memory_bytes
+        while total > self.budget_bytes and (self._undo or self._redo):
+            dropped = self._undo.pop(0) if self._undo else self._redo.pop(0)
+            total -= dropped.nbytes
+
+    def _diff_tiles(self, previous, image, region=None):
+        """
+        두 이미지에서 내용이 다른 타일 목록 (previous 쪽 픽셀 보관, region이 있으면 겹치는 타일만 비교)
+        버퍼는 복사하지 않고, 비교할 타일 범위의 행/열만 잘라 읽습니다.
+        """
+        width, height = image.width(), image.height()
+        bpp = image.depth() // 8
+        bpl = image.bytesPerLine()
+        old = _readonly_view(previous)
+        new = _readonly_view(image)
+        size = self.tile_size
+        first_row, last_row, first_col, last_col = 0, height, 0, width
+        if region is not None:
+            region = region.intersected(image.rect())
+            if region.isEmpty():
+                return []
+            first_row, last_row = region.top() // size * size, region.bottom() + 1
+            first_col, last_col = region.left() // size * size, region.right() + 1
+        # 비교할 타일 열 전체의 바이트 구간 (마지막 타일은 이미지 끝까지)
+        span_end = min(width, -(-last_col // size) * size)
+        span_start, span_bytes = first_col * bpp, (span_end - first_col) * bpp
+        if span_bytes == width * bpp:
+            span_bytes = bpl  # 전체 폭이면 행 패딩까지 한 번에 비교
+        tiles = []
+        for top in range(first_row, last_row, size):
+            rows = min(size, height - top)
+            band_start = top * bpl
+            # 타일 한 줄(밴드)의 비교 구간이 모두 같으면 건너뜀 (대부분의 작업은 일부 영역만 바꿈)
+            if _rows_equal(old, new, band_start + span_start, span_bytes, rows, bpl):
+                continue
+            for left in range(first_col, last_col, size):
+                cols = min(size, width - left)
+                row_bytes = cols * bpp
+                offsets = [band_start + row * bpl + left * bpp for row in range(rows)]
+                old_tile = b"".join(old[offset:offset + row_bytes] for offset in offsets)
+                new_tile = b"".join(new[offset:offset + row_bytes] for offset in offsets)
+                if old_tile != new_tile:
+                    tiles.append((left, top, cols, rows, old_tile))
+        return tiles
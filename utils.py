@@ -4,6 +4,7 @@ import platform
 import ctypes
 from PIL import Image
 from PyQt5.QtGui import QImage, QImageReader
+from PyQt5.QtCore import QPoint, QPointF, QRect, QRectF
 
 # 리소스 경로를 얻는 함수 (패키징 여부에 관계없이 작동)
 def get_resource_path(relative_path):
@@ -41,6 +42,91 @@ def qimage_to_pil(qimage):
     
     return pil_image 
 
+def pixelate_region(image, rect, block_size):
+    """
+    이미지의 지정 영역을 블록 평균색으로 모자이크 처리한 QImage 반환 (원본은 수정하지 않음)
+    대상 영역만 복사한 뒤 PIL의 reduce(블록 평균)와 NEAREST 확대로 처리하므로 픽셀 단위 파이썬 반복이 없습니다.
+    :param image: 원본 QImage
+    :param rect: 처리할 영역 (QRect, 이미지 경계 안쪽)
+    :param block_size: 블록 크기 (픽셀)
+    :return: rect 크기의 모자이크 QImage (Format_ARGB32)
+    """
+    region = image.copy(rect).convertToFormat(QImage.Format_ARGB32)
+    width, height = region.width(), region.height()
+    ptr = region.constBits()
+    ptr.setsize(region.bytesPerLine() * height)
+    # ARGB32는 메모리상 BGRA 순서
+    pil_region = Image.frombuffer("RGBA", (width, height), ptr, "raw", "BGRA", region.bytesPerLine(), 1)
+
+    # 블록 평균 (가장자리의 남는 블록은 남은 픽셀만으로 평균)
+    reduced = pil_region.reduce(block_size)
+    # 정확히 block_size 배로 확대한 뒤 원래 크기로 잘라 블록 경계를 맞춤
+    enlarged = reduced.resize((reduced.width * block_size, reduced.height * block_size), Image.NEAREST)
+    pixelated = enlarged.crop((0, 0, width, height))
+
+    data = pixelated.tobytes("raw", "BGRA")
+    # data 버퍼 수명과 분리하기 위해 복사본 반환
+    return QImage(data, width, height, width * 4, QImage.Format_ARGB32).copy()
+
+def virtual_desktop_geometry():
+    """모든 화면을 포함하는 가상 데스크톱 영역 (논리 좌표, QRect)"""
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.primaryScreen().virtualGeometry()
+
+def screen_physical_rect(screen):
+    """
+    화면의 물리 픽셀 영역 (QRect)
+    Qt5의 High DPI 스케일링은 각 화면의 좌상단을 원래(물리) 위치에 두고 크기만 배율로 나누므로
+    좌상단은 그대로, 크기에만 devicePixelRatio를 곱합니다.
+    """
+    geometry = screen.geometry()
+    dpr = screen.devicePixelRatio()
+    return QRect(geometry.x(), geometry.y(),
+                 int(round(geometry.width() * dpr)), int(round(geometry.height() * dpr)))
+
+def logical_to_physical(point):
+    """
+    전역 논리 좌표를 물리 픽셀 좌표로 변환 (좌표가 속한 화면의 devicePixelRatio 사용)
+    :param point: 전역 논리 좌표 (QPoint)
+    :return: 물리 픽셀 좌표 (QPoint)
+    """
+    from PyQt5.QtWidgets import QApplication
+    screen = QApplication.screenAt(point) or QApplication.primaryScreen()
+    geometry = screen.geometry()
+    dpr = screen.devicePixelRatio()
+    return QPoint(int(geometry.x() + (point.x() - geometry.x()) * dpr),
+                  int(geometry.y() + (point.y() - geometry.y()) * dpr))
+
+def physical_to_logical(point):
+    """
+    물리 픽셀 좌표를 전역 논리 좌표로 변환 (logical_to_physical의 역변환)
+    :param point: 물리 픽셀 좌표 (QPoint)
+    :return: 전역 논리 좌표 (QPointF)
+    """
+    target = _screen_at_physical(point)
+    geometry = target.geometry()
+    dpr = target.devicePixelRatio()
+    return QPointF(geometry.x() + (point.x() - geometry.x()) / dpr,
+                   geometry.y() + (point.y() - geometry.y()) / dpr)
+
+def _screen_at_physical(point):
+    """물리 픽셀 좌표가 속한 화면 (없으면 주 화면)"""
+    from PyQt5.QtWidgets import QApplication
+    for screen in QApplication.screens():
+        if screen_physical_rect(screen).contains(point):
+            return screen
+    return QApplication.primaryScreen()
+
+def physical_rect_to_logical(rect):
+    """물리 픽셀 사각형을 전역 논리 좌표 사각형(QRectF)으로 변환 (좌상단/우하단 꼭짓점 기준)"""
+    top_left = physical_to_logical(rect.topLeft())
+    # 우하단은 사각형 안쪽의 마지막 픽셀을 그 화면 배율로 변환한 뒤 한 픽셀(1/dpr)만큼 더해 바깥 경계로 만듦
+    # (바깥 경계 좌표를 바로 변환하면 옆 화면의 배율이 적용될 수 있음)
+    last_pixel = rect.bottomRight()
+    pixel = 1.0 / _screen_at_physical(last_pixel).devicePixelRatio()
+    bottom_right = physical_to_logical(last_pixel) + QPointF(pixel, pixel)
+    return QRectF(top_left, bottom_right)
+
 def register_startup(enable: bool):
     """Windows 시작 프로그램에 애플리케이션을 등록하거나 해제합니다."""
     import winreg
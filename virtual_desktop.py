@@ -0,0 +1,131 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import mss
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPainter
+
+from capture_result import CaptureResult
+
+
+class VirtualDesktopGrabber:
+    """
+    모든 모니터를 스레드 풀에서 동시에 캡처하는 도구
+    mss 세션은 스레드별 자원이므로 작업자 스레드마다 따로 만들어 재사용합니다.
+    모니터 좌표는 mss 기준 물리 픽셀이므로 화면마다 배율(DPI)이 달라도 그대로 이어 붙일 수 있습니다.
+    """
+    def __init__(self, max_workers=None):
+        """
+        :param max_workers: 작업자 스레드 수 (None이면 캡처할 모니터 수에 맞춤, 모니터가 늘면 풀을 다시 만듦)
+        """
+        self._max_workers = max_workers
+        self._executor = None
+        self._workers = 0  # 현재 풀의 작업자 수
+        self._local = threading.local()
+        self._generation = 0  # reset() 시 증가, 스레드별 세션 재생성 기준
+
+    def _session(self):
+        """현재 작업자 스레드의 mss 세션 (디스플레이 구성이 바뀌면 재생성)"""
+        local = self._local
+        if getattr(local, "sct", None) is None or local.generation != self._generation:
+            if getattr(local, "sct", None) is not None:
+                local.sct.close()
+            local.sct = mss.mss()
+            local.generation = self._generation
+        return local.sct
+
+    def monitors(self):
+        """
+        개별 모니터 목록 (mss monitors[1:])
+        :return: [{"left", "top", "width", "height"}, ...]
+        """
+        # 호출한 스레드의 세션에 캐시된 모니터 목록 사용
+        return [dict(monitor) for monitor in self._session().monitors[1:]]
+
+    def _grab_monitor(self, monitor):
+        screenshot = self._session().grab(monitor)
+        return CaptureResult.from_bgra(
+            screenshot.raw, screenshot.width, screenshot.height, "monitor",
+            left=monitor["left"], top=monitor["top"])
+
+    def grab_monitors(self, monitors=None):
+        """
+        모든 모니터를 동시에 캡처
+        :param monitors: 캡처할 모니터 목록 (None이면 전체)
+        :return: 모니터별 CaptureResult 리스트 (left/top은 가상 데스크톱 기준 물리 좌표)
+        """
+        if monitors is None:
+            monitors = self.monitors()
+        workers = self._max_workers or max(len(monitors), 1)
+        if self._executor is not None and workers > self._workers:
+            # 모니터가 늘어나면 순서대로 캡처하지 않도록 풀을 새 크기로 다시 만듦
+            self._shutdown_executor()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="MonitorGrab")
+            self._workers = workers
+        return list(self._executor.map(self._grab_monitor, monitors))
+
+    def grab(self, monitors=None):
+        """
+        모든 모니터를 동시에 캡처해 하나의 가상 데스크톱 이미지로 이어 붙임
+        :return: CaptureResult (mode "virtual_desktop", left/top은 가상 데스크톱 원점)
+        """
+        return stitch_frames(self.grab_monitors(monitors))
+
+    def reset(self):
+        """디스플레이 구성 변경 시 호출: 작업자 풀과 세션을 닫고 다음 캡처에서 모니터 수에 맞춰 새로 만듦"""
+        self._generation += 1
+        self._shutdown_executor()
+
+    def close(self):
+        """작업자 스레드와 각 스레드의 mss 세션 종료"""
+        self._shutdown_executor()
+        self._close_session()
+
+    def _close_session(self, barrier=None):
+        """현재 스레드의 mss 세션 닫기 (barrier가 있으면 모든 작업자가 한 번씩 실행할 때까지 대기)"""
+        local = self._local
+        if getattr(local, "sct", None) is not None:
+            local.sct.close()
+            local.sct = None
+        if barrier is not None:
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                pass
+
+    def _shutdown_executor(self):
+        """작업자마다 자기 mss 세션을 닫게 한 뒤 풀 종료 (세션은 만든 스레드에서 닫아야 함)"""
+        if self._executor is None:
+            return
+        # 작업자 수만큼 넣고 모두 barrier에서 기다리게 하여 한 작업자가 두 번 받지 않도록 함
+        barrier = threading.Barrier(self._workers, timeout=2.0)
+        list(self._executor.map(self._close_session, [barrier] * self._workers))
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        self._workers = 0
+
+
+def stitch_frames(frames):
+    """
+    모니터별 프레임을 물리 좌표 기준으로 하나의 이미지에 배치
+    모니터가 없는 빈 영역은 검은색으로 채웁니다.
+    :param frames: CaptureResult 리스트
+    :return: CaptureResult (mode "virtual_desktop")
+    """
+    left = min(frame.left for frame in frames)
+    top = min(frame.top for frame in frames)
+    right = max(frame.left + frame.width for frame in frames)
+    bottom = max(frame.top + frame.height for frame in frames)
+
+    canvas = QImage(right - left, bottom - top, QImage.Format_RGB32)
+    canvas.fill(Qt.black)
+    painter = QPainter(canvas)
+    # 같은 형식의 이미지를 덮어쓰기만 하므로 합성 없이 복사
+    painter.setCompositionMode(QPainter.CompositionMode_Source)
+    for frame in frames:
+        painter.drawImage(frame.left - left, frame.top - top, frame.to_qimage())
+    painter.end()
+
+    return CaptureResult.from_qimage(canvas, "virtual_desktop", left=left, top=top,
+                                     timestamp=min(frame.timestamp for frame in frames))
@@ -0,0 +1,154 @@
+import sys
+import time
+import ctypes
+
+
+class WindowReadiness:
+    """
+    창 숨김/복원/활성화 완료를 고정 대기(time.sleep) 대신 실제 상태를 확인하며 기다리는 기본 클래스
+    상태 확인 함수는 플랫폼별 하위 클래스가 구현하며, 각 대기 시간(ms)을 기록해 보고합니다.
+    """
+    POLL_INTERVAL = 0.002  # 상태 확인 간격 (초)
+
+    def __init__(self, pump=None):
+        """
+        :param pump: 대기 중 반복 호출할 이벤트 처리 함수 (예: QApplication.processEvents)
+        """
+        self.pump = pump
+        self.wait_log = {}  # 대기 종류 -> 측정된 대기 시간(ms) 리스트
+
+    # --- 플랫폼별 상태 확인 (하위 클래스에서 구현) --- #
+    def is_hidden(self, hwnd):
+        raise NotImplementedError
+
+    def is_restored(self, hwnd):
+        raise NotImplementedError
+
+    def is_foreground(self, hwnd):
+        raise NotImplementedError
+
+    def wait_frame_presented(self):
+        """컴포지터가 다음 화면을 표시할 때까지 대기 (지원하지 않으면 즉시 반환)"""
+        pass
+
+    # --- 공용 대기 함수 --- #
+    def wait_until(self, label, condition, timeout):
+        """
+        조건이 참이 될 때까지 대기
+        :param label: 보고용 대기 종류 이름
+        :param condition: 인자 없는 함수, 참을 반환하면 대기 종료
+        :param timeout: 최대 대기 시간 (초)
+        :return: 조건 충족 여부 (시간 초과 시 False)
+        """
+        start = time.perf_counter()
+        deadline = start + timeout
+        while True:
+            if self.pump:
+                self.pump()
+            ready = condition()
+            if ready or time.perf_counter() >= deadline:
+                break
+            time.sleep(self.POLL_INTERVAL)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.wait_log.setdefault(label, []).append(elapsed_ms)
+        status = "ready" if ready else "timeout"
+        print(f"[Readiness] {label}: {elapsed_ms:.1f} ms ({status})")
+        return ready
+
+    def wait_hidden(self, hwnd, timeout=0.5):
+        """창이 화면에서 사라지고 그 상태가 화면에 반영될 때까지 대기"""
+        ready = self.wait_until("hide", lambda: self.is_hidden(hwnd), timeout)
+        self.wait_frame_presented()
+        return ready
+
+    def wait_restored(self, hwnd, timeout=1.0):
+        """최소화된 창이 복원될 때까지 대기"""
+        ready = self.wait_until("restore", lambda: self.is_restored(hwnd), timeout)
+        self.wait_frame_presented()
+        return ready
+
+    def wait_foreground(self, hwnd, timeout=0.5):
+        """창이 전경 창이 되고 다시 그려질 때까지 대기"""
+        ready = self.wait_until("foreground", lambda: self.is_foreground(hwnd), timeout)
+        self.wait_frame_presented()
+        return ready
+
+    def summary(self):
+        """
+        측정된 대기 시간 요약
+        :return: {대기 종류: (횟수, 평균 ms, 최대 ms)}
+        """
+        return {label: (len(samples), sum(samples) / len(samples), max(samples))
+                for label, samples in self.wait_log.items() if samples}
+
+
+class Win32WindowReadiness(WindowReadiness):
+    """Win32 API와 DWM으로 창 상태와 화면 표시 여부를 확인하는 구현"""
+    def __init__(self, pump=None):
+        super().__init__(pump)
+        import win32gui
+        import win32con
+        self._win32gui = win32gui
+        self._win32con = win32con
+        try:
+            self._dwm_flush = ctypes.WinDLL("dwmapi").DwmFlush
+        except (OSError, AttributeError):
+            self._dwm_flush = None
+
+    def is_hidden(self, hwnd):
+        return not self._win32gui.IsWindowVisible(hwnd)
+
+    def is_restored(self, hwnd):
+        if self._win32gui.IsIconic(hwnd):
+            return False
+        # 복원 애니메이션이 끝나 실제 크기를 가졌는지 확인
+        left, top, right, bottom = self._win32gui.GetWindowRect(hwnd)
+        return right - left > 0 and bottom - top > 0
+
+    def is_foreground(self, hwnd):
+        return self._win32gui.GetForegroundWindow() == hwnd
+
+    def wait_frame_presented(self):
+        # DwmFlush는 다음 컴포지션 프레임이 화면에 표시될 때까지 반환하지 않음
+        if self._dwm_flush is None:
+            return
+        start = time.perf_counter()
+        self._dwm_flush()
+        self.wait_log.setdefault("frame", []).append((time.perf_counter() - start) * 1000)
+
+
+class StandInWindowReadiness(WindowReadiness):
+    """
+    테스트/비 Windows 환경용 대체 구현
+    창 상태를 직접 지정하거나, 지정한 시간이 지난 뒤 준비 완료로 간주합니다.
+    """
+    def __init__(self, delays=None, pump=None):
+        """
+        :param delays: {"hide"/"restore"/"foreground": 준비될 때까지 걸리는 시간(초)} (없으면 즉시 준비)
+        """
+        super().__init__(pump)
+        self.delays = delays or {}
+        self._started = {}
+
+    def _elapsed_ready(self, label, hwnd):
+        started = self._started.setdefault((label, hwnd), time.perf_counter())
+        if time.perf_counter() - started >= self.delays.get(label, 0.0):
+            del self._started[(label, hwnd)]
+            return True
+        return False
+
+    def is_hidden(self, hwnd):
+        return self._elapsed_ready("hide", hwnd)
+
+    def is_restored(self, hwnd):
+        return self._elapsed_ready("restore", hwnd)
+
+    def is_foreground(self, hwnd):
+        return self._elapsed_ready("foreground", hwnd)
+
+
+def create_window_readiness(pump=None):
+    """현재 플랫폼에 맞는 WindowReadiness 생성"""
+    if sys.platform == "win32":
+        return Win32WindowReadiness(pump)
+    return StandInWindowReadiness(pump=pump)